@@ -1,19 +1,50 @@
+from array import array
+from collections import deque
 from sys import maxsize
-import time
+import sys
 
+import numpy as np
 
-def bellman_ford_optimized(graph, V, E, src):
+from csr_graph import CSRGraph
+from graph_io import edge_file_info, is_binary_graph, iter_edge_chunks
+from paths import reset_predecessors
+
+
+class NegativeCycleError(ValueError):
+    """
+    Граф содержит цикл с отрицательным весом. vertices — вершины цикла в порядке обхода,
+    edges — его рёбра (u, v, w); если цикл восстановить не удалось, оба списка пустые.
+    """
+
+    def __init__(self, vertices=(), edges=()):
+        super().__init__("Граф содержит цикл с отрицательным весом")
+        self.vertices = list(vertices)
+        self.edges = list(edges)
+
+    @property
+    def weight(self):
+        return sum(w for _, _, w in self.edges)
+
+
+def bellman_ford_optimized(graph, V, E, src, predecessors=None):
     """
     Алгоритм Беллмана-Форда для лучшего случая (с оптимизацией раннего выхода).
     """
     dis = [maxsize] * V
     dis[src] = 0
+    if predecessors is not None:
+        reset_predecessors(predecessors, V)
 
     for i in range(V - 1):
         changed = False
+        # @probe passes
+        # @probe edges_relaxed len(graph)
         for u, v, w in graph:
             if dis[u] != maxsize and dis[u] + w < dis[v]:
+                # @probe relaxations
                 dis[v] = dis[u] + w
+                if predecessors is not None:
+                    predecessors[v] = u
                 changed = True
         if not changed:  # Если на этой итерации не было изменений, можно выйти раньше
             break
@@ -21,124 +52,430 @@ def bellman_ford_optimized(graph, V, E, src):
     # Проверка на циклы с отрицательным весом
     for u, v, w in graph:
         if dis[u] != maxsize and dis[u] + w < dis[v]:
-            raise ValueError("Граф содержит цикл с отрицательным весом")
+            raise _negative_cycle_error(graph, V, src)
 
     return dis
 
 
-def bellman_ford_standard(graph, V, E, src):
+def bellman_ford_standard(graph, V, E, src, predecessors=None):
     """
     Алгоритм Беллмана-Форда для среднего случая (стандартный алгоритм).
     """
     dis = [maxsize] * V
     dis[src] = 0
+    if predecessors is not None:
+        reset_predecessors(predecessors, V)
 
     for _ in range(V - 1):
+        # @probe passes
+        # @probe edges_relaxed len(graph)
         for u, v, w in graph:
             if dis[u] != maxsize and dis[u] + w < dis[v]:
+                # @probe relaxations
                 dis[v] = dis[u] + w
+                if predecessors is not None:
+                    predecessors[v] = u
 
     # Проверка на циклы с отрицательным весом
     for u, v, w in graph:
         if dis[u] != maxsize and dis[u] + w < dis[v]:
-            raise ValueError("Граф содержит цикл с отрицательным весом")
+            raise _negative_cycle_error(graph, V, src)
 
     return dis
 
 
-def bellman_ford_unoptimized(graph, V, E, src):
+def bellman_ford_unoptimized(graph, V, E, src, predecessors=None):
     """
     Алгоритм Беллмана-Форда для худшего случая (неоптимизированный с избыточными проверками).
     """
     dis = [maxsize] * V
     dis[src] = 0
+    if predecessors is not None:
+        reset_predecessors(predecessors, V)
 
     for i in range(V - 1):
+        # @probe passes
+        # @probe edges_relaxed len(graph)
         for u, v, w in graph:
             if dis[u] != maxsize:
                 if dis[u] + w < dis[v]:  # Избыточная проверка
+                    # @probe relaxations
                     dis[v] = dis[u] + w
+                    if predecessors is not None:
+                        predecessors[v] = u
 
     # Проверка на циклы с отрицательным весом
     for u, v, w in graph:
         if dis[u] != maxsize and dis[u] + w < dis[v]:
-            raise ValueError("Граф содержит цикл с отрицательным весом")
+            raise _negative_cycle_error(graph, V, src)
+
+    return dis
+
+
+def bellman_ford_vectorized(graph, V, E, src, predecessors=None):
+    """
+    Алгоритм Беллмана-Форда с векторизованной релаксацией: каждый проход выполняется
+    целиком в NumPy (scatter-min через np.minimum.at) по параллельным массивам u, v, w.
+    Релаксируются только рёбра из вершин, расстояние до которых изменилось на прошлом проходе.
+    """
+    if not isinstance(graph, CSRGraph):
+        graph = CSRGraph.from_edges(graph, V, directed=True)
+    u, v, w = graph.src, graph.dst, graph.weight
+
+    dis = np.full(V, maxsize, dtype=w.dtype)
+    dis[src] = 0
+    changed = np.zeros(V, dtype=bool)
+    changed[src] = True
+    if predecessors is not None:
+        predecessors_array = np.full(V, -1, dtype=np.int32)
+
+    for i in range(V - 1):
+        # @probe passes
+        active = changed[u]
+        sources, targets = u[active], v[active]
+        candidates = dis[sources] + w[active]
+        # @probe edges_relaxed len(sources)
+        new_dis = dis.copy()
+        np.minimum.at(new_dis, targets, candidates)
+        changed = new_dis < dis
+        # @probe relaxations int(np.count_nonzero(changed))
+        if not changed.any():  # Если на этой итерации не было изменений, можно выйти раньше
+            break
+        if predecessors is not None:
+            best = changed[targets] & (candidates == new_dis[targets])
+            predecessors_array[targets[best]] = sources[best]
+        dis = new_dis
+
+    # Проверка на циклы с отрицательным весом
+    reachable = dis[u] != maxsize
+    if np.any(dis[u[reachable]] + w[reachable] < dis[v[reachable]]):
+        raise _negative_cycle_error(graph, V, src)
+
+    if predecessors is not None:
+        predecessors[:] = array('i', predecessors_array.tobytes())
+    return dis.tolist()
+
+
+def bellman_ford_streaming(filename, src, V=None, predecessors=None, chunk_edges=1 << 22):
+    """
+    Алгоритм Беллмана-Форда для графов, не помещающихся в память: в памяти держатся только
+    массив расстояний dis (и флаги изменений), а рёбра на каждом проходе читаются из файла
+    кусками по chunk_edges через graph_io.iter_edge_chunks (бинарный файл — через memmap).
+
+    Куски релаксируются векторизованно, как в bellman_ford_vectorized, но на месте: улучшения
+    из ранних кусков используются уже в этом проходе, что сокращает число чтений файла.
+    Проход без изменений завершает работу досрочно и заодно доказывает отсутствие
+    отрицательных циклов; иначе после V - 1 проходов выполняется проверочный. Предшественники
+    хранятся всегда: по ним восстанавливается цикл для NegativeCycleError.
+    Возвращает массив NumPy, а не список, чтобы не умножать память на объекты Python.
+    """
+    if V is None or is_binary_graph(filename):
+        V, _, weight_dtype = edge_file_info(filename, chunk_edges)
+    else:
+        weight_dtype = np.dtype(np.int64)
+
+    dis = np.full(V, maxsize, dtype=weight_dtype)
+    dis[src] = 0
+    changed = np.zeros(V, dtype=bool)
+    changed[src] = True
+    predecessors_array = np.full(V, -1, dtype=np.int32)
+
+    for i in range(V):
+        # @probe passes
+        improved = np.zeros(V, dtype=bool)
+        for u, v, w in iter_edge_chunks(filename, chunk_edges):
+            # Ребро нужно релаксировать, если dis[u] изменилось после его прошлого просмотра
+            active = changed[u] | improved[u]
+            sources, targets = u[active], v[active]
+            candidates = dis[sources] + w[active]
+            # @probe edges_relaxed len(sources)
+            before = dis[targets]
+            np.minimum.at(dis, targets, candidates)
+            better = dis[targets] < before
+            # @probe relaxations int(np.count_nonzero(better))
+            improved[targets[better]] = True
+            best = better & (candidates == dis[targets])
+            predecessors_array[targets[best]] = sources[best]
+        if not improved.any():  # Если на этом проходе не было изменений, можно выйти раньше
+            break
+        if i == V - 1:  # V-й проход ещё что-то улучшил — есть цикл с отрицательным весом
+            vertices = _predecessor_cycle(predecessors_array, int(np.flatnonzero(improved)[0]))
+            raise NegativeCycleError(vertices, _streamed_cycle_edges(filename, vertices, chunk_edges))
+        changed = improved
+
+    if predecessors is not None:
+        predecessors[:] = array('i', predecessors_array.tobytes())
+    return dis
+
+
+def _predecessor_cycle(predecessors, vertex):
+    """
+    Вершины цикла в графе предшественников: после V шагов назад от вершины, улучшенной
+    на V-м проходе, обход уже на цикле. Пустой список, если путь дошёл до источника.
+    """
+    for _ in range(len(predecessors)):
+        vertex = int(predecessors[vertex])
+        if vertex == -1:
+            return []
+    cycle = [vertex]
+    while int(predecessors[cycle[-1]]) != vertex:
+        cycle.append(int(predecessors[cycle[-1]]))
+    cycle.reverse()
+    return cycle
+
+
+def _streamed_cycle_edges(filename, vertices, chunk_edges):
+    """
+    Рёбра (u, v, w) цикла vertices — ещё одним проходом по файлу; из кратных рёбер берётся
+    самое лёгкое.
+    """
+    if not vertices:
+        return []
+    pairs = list(zip(vertices, vertices[1:] + vertices[:1]))
+    weights = {}
+    for u, v, w in iter_edge_chunks(filename, chunk_edges):
+        for pair in pairs:
+            found = w[(u == pair[0]) & (v == pair[1])]
+            if len(found):
+                weights[pair] = min(weights.get(pair, found.min()), found.min())
+    return [(u, v, weights[u, v].item()) for u, v in pairs]
+
+
+def _yen_adjacency(graph, V):
+    """
+    Делит рёбра на прямые (u <= v) и обратные (u > v) и строит для каждой группы CSR.
+    """
+    forward = graph.dst >= graph.src
+    return [
+        CSRGraph(graph.src[mask], graph.dst[mask], graph.weight[mask], V, directed=True).adjacency_views()
+        for mask in (forward, ~forward)
+    ]
+
+
+def bellman_ford_queue(graph, V, E, src, predecessors=None, yen=False):
+    """
+    Алгоритм Беллмана-Форда с очередью вершин (SPFA): релаксируются только исходящие рёбра
+    вершин, расстояние до которых изменилось. При yen=True вершины просматриваются проходами
+    в порядке Йена: прямой проход по возрастанию номеров по рёбрам u <= v, обратный — по убыванию
+    по рёбрам u > v. Цикл с отрицательным весом обнаруживается по счётчикам обновлений вершин.
+    """
+    if not isinstance(graph, CSRGraph):
+        graph = CSRGraph.from_edges(graph, V, directed=True)
+
+    dis = [maxsize] * V
+    dis[src] = 0
+    if predecessors is not None:
+        reset_predecessors(predecessors, V)
+    count = [0] * V  # Сколько раз вершина ставилась в очередь (для Йена — в скольких парах проходов обновлялась)
+
+    if not yen:
+        offsets, targets, weights = graph.adjacency_views(undirected=False)
+        in_queue = [False] * V
+        in_queue[src] = True
+        queue = deque([src])
+
+        while queue:
+            u = queue.popleft()
+            # @probe heap_pops
+            in_queue[u] = False
+            du = dis[u]
+            start, end = offsets[u], offsets[u + 1]
+            # @probe edges_relaxed end - start
+            for v, w in zip(targets[start:end], weights[start:end]):
+                if du + w < dis[v]:
+                    # @probe relaxations
+                    dis[v] = du + w
+                    if predecessors is not None:
+                        predecessors[v] = u
+                    if not in_queue[v]:
+                        count[v] += 1
+                        if count[v] >= V:
+                            raise _negative_cycle_error(graph, V, src)
+                        in_queue[v] = True
+                        queue.append(v)
+                        # @probe heap_pushes
+
+        return dis
+
+    (forward_offsets, forward_targets, forward_weights), (backward_offsets, backward_targets, backward_weights) = \
+        _yen_adjacency(graph, V)
+    pending_forward = [False] * V
+    pending_backward = [False] * V
+    pending_forward[src] = pending_backward[src] = True
+    last_pass = [-1] * V
+    changed = True
+    pass_number = 0
+
+    while changed:
+        # @probe passes
+        changed = False
+        for order, pending, offsets, targets, weights in (
+                (range(V), pending_forward, forward_offsets, forward_targets, forward_weights),
+                (range(V - 1, -1, -1), pending_backward, backward_offsets, backward_targets, backward_weights)):
+            for u in order:
+                if not pending[u]:
+                    continue
+                pending[u] = False
+                # @probe heap_pops
+                du = dis[u]
+                start, end = offsets[u], offsets[u + 1]
+                # @probe edges_relaxed end - start
+                for v, w in zip(targets[start:end], weights[start:end]):
+                    if du + w < dis[v]:
+                        # @probe relaxations
+                        dis[v] = du + w
+                        if predecessors is not None:
+                            predecessors[v] = u
+                        pending_forward[v] = pending_backward[v] = True
+                        changed = True
+                        if last_pass[v] != pass_number:
+                            last_pass[v] = pass_number
+                            count[v] += 1
+                            if count[v] >= V:
+                                raise _negative_cycle_error(graph, V, src)
+        pass_number += 1
 
     return dis
 
 
-def read_graph_from_file(filename):
+def bellman_ford_yen(graph, V, E, src, predecessors=None):
     """
-    Считывает граф из файла.
+    Алгоритм Беллмана-Форда с рабочим списком вершин в порядке Йена.
     """
-    edges = []
-    max_vertex = -1
+    return bellman_ford_queue(graph, V, E, src, predecessors, yen=True)
 
-    with open(filename, "r") as file:
-        for line in file:
-            u, v, w = map(int, line.split())
-            edges.append([u, v, w])
-            max_vertex = max(max_vertex, u, v)
 
-    return edges, max_vertex + 1
+def _tree_cycle(parent, parent_weight, u, v, w):
+    """
+    Цикл, который ребро (u, v, w) замыкает с путём дерева от v до u: (вершины, рёбра).
+    """
+    vertices = [u]
+    while vertices[-1] != v:
+        vertices.append(parent[vertices[-1]])
+    vertices.reverse()
+    edges = [(parent[vertex], vertex, parent_weight[vertex]) for vertex in vertices[1:]]
+    return vertices, edges + [(u, v, w)]
 
 
-def write_times_to_file(times, filename):
+def bellman_ford_tarjan(graph, V, E, src, predecessors=None):
     """
-    Записывает массив времени обработки графов в файл.
+    Алгоритм Беллмана-Форда с очередью вершин и разборкой поддеревьев (Тарьян): когда
+    расстояние до v уменьшается, всё поддерево v в дереве кратчайших путей вынимается —
+    расстояния в нём заведомо устарели, и вершины из него пропускаются при извлечении
+    из очереди, пока их снова не улучшат. Если в поддереве v оказывается сама u, ребро
+    (u, v) замыкает цикл с отрицательным весом, и он обнаруживается сразу при появлении,
+    а не после V - 1 проходов. Ошибка NegativeCycleError содержит вершины и рёбра цикла.
     """
-    with open(filename, "w", encoding="UTF-8") as file:
-        for vertices, time_taken in times:
-            file.write(f"{vertices} : {time_taken:.6f} секунд\n")
+    if not isinstance(graph, CSRGraph):
+        graph = CSRGraph.from_edges(graph, V, directed=True)
+    offsets, targets, weights = graph.adjacency_views(undirected=False)
+
+    dis = [maxsize] * V
+    dis[src] = 0
+    parent = [-1] * V
+    parent_weight = [0] * V
+    # Дерево хранится кольцевым списком вершин в прямом порядке обхода с глубинами:
+    # поддерево v — это v и идущие за ней подряд вершины большей глубины
+    next_vertex = [-1] * V
+    previous_vertex = [-1] * V
+    depth = [-1] * V  # -1 — вершины нет в дереве
+    next_vertex[src] = previous_vertex[src] = src
+    depth[src] = 0
+    in_queue = [False] * V
+    in_queue[src] = True
+    queue = deque([src])
+
+    while queue:
+        u = queue.popleft()
+        # @probe heap_pops
+        in_queue[u] = False
+        if depth[u] == -1:
+            # @probe stale_pops
+            continue  # Поддерево разобрано, расстояние до u ещё уменьшится
+        du = dis[u]
+        start, end = offsets[u], offsets[u + 1]
+        # @probe edges_relaxed end - start
+        for v, w in zip(targets[start:end], weights[start:end]):
+            if du + w >= dis[v]:
+                continue
+            # @probe relaxations
+            if v == u:
+                raise NegativeCycleError([u], [(u, u, w)])
+            if depth[v] != -1:
+                vertex = next_vertex[v]
+                while depth[vertex] > depth[v]:
+                    if vertex == u:
+                        raise NegativeCycleError(*_tree_cycle(parent, parent_weight, u, v, w))
+                    depth[vertex] = -1
+                    vertex = next_vertex[vertex]
+                before = previous_vertex[v]
+                next_vertex[before] = vertex
+                previous_vertex[vertex] = before
+
+            dis[v] = du + w
+            parent[v] = u
+            parent_weight[v] = w
+            after = next_vertex[u]
+            next_vertex[u], previous_vertex[v], next_vertex[v], previous_vertex[after] = v, u, after, v
+            depth[v] = depth[u] + 1
+            if not in_queue[v]:
+                in_queue[v] = True
+                queue.append(v)
+                # @probe heap_pushes
+
+    if predecessors is not None:
+        predecessors[:] = array('i', parent)
+    return dis
+
+
+def find_negative_cycle(graph, V, src):
+    """
+    Цикл с отрицательным весом, достижимый из src: (вершины, рёбра) или None, если его нет.
+    """
+    try:
+        bellman_ford_tarjan(graph, V, len(graph), src)
+    except NegativeCycleError as error:
+        return error.vertices, error.edges
+    return None
+
+
+def _negative_cycle_error(graph, V, src):
+    """
+    Ошибка для проверок в конце прогона: предшественники там могут не храниться,
+    поэтому цикл находится отдельным запуском bellman_ford_tarjan.
+    """
+    cycle = find_negative_cycle(graph, V, src)
+    return NegativeCycleError(*cycle) if cycle else NegativeCycleError()
+
+
+# Реализации алгоритма по именам: все принимают (graph, V, E, src, predecessors=None) и возвращают dis;
+# переданный array('i') predecessors заполняется предшественниками вершин
+BELLMAN_FORD_VARIANTS = {
+    "optimized": bellman_ford_optimized,
+    "standard": bellman_ford_standard,
+    "unoptimized": bellman_ford_unoptimized,
+    "vectorized": bellman_ford_vectorized,
+    "queue": bellman_ford_queue,
+    "yen": bellman_ford_yen,
+    "tarjan": bellman_ford_tarjan,
+}
 
 
 if __name__ == "__main__":
-    # Файлы графов
-    graph_files_best = [f"best_case_graph_{i * 1000}_vertices.txt" for i in range(1, 11)]
-    graph_files_avg = [f"average_case_graph_{i * 1000}_vertices.txt" for i in range(1, 11)]
-    graph_files_worst = [f"worst_case_graph_{i * 1000}_vertices.txt" for i in range(1, 11)]
-
-    source_vertex = 0
-    best_case_times = []
-    avg_case_times = []
-    worst_case_times = []
-
-    # Лучший случай
-    print("Обработка графов для лучшего случая...")
-    for filename in graph_files_best:
-        graph, num_vertices = read_graph_from_file(filename)
-        print(f"Обработка графа {filename} с {num_vertices} вершинами...")
-        start_time = time.time()
-        bellman_ford_optimized(graph, num_vertices, len(graph), source_vertex)
-        elapsed_time = time.time() - start_time
-        best_case_times.append((num_vertices, elapsed_time))
-        print(f"Граф {filename} обработан за {elapsed_time:.6f} секунд.")
-
-    # Средний случай
-    print("Обработка графов для среднего случая...")
-    for filename in graph_files_avg:
-        graph, num_vertices = read_graph_from_file(filename)
-        print(f"Обработка графа {filename} с {num_vertices} вершинами...")
-        start_time = time.time()
-        bellman_ford_standard(graph, num_vertices, len(graph), source_vertex)
-        elapsed_time = time.time() - start_time
-        avg_case_times.append((num_vertices, elapsed_time))
-        print(f"Граф {filename} обработан за {elapsed_time:.6f} секунд.")
-
-    # Худший случай
-    print("Обработка графов для худшего случая...")
-    for filename in graph_files_worst:
-        graph, num_vertices = read_graph_from_file(filename)
-        print(f"Обработка графа {filename} с {num_vertices} вершинами...")
-        start_time = time.time()
-        bellman_ford_unoptimized(graph, num_vertices, len(graph), source_vertex)
-        elapsed_time = time.time() - start_time
-        worst_case_times.append((num_vertices, elapsed_time))
-        print(f"Граф {filename} обработан за {elapsed_time:.6f} секунд.")
-
-    # Сохранение времени обработки
-    write_times_to_file(best_case_times, "best_case_times_bellman_ford.txt")
-    write_times_to_file(avg_case_times, "average_case_times_bellman_ford.txt")
-    write_times_to_file(worst_case_times, "worst_case_times_bellman_ford.txt")
-
-    print("Обработка завершена. Результаты записаны в файлы.")
+    # Лучший, средний и худший случаи замеряются общим стендом benchmark_runner;
+    # медианы дополнительно пишутся в текстовые файлы "N : t секунд" для drawGraphic.py
+    import benchmark_runner
+
+    sys.exit(benchmark_runner.main(
+        default_cases=[
+            ("bellman_ford_optimized", "best"),  # Лучший случай
+            ("bellman_ford_standard", "average"),  # Средний случай
+            ("bellman_ford_unoptimized", "worst"),  # Худший случай
+        ],
+        legacy_times={
+            ("bellman_ford_optimized", "best"): "best_case_times_bellman_ford.txt",
+            ("bellman_ford_standard", "average"): "average_case_times_bellman_ford.txt",
+            ("bellman_ford_unoptimized", "worst"): "worst_case_times_bellman_ford.txt",
+        },
+        default_output="bellman_ford_results.json",
+    ))
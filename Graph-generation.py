@@ -1,137 +1,403 @@
-import random
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 
+import numpy as np
 
-def generate_sparse_graph(n, max_weight):
+from csr_graph import CSRGraph
+from graph_io import write_binary_edges, write_binary_graph, write_graph_metadata
+
+
+def _seed_sequence(seed):
     """
-    Генерирует разреженный связный граф (лучший случай), где каждая вершина имеет 1-3 инцидентных ребра.
+    Зерно генератора: int, последовательность int, None или уже готовый SeedSequence.
     """
-    edges = []
-    connected = set()
-
-    # Создаем минимальный остов для связности
-    for i in range(1, n):
-        u = i - 1
-        v = i
-        w = random.randint(1, max_weight)
-        edges.append([u, v, w])
-        connected.add((u, v))
-        connected.add((v, u))
-
-    # Добавляем дополнительные ребра
-    for u in range(n):
-        num_edges = random.randint(1, 3)
-        count = 0
-
-        while count < num_edges:
-            v = random.randint(0, n - 1)
-            if u != v and (u, v) not in connected and (v, u) not in connected:
-                w = random.randint(1, max_weight)
-                edges.append([u, v, w])
-                connected.add((u, v))
-                connected.add((v, u))
-                count += 1
+    return seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
 
-    return edges
+
+def _sample_degrees(rng, degree, size):
+    """
+    Число дополнительных рёбер для size вершин: degree — пара (min, max) для равномерного
+    распределения или функция degree(rng, size), возвращающая массив целых.
+    """
+    if callable(degree):
+        return np.asarray(degree(rng, size), dtype=np.int64)
+    low, high = degree
+    return rng.integers(low, high + 1, size)
 
 
-def generate_medium_density_graph(n, max_weight):
+def poisson_degrees(rng, size, mean):
     """
-    Генерирует граф средней плотности (средний случай), где каждая вершина имеет 4-7 инцидентных ребер.
+    Степени по распределению Пуассона; передаётся как functools.partial(poisson_degrees, mean=...).
     """
-    edges = []
-    connected = set()
-
-    # Создаем минимальный остов для связности
-    for i in range(1, n):
-        u = i - 1
-        v = i
-        w = random.randint(1, max_weight)
-        edges.append([u, v, w])
-        connected.add((u, v))
-        connected.add((v, u))
-
-    # Добавляем дополнительные ребра
-    for u in range(n):
-        num_edges = random.randint(4, 7)
-        count = 0
-
-        while count < num_edges:
-            v = random.randint(0, n - 1)
-            if u != v and (u, v) not in connected and (v, u) not in connected:
-                w = random.randint(1, max_weight)
-                edges.append([u, v, w])
-                connected.add((u, v))
-                connected.add((v, u))
-                count += 1
+    return rng.poisson(mean, size)
 
-    return edges
+
+def _generate_shard(n, max_weight, degree, seed_sequence, start, stop, shard_index):
+    """
+    Генерирует рёбра вершин [start, stop): рёбра цепочки (u - 1, u) для связности и
+    дополнительные рёбра в случайные вершины. Возвращает массивы key, order, u, v, w, где
+    key = min(u, v) * n + max(u, v) — упакованный ключ неориентированной пары, а order —
+    глобальный порядок генерации (при повторах пары остаётся ребро с меньшим order).
+    """
+    rng = np.random.default_rng(seed_sequence)
+    chain = np.arange(max(start, 1), stop, dtype=np.int64)
+    sources = np.arange(start, stop, dtype=np.int64)
+    counts = _sample_degrees(rng, degree, len(sources))
+    extra_u = np.repeat(sources, counts)
+    extra_v = rng.integers(0, n, len(extra_u))
+
+    u = np.concatenate((chain - 1, extra_u))
+    v = np.concatenate((chain, extra_v))
+    w = rng.integers(1, max_weight + 1, len(u))
+    loops = u == v
+    u, v, w = u[~loops], v[~loops], w[~loops]
+
+    key = np.minimum(u, v) * n + np.maximum(u, v)
+    # Рёбра цепочки всех шардов идут раньше дополнительных, чтобы связность не терялась при удалении повторов
+    is_extra = np.arange(len(u)) >= len(chain)
+    order = (is_extra.astype(np.int64) << 62) | (np.int64(shard_index) << 40) | np.arange(len(u), dtype=np.int64)
+    return key, order, u, v, w
 
 
-def generate_dense_graph(n, max_weight):
+def _deduplicate(key, order, u, v, w):
+    """
+    Удаляет повторы неориентированных пар сортировкой упакованных ключей: из каждой группы
+    одинаковых ключей остаётся ребро с наименьшим order; результат упорядочен по order.
+    """
+    index = np.lexsort((order, key))
+    first = np.ones(len(index), dtype=bool)
+    first[1:] = key[index[1:]] != key[index[:-1]]
+    index = index[first]
+    index = index[np.argsort(order[index], kind="stable")]
+    return u[index], v[index], w[index]
+
+
+def _shard_bounds(n, shards):
+    return [(n * i // shards, n * (i + 1) // shards) for i in range(shards)]
+
+
+def _default_shards(n):
+    # Число шардов зависит только от n, поэтому результат при фиксированном seed
+    # не зависит от числа рабочих процессов
+    return max(1, n // 100_000)
+
+
+def generate_graph(n, max_weight, degree, seed=None, shards=None):
+    """
+    Генерирует связный неориентированный граф в памяти: цепочка 0-1-...-(n-1) плюс для каждой
+    вершины случайное число дополнительных рёбер по распределению degree. Повторяющиеся пары
+    удаляются, поэтому степень вершины может оказаться чуть меньше выпавшей. Возвращает массив
+    рёбер формы (E, 3) со столбцами u, v, w; при одинаковом seed результат воспроизводим.
+    """
+    shards = shards or _default_shards(n)
+    seeds = _seed_sequence(seed).spawn(shards)
+    parts = [_generate_shard(n, max_weight, degree, seeds[i], start, stop, i)
+             for i, (start, stop) in enumerate(_shard_bounds(n, shards))]
+    u, v, w = _deduplicate(*(np.concatenate(column) for column in zip(*parts)))
+    return np.stack((u, v, w), axis=1)
+
+
+def _metadata(family, num_vertices, num_edges, seed, weight_range, directed, **parameters):
+    """
+    Описание сгенерированного графа для файла .meta.json.
+    """
+    return {"family": family, "vertices": int(num_vertices), "edges": int(num_edges),
+            "seed": seed,
+            "weight_range": [int(weight_range[0]), int(weight_range[1])], "directed": directed,
+            "parameters": parameters}
+
+
+def _write_edge_chunks(filename, n, num_edges, chunks, binary=False):
+    """
+    Записывает рёбра по кускам (массивы формы (3, k): u, v, w) в текстовый или бинарный файл
+    и возвращает их число. Для бинарного файла num_edges нужно знать заранее.
+    """
+    if binary:
+        write_binary_edges(filename, n, num_edges, chunks)
+        return num_edges
+
+    written = 0
+    with open(filename, "w") as file:
+        for chunk in chunks():
+            np.savetxt(file, np.asarray(chunk).T, fmt="%d")
+            written += chunk.shape[1]
+    return written
+
+
+def _generate_shard_to_buckets(n, max_weight, degree, seed_sequence, start, stop, shard_index, buckets, directory):
+    """
+    Генерирует шард и раскладывает его рёбра по корзинам меньшей вершины пары: все копии
+    одной пары попадают в одну корзину, и повторы можно удалять по корзинам независимо.
+    """
+    key, order, u, v, w = _generate_shard(n, max_weight, degree, seed_sequence, start, stop, shard_index)
+    bucket_of_edge = key // n * buckets // n
+    for bucket in range(buckets):
+        mask = bucket_of_edge == bucket
+        np.save(os.path.join(directory, f"bucket_{bucket}_shard_{shard_index}.npy"),
+                np.stack((key[mask], order[mask], u[mask], v[mask], w[mask])))
+
+
+def _deduplicate_bucket(bucket, shards, directory):
+    """
+    Удаляет повторы внутри корзины и сохраняет её рёбра; возвращает их число.
+    """
+    parts = []
+    for shard_index in range(shards):
+        filename = os.path.join(directory, f"bucket_{bucket}_shard_{shard_index}.npy")
+        parts.append(np.load(filename))
+        os.remove(filename)
+    u, v, w = _deduplicate(*np.concatenate(parts, axis=1))
+    np.save(os.path.join(directory, f"bucket_{bucket}.npy"), np.stack((u, v, w)))
+    return len(u)
+
+
+def generate_graph_to_file(filename, n, max_weight, degree, seed=None, shards=None, workers=None, binary=False):
+    """
+    Генерирует тот же граф, что generate_graph, но по шардам в пуле процессов и с потоковой
+    записью: рёбра шардов раскладываются по корзинам во временном каталоге, повторы удаляются
+    внутри корзин, после чего корзины по одной дописываются в файл. Весь список рёбер
+    в памяти не хранится. Возвращает число записанных рёбер.
+    """
+    shards = shards or _default_shards(n)
+    buckets = shards
+    seeds = _seed_sequence(seed).spawn(shards)
+
+    with tempfile.TemporaryDirectory(dir=os.path.dirname(os.path.abspath(filename))) as directory, \
+            ProcessPoolExecutor(workers) as executor:
+        list(executor.map(_generate_shard_to_buckets, repeat(n), repeat(max_weight), repeat(degree), seeds,
+                          *zip(*_shard_bounds(n, shards)), range(shards), repeat(buckets), repeat(directory)))
+        counts = list(executor.map(_deduplicate_bucket, range(buckets), repeat(shards), repeat(directory)))
+
+        def chunks():
+            for bucket in range(buckets):
+                yield np.load(os.path.join(directory, f"bucket_{bucket}.npy"), mmap_mode="r")
+
+        _write_edge_chunks(filename, n, sum(counts), chunks, binary)
+    write_graph_metadata(filename, _metadata("random", n, sum(counts), seed, (1, max_weight), False,
+                                             degree=repr(degree), shards=shards))
+    return sum(counts)
+
+
+def generate_sparse_graph(n, max_weight, seed=None):
+    """
+    Генерирует разреженный связный граф (лучший случай), где каждая вершина имеет 1-3 инцидентных ребра.
+    """
+    return generate_graph(n, max_weight, (1, 3), seed).tolist()
+
+
+def generate_medium_density_graph(n, max_weight, seed=None):
+    """
+    Генерирует граф средней плотности (средний случай), где каждая вершина имеет 4-7 инцидентных ребер.
+    """
+    return generate_graph(n, max_weight, (4, 7), seed).tolist()
+
+
+def generate_dense_graph(n, max_weight, seed=None):
     """
     Генерирует плотный граф (худший случай), где каждая вершина имеет 2-10 инцидентных ребер.
     """
-    edges = []
-    connected = set()
-
-    # Создаем минимальный остов для связности
-    for i in range(1, n):
-        u = i - 1
-        v = i
-        w = random.randint(1, max_weight)
-        edges.append([u, v, w])
-        connected.add((u, v))
-        connected.add((v, u))
-
-    # Добавляем дополнительные ребра
-    for u in range(n):
-        num_edges = random.randint(2, 10)
-        count = 0
-
-        while count < num_edges:
-            v = random.randint(0, n - 1)
-            if u != v and (u, v) not in connected and (v, u) not in connected:
-                w = random.randint(1, max_weight)
-                edges.append([u, v, w])
-                connected.add((u, v))
-                connected.add((v, u))
-                count += 1
+    return generate_graph(n, max_weight, (2, 10), seed).tolist()
+
+
+def _complete_graph_chunk(n, max_weight, density, seed_sequence, start, stop, directed):
+    """
+    Рёбра строк [start, stop) полного графа: пары u < v (или все u != v для ориентированного),
+    каждая сохраняется с вероятностью density; рёбра цепочки (u, u + 1) сохраняются всегда.
+    """
+    rng = np.random.default_rng(seed_sequence)
+    rows = np.arange(start, stop)[:, None]
+    columns = np.arange(n)[None, :]
+    mask = columns != rows if directed else columns > rows
+    if density < 1:
+        mask &= (rng.random(mask.shape) < density) | (columns == rows + 1)
+    u, v = np.nonzero(mask)
+    u += start
+    return np.stack((u, v, rng.integers(1, max_weight + 1, len(u))))
+
+
+def _complete_graph_blocks(n, max_weight, density, seed, directed, block_cells=1 << 22):
+    """
+    Разбивает строки полного графа на блоки примерно по block_cells ячеек матрицы смежности.
+    """
+    block_rows = max(1, block_cells // max(n, 1))
+    bounds = [(start, min(start + block_rows, n)) for start in range(0, n, block_rows)]
+    seeds = _seed_sequence(seed).spawn(len(bounds))
+    return [(n, max_weight, density, seed_sequence, start, stop, directed)
+            for seed_sequence, (start, stop) in zip(seeds, bounds)]
+
+
+def generate_complete_graph(n, max_weight, density=1.0, seed=None, directed=False):
+    """
+    Генерирует полный (density = 1) или почти полный граф: E ≈ density·V²/2 для неориентированного
+    и density·V² для ориентированного — настоящий худший случай из theory_graph.py.
+    """
+    chunks = [_complete_graph_chunk(*block) for block in _complete_graph_blocks(n, max_weight, density, seed, directed)]
+    return np.concatenate(chunks, axis=1).T
+
+
+def generate_complete_graph_to_file(filename, n, max_weight, density=1.0, seed=None, directed=False, binary=False):
+    """
+    То же, что generate_complete_graph, но блоки строк генерируются и пишутся по одному,
+    так что граф с V² рёбрами не хранится в памяти целиком. Возвращает число рёбер.
+    """
+    blocks = _complete_graph_blocks(n, max_weight, density, seed, directed)
+
+    def chunks():
+        for block in blocks:
+            yield _complete_graph_chunk(*block)
+
+    # Для бинарного формата число рёбер нужно до записи: блоки генерируются лишний раз
+    num_edges = sum(chunk.shape[1] for chunk in chunks()) if binary else None
+    num_edges = _write_edge_chunks(filename, n, num_edges, chunks, binary)
+    write_graph_metadata(filename, _metadata("complete", n, num_edges, seed, (1, max_weight), directed,
+                                             density=density))
+    return num_edges
+
+
+def generate_grid_graph(rows, cols, max_weight, seed=None, shortcut_probability=0.0):
+    """
+    Генерирует дорожную сеть в виде решётки rows × cols: каждая вершина r·cols + c соединена
+    с правым и нижним соседом; с вероятностью shortcut_probability в клетке добавляется диагональ.
+    """
+    rng = np.random.default_rng(seed)
+    vertices = np.arange(rows * cols).reshape(rows, cols)
+    u = [vertices[:, :-1].ravel(), vertices[:-1, :].ravel()]
+    v = [vertices[:, 1:].ravel(), vertices[1:, :].ravel()]
+    if shortcut_probability > 0:
+        diagonal = rng.random((rows - 1, cols - 1)) < shortcut_probability
+        u.append(vertices[:-1, :-1][diagonal])
+        v.append(vertices[1:, 1:][diagonal])
+    u, v = np.concatenate(u), np.concatenate(v)
+    return np.stack((u, v, rng.integers(1, max_weight + 1, len(u))), axis=1)
+
+
+def grid_shape(n):
+    """
+    Размеры решётки ровно из n вершин, ближайшей к квадратной: rows — наибольший делитель n,
+    не превосходящий √n (для простого n решётка вырождается в путь 1 × n).
+    """
+    rows = int(np.sqrt(n))
+    while n % rows:
+        rows -= 1
+    return rows, n // rows
+
+
+def generate_power_law_graph(n, max_weight, m=3, seed=None):
+    """
+    Генерирует граф предпочтительного присоединения (модель Барабаши-Альберт): каждая новая
+    вершина соединяется с m существующими, выбранными пропорционально их степени, поэтому
+    степени распределены по степенному закону.
+    """
+    rng = np.random.default_rng(seed)
+    m = min(m, n - 1)
+    # Начальная клика из m + 1 вершины
+    start_u, start_v = np.nonzero(np.triu(np.ones((m + 1, m + 1), dtype=bool), 1))
+    # Каждая вершина встречается в repeated столько раз, какова её степень
+    repeated = np.empty(2 * (len(start_u) + m * (n - m - 1)), dtype=np.int64)
+    filled = 2 * len(start_u)
+    repeated[:filled] = np.concatenate((start_u, start_v))
+
+    u, v = [start_u], [start_v]
+    for vertex in range(m + 1, n):
+        targets = np.unique(repeated[rng.integers(0, filled, m)])
+        u.append(np.full(len(targets), vertex))
+        v.append(targets)
+        repeated[filled:filled + len(targets)] = targets
+        repeated[filled + len(targets):filled + 2 * len(targets)] = vertex
+        filled += 2 * len(targets)
+    u, v = np.concatenate(u), np.concatenate(v)
+    return np.stack((u, v, rng.integers(1, max_weight + 1, len(u))), axis=1)
+
 
+def generate_negative_weight_graph(n, max_weight, degree=(4, 7), seed=None, max_potential=None):
+    """
+    Генерирует ориентированный граф для Форда-Беллмана с отрицательными рёбрами, но без
+    отрицательных циклов: к случайному графу применяется перевзвешивание w' = w + p(u) - p(v)
+    со случайными потенциалами p. Веса любого цикла при этом не меняются (остаются ≥ 1),
+    а часть рёбер становится отрицательной.
+    """
+    seeds = _seed_sequence(seed).spawn(2)
+    edges = generate_graph(n, max_weight, degree, seeds[0])
+    potentials = np.random.default_rng(seeds[1]).integers(0, (max_potential or max_weight) + 1, n)
+    edges[:, 2] += potentials[edges[:, 0]] - potentials[edges[:, 1]]
     return edges
 
 
-def write_graph_to_file(graph, filename):
+def write_graph_to_file(graph, filename, binary=False, metadata=None):
     """
-    Записывает граф в файл.
+    Записывает граф в файл. При binary=True граф сохраняется в бинарном формате graph_io
+    вместе со списками смежности. Словарь metadata сохраняется рядом в .meta.json.
     """
+    if metadata is not None:
+        write_graph_metadata(filename, metadata)
+
+    if binary:
+        write_binary_graph(CSRGraph.from_edges(graph), filename)
+        return
+
+    if isinstance(graph, np.ndarray):
+        np.savetxt(filename, graph, fmt="%d")
+        return
+
     with open(filename, "w") as file:
         for edge in graph:
             file.write(f"{edge[0]} {edge[1]} {edge[2]}\n")
 
 
+def graph_metadata(family, edges, seed, directed=False, **parameters):
+    """
+    Метаданные графа, сгенерированного в памяти: V и E берутся из массива рёбер.
+    """
+    edges = np.asarray(edges)
+    return _metadata(family, edges[:, :2].max() + 1, len(edges), seed, (edges[:, 2].min(), edges[:, 2].max()),
+                     directed, **parameters)
+
+
+# Семейства графов драйверов: имя файла, диапазон дополнительных рёбер на вершину, описание
+GRAPH_FAMILIES = [
+    ("best_case_graph_{n}_vertices.txt", (1, 3), "Разреженный граф"),
+    ("average_case_graph_{n}_vertices.txt", (4, 7), "Граф средней плотности"),
+    ("worst_case_graph_{n}_vertices.txt", (2, 10), "Плотный граф"),
+]
+
+
 if __name__ == "__main__":
     # Параметры генерации
     max_weight = 1000  # Максимальный вес ребра
     vertex_counts = range(1000, 11000, 1000)  # Количество вершин от 1000 до 10000 с шагом 1000
+    seed = 2024  # Базовое зерно: одинаковые графы при каждом запуске
 
     # Генерация графов
     for n in vertex_counts:
-        # Разреженные графы
-        sparse_graph = generate_sparse_graph(n, max_weight)
-        sparse_filename = f"best_case_graph_{n}_vertices.txt"
-        write_graph_to_file(sparse_graph, sparse_filename)
-        print(f"Разреженный граф с {n} вершинами сохранен в файл {sparse_filename}.")
-
-        # Графы средней плотности
-        medium_density_graph = generate_medium_density_graph(n, max_weight)
-        medium_density_filename = f"average_case_graph_{n}_vertices.txt"
-        write_graph_to_file(medium_density_graph, medium_density_filename)
-        print(f"Граф средней плотности с {n} вершинами сохранен в файл {medium_density_filename}.")
-
-        # Плотные графы
-        dense_graph = generate_dense_graph(n, max_weight)
-        dense_filename = f"worst_case_graph_{n}_vertices.txt"
-        write_graph_to_file(dense_graph, dense_filename)
-        print(f"Плотный граф с {n} вершинами сохранен в файл {dense_filename}.")
+        for family_index, (pattern, degree, description) in enumerate(GRAPH_FAMILIES):
+            filename = pattern.format(n=n)
+            generate_graph_to_file(filename, n, max_weight, degree, seed=[seed, n, family_index])
+            print(f"{description} с {n} вершинами сохранен в файл {filename}.")
+
+    # Дополнительные семейства для нагрузочных сценариев
+    for n in vertex_counts:
+        rows, cols = grid_shape(n)
+        grid = generate_grid_graph(rows, cols, max_weight, seed=[seed, n, 3], shortcut_probability=0.05)
+        write_graph_to_file(grid, f"grid_graph_{n}_vertices.txt",
+                            metadata=graph_metadata("grid", grid, [seed, n, 3], rows=rows, cols=cols,
+                                                    shortcut_probability=0.05))
+
+        power_law = generate_power_law_graph(n, max_weight, m=3, seed=[seed, n, 4])
+        write_graph_to_file(power_law, f"power_law_graph_{n}_vertices.txt",
+                            metadata=graph_metadata("power_law", power_law, [seed, n, 4], m=3))
+
+        negative = generate_negative_weight_graph(n, max_weight, seed=[seed, n, 5])
+        write_graph_to_file(negative, f"negative_graph_{n}_vertices.txt",
+                            metadata=graph_metadata("negative", negative, [seed, n, 5], directed=True,
+                                                    degree=(4, 7)))
+        print(f"Решётка, степенной и ориентированный граф с отрицательными весами для {n} вершин сохранены.")
+
+    # Полные графы: E ≈ V² / 2, поэтому размеры меньше
+    for n in range(500, 3500, 500):
+        filename = f"complete_graph_{n}_vertices.txt"
+        generate_complete_graph_to_file(filename, n, max_weight, seed=[seed, n, 6])
+        print(f"Полный граф с {n} вершинами сохранен в файл {filename}.")
 
     print("Генерация всех графов завершена.")
@@ -0,0 +1,52 @@
+import importlib
+from array import array
+from sys import maxsize
+
+import numpy as np
+
+from csr_graph import CSRGraph
+from delta_stepping import delta_stepping
+from dijkstra import DIJKSTRA_VARIANTS
+from paths import ShortestPaths
+
+bellman_ford = importlib.import_module("Ford-Bellman")
+
+# Все реализации обоих алгоритмов по имени функции; delta-stepping решает ту же задачу,
+# что и Дейкстра (неотрицательные веса, та же сигнатура), и учитывается вместе с ней
+DIJKSTRA_ALGORITHMS = {function.__name__: function for function in (*DIJKSTRA_VARIANTS.values(), delta_stepping)}
+BELLMAN_FORD_ALGORITHMS = {function.__name__: function for function in bellman_ford.BELLMAN_FORD_VARIANTS.values()}
+ALGORITHMS = {**DIJKSTRA_ALGORITHMS, **BELLMAN_FORD_ALGORITHMS}
+
+
+def shortest_paths(algorithm, graph, src, predecessors=None):
+    """
+    Запускает алгоритм по имени с единой сигнатурой: Дейкстре передаётся (graph, V, src),
+    Форду-Беллману — (graph, V, E, src).
+    """
+    if not isinstance(graph, CSRGraph):
+        graph = CSRGraph.from_edges(graph)
+    if algorithm in DIJKSTRA_ALGORITHMS:
+        return DIJKSTRA_ALGORITHMS[algorithm](graph, graph.num_vertices, src, predecessors)
+    if algorithm in BELLMAN_FORD_ALGORITHMS:
+        return BELLMAN_FORD_ALGORITHMS[algorithm](graph, graph.num_vertices, graph.num_edges, src, predecessors)
+    raise KeyError(f"Неизвестный алгоритм: {algorithm}")
+
+
+def shortest_path_tree(algorithm, graph, src):
+    """
+    Запускает алгоритм с записью предшественников и возвращает ShortestPaths,
+    из которого маршруты до любых вершин восстанавливаются по запросу.
+    """
+    predecessors = array('i')
+    distances = shortest_paths(algorithm, graph, src, predecessors)
+    return ShortestPaths(src, distances, predecessors)
+
+
+def as_distance_array(distances):
+    """
+    Приводит результат любого алгоритма к массиву float64, где недостижимые вершины — inf
+    (Дейкстра помечает их float('inf'), Форд-Беллман — sys.maxsize).
+    """
+    result = np.asarray(distances, dtype=np.float64)
+    result[result >= float(maxsize)] = np.inf
+    return result
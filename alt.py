@@ -0,0 +1,179 @@
+import heapq
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+from algorithms import as_distance_array
+from csr_graph import CSRGraph
+from dijkstra import _reconstruct_path, bidirectional_dijkstra, dijkstra_point_to_point, dijkstra_with_min_heap
+from graph_io import load_graph
+from instrumentation import count_call_operations
+
+
+def _distances_from(graph, src):
+    return as_distance_array(dijkstra_with_min_heap(graph, graph.num_vertices, src))
+
+
+class LandmarkTable:
+    """
+    Таблицы расстояний от k ориентиров (и до них — для ориентированного графа).
+
+    forward[i, v] = d(L_i, v); для ориентированного графа backward[i, v] = d(v, L_i),
+    для неориентированного backward совпадает с forward. По неравенству треугольника
+    d(v, t) >= max_i max(d(L_i, t) - d(L_i, v), d(v, L_i) - d(t, L_i)).
+    """
+
+    def __init__(self, landmarks, forward, backward, fingerprint):
+        self.landmarks = landmarks
+        self.forward = forward
+        self.backward = backward
+        self.fingerprint = fingerprint
+
+    def lower_bounds(self, target):
+        """
+        Нижние оценки d(v, target) для всех вершин v одной векторной операцией.
+        """
+        with np.errstate(invalid="ignore"):
+            bounds = np.concatenate((self.forward[:, target, None] - self.forward,
+                                     self.backward - self.backward[:, target, None]))
+        # inf - inf (ориентир не связан ни с v, ни с target) ничего не говорит о расстоянии
+        bounds[np.isnan(bounds)] = 0
+        return np.maximum(bounds.max(axis=0), 0)
+
+    def save(self, filename):
+        np.savez(filename, landmarks=self.landmarks, forward=self.forward, backward=self.backward,
+                 fingerprint=np.array(self.fingerprint))
+
+    @classmethod
+    def load(cls, filename):
+        with np.load(filename) as data:
+            return cls(data["landmarks"], data["forward"], data["backward"], str(data["fingerprint"]))
+
+
+def select_landmarks(graph, k, seed=0):
+    """
+    Выбор ориентиров "самый дальний": первый — случайная вершина, каждый следующий —
+    достижимая вершина, наиболее удалённая от уже выбранных. Возвращает таблицу расстояний.
+    """
+    rng = random.Random(seed)
+    landmarks = [rng.randrange(graph.num_vertices)]
+    forward = [_distances_from(graph, landmarks[0])]
+    nearest = forward[0].copy()
+    for _ in range(1, min(k, graph.num_vertices)):
+        candidates = np.where(np.isfinite(nearest), nearest, -1)
+        landmark = int(np.argmax(candidates))
+        if candidates[landmark] <= 0:
+            # Все достижимые вершины уже ориентиры — берём вершину из другой компоненты
+            unreached = np.flatnonzero(~np.isfinite(nearest))
+            if len(unreached) == 0:
+                break
+            landmark = int(rng.choice(unreached.tolist()))
+        landmarks.append(landmark)
+        forward.append(_distances_from(graph, landmark))
+        nearest = np.fmin(nearest, forward[-1])
+
+    forward = np.array(forward)
+    if graph.directed:
+        reversed_graph = graph.reversed()
+        backward = np.array([_distances_from(reversed_graph, landmark) for landmark in landmarks])
+    else:
+        backward = forward
+    return LandmarkTable(np.array(landmarks), forward, backward, graph.fingerprint())
+
+
+def preprocess_landmarks(graph, k=8, filename=None, seed=0):
+    """
+    Таблица ориентиров с сохранением на диск: если filename уже содержит таблицу для этого
+    графа (по отпечатку содержимого) и не меньше k ориентиров, она загружается без пересчёта.
+    """
+    if not isinstance(graph, CSRGraph):
+        graph = CSRGraph.from_edges(graph)
+    if filename and os.path.exists(filename):
+        table = LandmarkTable.load(filename)
+        if table.fingerprint == graph.fingerprint() and len(table.landmarks) >= k:
+            return table
+    table = select_landmarks(graph, k, seed)
+    if filename:
+        table.save(filename)
+    return table
+
+
+def alt_query(graph, table, src, target):
+    """
+    A* с оценками ориентиров (ALT) для одной пары вершин. Оценки согласованы, поэтому
+    вершина, извлечённая из кучи, уже окончательна. Возвращает (расстояние, путь);
+    для недостижимой вершины — (inf, []).
+    """
+    offsets, targets, weights = graph.adjacency_views()
+    bounds = table.lower_bounds(target)
+    if bounds[src] == np.inf:
+        return float('inf'), []
+    bounds = bounds.tolist()
+
+    V = graph.num_vertices
+    distances = [float('inf')] * V
+    distances[src] = 0
+    predecessors = [-1] * V
+    heap = [(bounds[src], 0, src)]  # (оценка полного пути, расстояние, вершина)
+
+    while heap:
+        _, current_distance, current_vertex = heapq.heappop(heap)
+        # @probe heap_pops
+
+        if current_vertex == target:
+            return current_distance, _reconstruct_path(predecessors, src, target)
+
+        if current_distance > distances[current_vertex]:
+            # @probe stale_pops
+            continue
+
+        start, end = offsets[current_vertex], offsets[current_vertex + 1]
+        # @probe edges_relaxed end - start
+        for neighbor, weight in zip(targets[start:end], weights[start:end]):
+            distance = current_distance + weight
+            if distance < distances[neighbor]:
+                # @probe relaxations
+                distances[neighbor] = distance
+                predecessors[neighbor] = current_vertex
+                heapq.heappush(heap, (distance + bounds[neighbor], distance, neighbor))
+                # @probe heap_pushes
+
+    return float('inf'), []
+
+
+def compare_queries(filename, k=8, pairs=50, seed=0):
+    """
+    Сравнивает ALT с остановкой Дейкстры по цели и двунаправленным поиском на случайных парах:
+    время на запрос и среднее число просмотренных рёбер (счётчик edges_relaxed из instrumentation).
+    """
+    graph = load_graph(filename)
+    start_time = time.perf_counter()
+    table = preprocess_landmarks(graph, k, f"{os.path.splitext(filename)[0]}_landmarks.npz")
+    print(f"{filename}: {len(table.landmarks)} ориентиров за {time.perf_counter() - start_time:.6f} с")
+
+    rng = random.Random(seed)
+    V = graph.num_vertices
+    queries = [(rng.randrange(V), rng.randrange(V)) for _ in range(pairs)]
+    cases = [
+        ("до цели", dijkstra_point_to_point, lambda src, target: (graph, V, src, target)),
+        ("двунаправленный", bidirectional_dijkstra, lambda src, target: (graph, V, src, target)),
+        ("ALT", alt_query, lambda src, target: (graph, table, src, target)),
+    ]
+    for src, target in queries:
+        assert alt_query(graph, table, src, target)[0] == dijkstra_point_to_point(graph, V, src, target)[0]
+    for name, function, arguments in cases:
+        start_time = time.perf_counter()
+        for src, target in queries:
+            function(*arguments(src, target))
+        query_time = (time.perf_counter() - start_time) / pairs
+        edges = sum(count_call_operations(function, *arguments(src, target))[1]["edges_relaxed"]
+                    for src, target in queries)
+        print(f"  {name}: {query_time:.6f} с на запрос, просмотрено рёбер {edges / pairs:.0f}")
+
+
+if __name__ == "__main__":
+    # Пример: python alt.py граф.txt [число ориентиров]
+    compare_queries(sys.argv[1], int(sys.argv[2]) if len(sys.argv) > 2 else 8)
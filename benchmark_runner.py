@@ -0,0 +1,325 @@
+import argparse
+import csv
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+
+from algorithms import ALGORITHMS, DIJKSTRA_ALGORITHMS, shortest_paths
+from graph_io import load_graph, read_graph_metadata
+from instrumentation import COUNTERS, count_operations
+from sp_cache import ShortestPathCache
+
+# Семейства графов: имя -> шаблон имени файла с числом вершин n
+GRAPH_FAMILIES = {
+    "best": "best_case_graph_{n}_vertices.txt",
+    "average": "average_case_graph_{n}_vertices.txt",
+    "worst": "worst_case_graph_{n}_vertices.txt",
+    "complete": "complete_graph_{n}_vertices.txt",
+    "grid": "grid_graph_{n}_vertices.txt",
+    "power_law": "power_law_graph_{n}_vertices.txt",
+    "negative": "negative_graph_{n}_vertices.txt",
+}
+# Семейства с отрицательными весами: Дейкстра и delta-stepping на них неприменимы
+NEGATIVE_WEIGHT_FAMILIES = {"negative"}
+DEFAULT_SIZES = list(range(1000, 11000, 1000))
+SCHEMA_VERSION = 1
+
+
+def register_family(name, pattern, negative_weights=False):
+    """
+    Регистрирует семейство графов: pattern — шаблон имени файла с полем {n}.
+    """
+    GRAPH_FAMILIES[name] = pattern
+    if negative_weights:
+        NEGATIVE_WEIGHT_FAMILIES.add(name)
+
+
+def check_case(algorithm, family):
+    """
+    Проверяет, что алгоритм применим к семейству графов; иначе ValueError.
+    """
+    if algorithm not in ALGORITHMS:
+        raise KeyError(f"Неизвестный алгоритм: {algorithm}")
+    if algorithm in DIJKSTRA_ALGORITHMS and family in NEGATIVE_WEIGHT_FAMILIES:
+        raise ValueError(f"{algorithm} требует неотрицательных весов, а в семействе {family} есть отрицательные рёбра")
+
+
+def measure(function, repeats=5, warmup=1):
+    """
+    Запускает function warmup раз без замера и repeats раз с замером perf_counter_ns;
+    возвращает список времён в наносекундах.
+    """
+    for _ in range(warmup):
+        function()
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter_ns()
+        function()
+        samples.append(time.perf_counter_ns() - start)
+    return samples
+
+
+def summarize(samples):
+    """
+    Медиана, квартили и межквартильный размах серии замеров.
+    """
+    q1, median, q3 = np.percentile(samples, [25, 50, 75])
+    return {"median_ns": int(median), "q1_ns": int(q1), "q3_ns": int(q3), "iqr_ns": int(q3 - q1),
+            "min_ns": int(min(samples)), "max_ns": int(max(samples))}
+
+
+def peak_memory(function):
+    """
+    Пиковый объём памяти (байт), выделенной за один запуск function, по tracemalloc.
+    """
+    tracemalloc.start()
+    try:
+        function()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def run_case(algorithm, family, size, repeats=5, warmup=1, source=0, trace_memory=True, cache=None,
+             counters=False):
+    """
+    Замер одного алгоритма на одном графе. Загрузка графа и построение смежности
+    замеряются отдельно от самого поиска. При counters добавляются счётчики операций
+    из отдельного, не замеряемого запуска инструментированной версии алгоритма.
+
+    С кэшем (sp_cache.ShortestPathCache с каталогом) граф, уже обработанный этим алгоритмом
+    с тем же содержимым, не пересчитывается: возвращается сохранённая запись с пометкой "cached".
+    Запись переиспользуется, только если она снята на том же коммите (без незакоммиченных
+    изменений) и с теми же параметрами замера, иначе сравнение с --baseline сравнивало бы
+    старые замеры со старыми.
+    """
+    check_case(algorithm, family)
+    filename = GRAPH_FAMILIES[family].format(n=size)
+
+    start = time.perf_counter_ns()
+    graph = load_graph(filename)
+    load_ns = time.perf_counter_ns() - start
+
+    record_file = cache.record_path(graph, algorithm, source) if cache is not None else None
+    if record_file:
+        commit, dirty = git_commit()
+        settings = {"commit": commit, "repeats": repeats, "warmup": warmup, "trace_memory": trace_memory,
+                    "counters": counters}
+        if commit is None or dirty:
+            record_file = None
+        elif cache.get(graph, algorithm, source) is not None and os.path.exists(record_file):
+            saved = read_json(record_file)
+            if saved.get("settings") == settings:
+                return {**saved, "cached": True}
+
+    start = time.perf_counter_ns()
+    graph.adjacency(undirected=algorithm in DIJKSTRA_ALGORITHMS and not graph.directed)
+    adjacency_ns = time.perf_counter_ns() - start
+
+    last_result = []
+
+    def run():
+        last_result[:] = [shortest_paths(algorithm, graph, source)]
+
+    samples = measure(run, repeats, warmup)
+    record = {
+        "algorithm": algorithm,
+        "family": family,
+        "file": filename,
+        "vertices": graph.num_vertices,
+        "edges": graph.num_edges,
+        "source": source,
+        "load_ns": load_ns,
+        "adjacency_ns": adjacency_ns,
+        "samples_ns": samples,
+        **summarize(samples),
+        "graph_metadata": read_graph_metadata(filename),
+    }
+    if trace_memory:
+        record["peak_memory_bytes"] = peak_memory(run)
+    if counters:
+        record["counters"] = count_operations(algorithm, graph, source)[1]
+    if cache is not None:
+        cache.put(graph, algorithm, source, last_result[0])
+    if record_file:
+        write_json({**record, "settings": settings}, record_file)
+    return record
+
+
+def git_commit():
+    """
+    Хэш текущего коммита и признак незакоммиченных изменений (None вне git).
+    """
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"],
+                                    capture_output=True, text=True, check=True).stdout.strip())
+    except (OSError, subprocess.CalledProcessError):
+        return None, None
+    return commit, dirty
+
+
+def machine_metadata():
+    commit, dirty = git_commit()
+    return {
+        "schema_version": SCHEMA_VERSION,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "commit": commit,
+        "dirty": dirty,
+        "hostname": platform.node(),
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+    }
+
+
+def run_benchmarks(cases, sizes=DEFAULT_SIZES, repeats=5, warmup=1, source=0, trace_memory=True, log=print,
+                   cache=None, counters=False):
+    """
+    Прогоняет пары (алгоритм, семейство) на всех размерах sizes; графы, файлов которых нет,
+    пропускаются. Возвращает {"metadata": ..., "results": [...]}.
+    """
+    results = []
+    for algorithm, family in cases:
+        check_case(algorithm, family)
+    for algorithm, family in cases:
+        for size in sizes:
+            filename = GRAPH_FAMILIES[family].format(n=size)
+            if not os.path.exists(filename):
+                log(f"Граф {filename} не найден, пропускаем.")
+                continue
+            record = run_case(algorithm, family, size, repeats, warmup, source, trace_memory, cache, counters)
+            results.append(record)
+            log(("[кэш] " if record.get("cached") else "") + f"{algorithm} / {filename}: медиана {record['median_ns'] / 1e9:.6f} с, "
+                f"IQR {record['iqr_ns'] / 1e9:.6f} с, загрузка {record['load_ns'] / 1e9:.6f} с")
+    return {"metadata": machine_metadata(), "results": results}
+
+
+def write_json(report, filename):
+    with open(filename, "w", encoding="UTF-8") as file:
+        json.dump(report, file, ensure_ascii=False, indent=2)
+
+
+def read_json(filename):
+    with open(filename, encoding="UTF-8") as file:
+        return json.load(file)
+
+
+def write_csv(report, filename):
+    """
+    Плоская таблица результатов: по строке на замер, метаданные повторяются в каждой строке.
+    """
+    columns = ["algorithm", "family", "file", "vertices", "edges", "source", "load_ns", "adjacency_ns",
+               "median_ns", "q1_ns", "q3_ns", "iqr_ns", "min_ns", "max_ns", "peak_memory_bytes"]
+    metadata_columns = ["commit", "hostname", "timestamp"]
+    with open(filename, "w", encoding="UTF-8", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(columns + list(COUNTERS) + metadata_columns)
+        for record in report["results"]:
+            writer.writerow([record.get(column) for column in columns]
+                            + [record.get("counters", {}).get(counter) for counter in COUNTERS]
+                            + [report["metadata"].get(column) for column in metadata_columns])
+
+
+def write_times_to_file(report, algorithm, family, filename):
+    """
+    Записывает медианы одного алгоритма на одном семействе графов в старом текстовом формате
+    "N : t секунд". Если в отчёте нет таких замеров, файл не трогается (его читает drawGraphic.py).
+    Возвращает True, если файл записан.
+    """
+    records = [record for record in report["results"]
+               if record["algorithm"] == algorithm and record["family"] == family]
+    if not records:
+        return False
+    with open(filename, "w", encoding="UTF-8") as file:
+        for record in records:
+            file.write(f"{record['vertices']} : {record['median_ns'] / 1e9:.6f} секунд\n")
+    return True
+
+
+def find_regressions(report, baseline, tolerance=0.10):
+    """
+    Сравнивает медианы с базовым прогоном по ключу (алгоритм, файл). Регрессия — медиана
+    выросла больше чем на tolerance и больше, чем на сумму межквартильных размахов обоих прогонов.
+    """
+    baseline_records = {(record["algorithm"], record["file"]): record for record in baseline["results"]}
+    regressions = []
+    for record in report["results"]:
+        base = baseline_records.get((record["algorithm"], record["file"]))
+        if base is None:
+            continue
+        growth = record["median_ns"] - base["median_ns"]
+        if growth > tolerance * base["median_ns"] and growth > record["iqr_ns"] + base["iqr_ns"]:
+            regressions.append((record, base))
+    return regressions
+
+
+def main(argv=None, default_cases=None, legacy_times=None, default_output=None):
+    """
+    Точка входа командной строки. default_cases, legacy_times ({(алгоритм, семейство): файл})
+    и default_output задают поведение драйверов dijkstra.py и Ford-Bellman.py при запуске без аргументов.
+    Возвращает код выхода: 1, если найдены регрессии относительно --baseline.
+    """
+    parser = argparse.ArgumentParser(description="Замеры алгоритмов кратчайших путей")
+    parser.add_argument("--algorithms", nargs="+", choices=sorted(ALGORITHMS))
+    parser.add_argument("--families", nargs="+", choices=sorted(GRAPH_FAMILIES), default=["best", "average", "worst"])
+    parser.add_argument("--sizes", nargs="+", type=int, default=DEFAULT_SIZES)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--source", type=int, default=0)
+    parser.add_argument("--no-memory", action="store_true", help="не замерять пиковую память")
+    parser.add_argument("--counters", action="store_true", help="добавить счётчики релаксаций и операций с кучей")
+    parser.add_argument("--json", default=default_output)
+    parser.add_argument("--csv")
+    parser.add_argument("--baseline", help="JSON предыдущего прогона для поиска регрессий")
+    parser.add_argument("--tolerance", type=float, default=0.10)
+    parser.add_argument("--cache-dir", help="каталог кэша: уже обработанные графы не пересчитываются")
+    args = parser.parse_args(argv)
+
+    if args.algorithms:
+        cases = [(algorithm, family) for algorithm in args.algorithms for family in args.families]
+    elif default_cases:
+        cases = default_cases
+    else:
+        parser.error("нужно указать --algorithms")
+    for algorithm, family in cases:
+        try:
+            check_case(algorithm, family)
+        except ValueError as error:
+            parser.error(str(error))
+
+    cache = ShortestPathCache(directory=args.cache_dir) if args.cache_dir else None
+    report = run_benchmarks(cases, args.sizes, args.repeats, args.warmup, args.source, not args.no_memory,
+                            cache=cache, counters=args.counters)
+    if cache is not None:
+        report["metadata"]["cache"] = cache.stats()
+    if args.json:
+        write_json(report, args.json)
+    if args.csv:
+        write_csv(report, args.csv)
+    for (algorithm, family), filename in (legacy_times or {}).items():
+        write_times_to_file(report, algorithm, family, filename)
+
+    if args.baseline:
+        regressions = find_regressions(report, read_json(args.baseline), args.tolerance)
+        for record, base in regressions:
+            print(f"Регрессия: {record['algorithm']} / {record['file']}: "
+                  f"{base['median_ns'] / 1e9:.6f} с -> {record['median_ns'] / 1e9:.6f} с")
+        if regressions:
+            return 1
+    print("Обработка завершена. Результаты записаны в файлы.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
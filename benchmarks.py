@@ -0,0 +1,326 @@
+import importlib
+import random
+from array import array
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from algorithms import ALGORITHMS, shortest_paths
+from csr_graph import CSRGraph, read_csr_graph
+from dijkstra import DIJKSTRA_VARIANTS, bidirectional_dijkstra, dijkstra_point_to_point, dijkstra_with_min_heap
+from dynamic_sssp import DynamicSSSP
+from graph_io import convert_text_graph, load_graph, read_binary_graph, read_graph_from_file
+
+bellman_ford = importlib.import_module("Ford-Bellman")
+
+
+def measure_memory(loader, filename):
+    """
+    Возвращает загруженный граф и пиковый объём памяти (в байтах), выделенный при загрузке.
+    """
+    tracemalloc.start()
+    graph = loader(filename)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return graph, peak
+
+
+def time_queries(algorithm, repeats):
+    """
+    Среднее время одного запуска алгоритма (в секундах).
+    """
+    start_time = time.perf_counter()
+    for _ in range(repeats):
+        algorithm()
+    return (time.perf_counter() - start_time) / repeats
+
+
+def compare_representations(filename, repeats=5, source_vertex=0):
+    """
+    Сравнивает список рёбер Python и CSRGraph по памяти и времени одного запроса.
+    """
+    (edges, num_vertices), list_memory = measure_memory(read_graph_from_file, filename)
+    csr, csr_memory = measure_memory(read_csr_graph, filename)
+    csr.adjacency()
+
+    print(f"{filename}: {num_vertices} вершин, {len(edges)} рёбер")
+    print(f"  память: список {list_memory / 2**20:.2f} МБ, CSR {csr.nbytes() / 2**20:.2f} МБ "
+          f"(пик загрузки {csr_memory / 2**20:.2f} МБ)")
+
+    cases = [
+        ("dijkstra_with_min_heap", lambda graph: dijkstra_with_min_heap(graph, num_vertices, source_vertex)),
+        ("bellman_ford_optimized",
+         lambda graph: bellman_ford.bellman_ford_optimized(graph, num_vertices, len(graph), source_vertex)),
+    ]
+    for name, run in cases:
+        list_time = time_queries(lambda: run(edges), repeats)
+        csr_time = time_queries(lambda: run(csr), repeats)
+        print(f"  {name}: список {list_time:.6f} с, CSR {csr_time:.6f} с "
+              f"(x{list_time / csr_time:.2f})")
+
+
+def compare_loaders(filename, repeats=5, source_vertex=0):
+    """
+    Сравнивает разбор текстового файла и открытие бинарного через memmap,
+    включая первый запрос Дейкстры на загруженном графе.
+    """
+    binary = convert_text_graph(filename)
+    loaders = [
+        ("текст -> CSR", lambda: read_csr_graph(filename)),
+        ("memmap .bin", lambda: read_binary_graph(binary)),
+    ]
+
+    print(f"{filename}:")
+    for name, loader in loaders:
+        load_time = time_queries(loader, repeats)
+        graph = loader()
+        start_time = time.perf_counter()
+        dijkstra_with_min_heap(graph, graph.num_vertices, source_vertex)
+        query_time = time.perf_counter() - start_time
+        print(f"  {name}: загрузка {load_time:.6f} с, первый запрос {query_time:.6f} с")
+
+
+def compare_bellman_ford_engines(filename, repeats=3, source_vertex=0):
+    """
+    Сравнивает интерпретируемый bellman_ford_optimized и векторизованный движок на одном графе.
+    """
+    graph = load_graph(filename)
+    num_vertices, num_edges = graph.num_vertices, graph.num_edges
+    expected = bellman_ford.bellman_ford_optimized(graph, num_vertices, num_edges, source_vertex)
+    assert bellman_ford.bellman_ford_vectorized(graph, num_vertices, num_edges, source_vertex) == expected
+
+    python_time = time_queries(
+        lambda: bellman_ford.bellman_ford_optimized(graph, num_vertices, num_edges, source_vertex), repeats)
+    numpy_time = time_queries(
+        lambda: bellman_ford.bellman_ford_vectorized(graph, num_vertices, num_edges, source_vertex), repeats)
+    print(f"{filename}: optimized {python_time:.6f} с, vectorized {numpy_time:.6f} с "
+          f"(x{python_time / numpy_time:.1f})")
+
+
+def compare_bellman_ford_streaming(filename, chunk_edges=1 << 20, source_vertex=0):
+    """
+    Сравнивает векторизованный Беллман-Форд на загруженном графе с потоковым чтением рёбер
+    из текстового и бинарного файла: время и пик памяти по tracemalloc (страницы memmap
+    в него не входят — они принадлежат кэшу ОС).
+    """
+    chunk_edges = int(chunk_edges)
+    binary = convert_text_graph(filename)
+
+    def in_memory():
+        graph = read_csr_graph(filename)
+        return bellman_ford.bellman_ford_vectorized(graph, graph.num_vertices, graph.num_edges, source_vertex)
+
+    cases = [
+        ("в памяти", in_memory),
+        ("поток из текста", lambda: bellman_ford.bellman_ford_streaming(filename, source_vertex, chunk_edges=chunk_edges)),
+        ("поток из .bin", lambda: bellman_ford.bellman_ford_streaming(binary, source_vertex, chunk_edges=chunk_edges)),
+    ]
+    expected = in_memory()
+    print(f"{filename} (кусок {chunk_edges} рёбер):")
+    for name, run in cases:
+        tracemalloc.start()
+        start_time = time.perf_counter()
+        distances = run()
+        elapsed = time.perf_counter() - start_time
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        assert list(distances) == expected
+        print(f"  {name}: {elapsed:.6f} с, пик памяти {peak / 2**20:.2f} МБ")
+
+
+def compare_bellman_ford_worklists(filename, repeats=3, source_vertex=0):
+    """
+    Сравнивает полный перебор рёбер (bellman_ford_optimized) с рабочими списками SPFA и Йена.
+    """
+    graph = load_graph(filename)
+    num_vertices, num_edges = graph.num_vertices, graph.num_edges
+    expected = bellman_ford.bellman_ford_optimized(graph, num_vertices, num_edges, source_vertex)
+
+    timings = []
+    for name in ("optimized", "queue", "yen"):
+        algorithm = bellman_ford.BELLMAN_FORD_VARIANTS[name]
+        assert algorithm(graph, num_vertices, num_edges, source_vertex) == expected
+        timings.append(f"{name} {time_queries(lambda: algorithm(graph, num_vertices, num_edges, source_vertex), repeats):.6f} с")
+    print(f"{filename}: " + ", ".join(timings))
+
+
+def with_negative_cycle(graph, anchor, seed=0):
+    """
+    Копия графа с добавленным циклом anchor -> b -> c -> anchor суммарного веса -1
+    через две случайные вершины b и c.
+    """
+    rng = random.Random(seed)
+    b, c = rng.sample([vertex for vertex in range(graph.num_vertices) if vertex != anchor], 2)
+    return CSRGraph(np.concatenate((graph.src, [anchor, b, c])), np.concatenate((graph.dst, [b, c, anchor])),
+                    np.concatenate((graph.weight, [1, 1, -3])), graph.num_vertices, graph.directed)
+
+
+def compare_negative_cycle_detection(filename, source_vertex=0):
+    """
+    Время до обнаружения цикла с отрицательным весом: проверка после всех проходов против
+    разборки поддеревьев Тарьяна. Цикл добавляется у вершины, которую поиск достигает
+    одной из первых, в середине и последней. Для проверок в конце прогона время включает
+    и поиск самого цикла для NegativeCycleError.
+    """
+    graph = load_graph(filename)
+    num_vertices, num_edges = graph.num_vertices, graph.num_edges
+    distances = np.array(bellman_ford.bellman_ford_vectorized(graph, num_vertices, num_edges, source_vertex))
+    reached = np.flatnonzero(distances < sys.maxsize)
+    reached = reached[np.argsort(distances[reached], kind="stable")]
+
+    print(f"{filename}:")
+    for position, index in (("рядом с источником", min(1, len(reached) - 1)),
+                            ("в середине", len(reached) // 2), ("в конце", len(reached) - 1)):
+        cyclic = with_negative_cycle(graph, int(reached[index]))
+        timings = []
+        for name in ("optimized", "standard", "vectorized", "queue", "tarjan"):
+            if name not in ("vectorized", "tarjan") and num_vertices * num_edges > 10 ** 8:
+                continue  # При цикле делают порядка V проходов и слишком долги на больших графах
+            start_time = time.perf_counter()
+            try:
+                bellman_ford.BELLMAN_FORD_VARIANTS[name](cyclic, num_vertices, cyclic.num_edges, source_vertex)
+            except bellman_ford.NegativeCycleError as error:
+                assert error.weight < 0
+                timings.append(f"{name} {time.perf_counter() - start_time:.6f} с")
+        print(f"  цикл {position}: " + ", ".join(timings))
+
+
+def compare_point_to_point(filename, pairs=20, seed=0):
+    """
+    Сравнивает полный запуск Дейкстры с остановкой по цели и двунаправленным поиском
+    на случайных парах вершин.
+    """
+    graph = load_graph(filename)
+    num_vertices = graph.num_vertices
+    rng = random.Random(seed)
+    queries = [(rng.randrange(num_vertices), rng.randrange(num_vertices)) for _ in range(pairs)]
+
+    for src, target in queries:
+        expected = dijkstra_with_min_heap(graph, num_vertices, src)[target]
+        assert dijkstra_point_to_point(graph, num_vertices, src, target)[0] == expected
+        assert bidirectional_dijkstra(graph, num_vertices, src, target)[0] == expected
+
+    cases = [
+        ("полный", lambda src, target: dijkstra_with_min_heap(graph, num_vertices, src)),
+        ("до цели", lambda src, target: dijkstra_point_to_point(graph, num_vertices, src, target)),
+        ("двунаправленный", lambda src, target: bidirectional_dijkstra(graph, num_vertices, src, target)),
+    ]
+    timings = [f"{name} {time_queries(lambda: [run(*query) for query in queries], 1) / pairs:.6f} с"
+               for name, run in cases]
+    print(f"{filename}: " + ", ".join(timings))
+
+
+def measure_predecessor_overhead(filename, repeats=3, source_vertex=0):
+    """
+    Замеряет, во сколько обходится запись предшественников для каждой реализации.
+    """
+    graph = load_graph(filename)
+    print(f"{filename}:")
+    for name in ALGORITHMS:
+        if name in ("bellman_ford_standard", "bellman_ford_unoptimized"):
+            continue  # Всегда делают V - 1 проходов и слишком долги для сравнения
+        plain_time = time_queries(lambda: shortest_paths(name, graph, source_vertex), repeats)
+        tracked_time = time_queries(lambda: shortest_paths(name, graph, source_vertex, array('i')), repeats)
+        print(f"  {name}: без предшественников {plain_time:.6f} с, с предшественниками {tracked_time:.6f} с "
+              f"({(tracked_time / plain_time - 1) * 100:+.1f}%)")
+
+
+def compare_heaps(filename, repeats=3, source_vertex=0):
+    """
+    Сравнивает очереди с приоритетом в Дейкстре: heapq с ленивым удалением, индексированные
+    кучи с уменьшением ключа и корзины Дайала.
+    """
+    graph = load_graph(filename)
+    num_vertices = graph.num_vertices
+    expected = dijkstra_with_min_heap(graph, num_vertices, source_vertex)
+
+    timings = []
+    for name, algorithm in DIJKSTRA_VARIANTS.items():
+        if name in ("array", "matrix"):
+            continue
+        assert algorithm(graph, num_vertices, source_vertex) == expected
+        timings.append(f"{name} {time_queries(lambda: algorithm(graph, num_vertices, source_vertex), repeats):.6f} с")
+    print(f"{filename}: " + ", ".join(timings))
+
+
+def random_graph(num_vertices, num_edges, seed=0, max_weight=1000):
+    """
+    Случайный граф с заданным числом рёбер для замеров (без проверки связности и кратных рёбер).
+    """
+    rng = np.random.default_rng(seed)
+    return CSRGraph(rng.integers(0, num_vertices, num_edges), rng.integers(0, num_vertices, num_edges),
+                    rng.integers(1, max_weight + 1, num_edges), num_vertices)
+
+
+def compare_density(num_vertices, repeats=3, source_vertex=0):
+    """
+    Ищет плотность, начиная с которой Дейкстра на массиве (CSR) и на матрице смежности
+    обгоняет реализации на кучах. Аргумент — число вершин.
+    """
+    num_vertices = int(num_vertices)
+    names = ("min_heap", "binary_heap", "array", "matrix")
+    print(f"V = {num_vertices}: " + ", ".join(names))
+    for density in (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5):
+        graph = random_graph(num_vertices, max(int(density * num_vertices ** 2 / 2), 1))
+        graph.adjacency()
+        graph.adjacency_matrix()
+        timings = [time_queries(lambda: DIJKSTRA_VARIANTS[name](graph, num_vertices, source_vertex), repeats)
+                   for name in names]
+        fastest = names[timings.index(min(timings))]
+        print(f"  плотность {density:<6} E = {graph.num_edges:<9} "
+              + ", ".join(f"{timing:.4f}" for timing in timings) + f" с  -> {fastest}")
+
+
+def compare_dynamic_updates(filename, source_vertex=0, seed=0):
+    """
+    Сравнивает обработку пакета случайных изменений весов в DynamicSSSP с полным пересчётом
+    Дейкстрой для пакетов разного размера.
+    """
+    graph = load_graph(filename)
+    num_vertices = graph.num_vertices
+    rng = random.Random(seed)
+    print(f"{filename}:")
+    for batch_size in (1, 10, 100, 1000):
+        dynamic = DynamicSSSP.from_algorithm("dijkstra_with_min_heap", graph, source_vertex)
+        edges = [(u, v) for u in range(num_vertices) for v in dynamic.out_edges[u] if u <= v]
+        batch = [(u, v, rng.randint(1, 1000)) for u, v in rng.sample(edges, min(batch_size, len(edges)))]
+
+        start_time = time.perf_counter()
+        touched = dynamic.apply(batch)
+        update_time = time.perf_counter() - start_time
+        updated = dynamic.graph()
+        full_time = time_queries(lambda: dijkstra_with_min_heap(updated, num_vertices, source_vertex), 1)
+        assert dynamic.distances == dijkstra_with_min_heap(updated, num_vertices, source_vertex)
+        print(f"  {batch_size} изменений: {update_time:.6f} с ({touched} вершин), "
+              f"полный пересчёт {full_time:.6f} с")
+
+
+SUITES = {
+    "csr": compare_representations,
+    "io": compare_loaders,
+    "bf-vectorized": compare_bellman_ford_engines,
+    "bf-worklist": compare_bellman_ford_worklists,
+    "bf-streaming": compare_bellman_ford_streaming,
+    "bf-negative-cycle": compare_negative_cycle_detection,
+    "p2p": compare_point_to_point,
+    "predecessors": measure_predecessor_overhead,
+    "heaps": compare_heaps,
+    "density": compare_density,
+    "dynamic": compare_dynamic_updates,
+}
+
+# Аргументы наборов по умолчанию, если это не файлы графов: density принимает число вершин
+DEFAULT_ARGUMENTS = {
+    "density": [1000, 2000, 5000],
+}
+
+
+if __name__ == "__main__":
+    suite = sys.argv[1] if len(sys.argv) > 1 and sys.argv[1] in SUITES else "csr"
+    files = [arg for arg in sys.argv[1:] if arg not in SUITES]
+    files = files or DEFAULT_ARGUMENTS.get(suite) or [f"{case}_case_graph_{i * 1000}_vertices.txt"
+                                                      for case in ("best", "average", "worst") for i in range(1, 11)]
+    for filename in files:
+        SUITES[suite](filename)
@@ -0,0 +1,150 @@
+import argparse
+import sys
+
+import numpy as np
+
+from algorithms import DIJKSTRA_ALGORITHMS
+from benchmark_runner import read_json
+from theory_graph import COMPLEXITY_MODELS, EXPECTED_COMPLEXITY
+
+# Насколько (по абсолютной величине) должен измениться показатель степени, чтобы считать,
+# что изменился класс масштабирования, а не только константа
+EXPONENT_TOLERANCE = 0.25
+
+
+def measurement_series(report):
+    """
+    Замеры отчёта benchmark_runner по парам (алгоритм, семейство): массивы V, E (реальное
+    число рёбер каждого графа), медиан и списки отдельных замеров, по возрастанию V.
+    """
+    series = {}
+    for record in sorted(report["results"], key=lambda record: record["vertices"]):
+        series.setdefault((record["algorithm"], record["family"]), []).append(record)
+    return {
+        key: {
+            "V": np.array([record["vertices"] for record in records], dtype=np.float64),
+            "E": np.array([record["edges"] for record in records], dtype=np.float64),
+            "t": np.array([record["median_ns"] for record in records], dtype=np.float64) / 1e9,
+            "samples": [np.array(record.get("samples_ns") or [record["median_ns"]]) / 1e9 for record in records],
+        }
+        for key, records in series.items()
+    }
+
+
+def fit_model(V, E, t, model):
+    """
+    Подбирает константу c в t ≈ c·f(V, E) по относительным ошибкам (времена различаются
+    на порядки, и абсолютные ошибки отдали бы всё решение самым большим графам).
+    Возвращает (c, среднеквадратичная относительная ошибка).
+    """
+    f = np.asarray(COMPLEXITY_MODELS[model](V, E), dtype=np.float64)
+    ratio = f / t
+    c = ratio.sum() / (ratio ** 2).sum()
+    return c, float(np.sqrt(np.mean((c * ratio - 1) ** 2)))
+
+
+def rank_models(V, E, t):
+    """
+    Все теоретические модели, отсортированные по относительной ошибке: [(модель, c, ошибка)].
+    """
+    fits = [(model, *fit_model(V, E, t, model)) for model in COMPLEXITY_MODELS]
+    return sorted(fits, key=lambda fit: fit[2])
+
+
+def scaling_exponent(sizes, t):
+    """
+    Показатель k степенного закона t ≈ a·size^k (наклон в логарифмических координатах).
+    """
+    return np.polyfit(np.log(sizes), np.log(t), 1)[0]
+
+
+def bootstrap_exponent(sizes, samples, resamples=1000, confidence=0.95, seed=0):
+    """
+    Показатель степени и его бутстреп-доверительный интервал: в каждой повторной выборке
+    размеры графов выбираются с возвращением, а время для каждого — случайный из его замеров.
+    Возвращает (k по медианам, нижняя граница, верхняя граница).
+    """
+    rng = np.random.default_rng(seed)
+    sizes = np.asarray(sizes, dtype=np.float64)
+    medians = np.array([np.median(sample) for sample in samples])
+    estimates = []
+    for _ in range(resamples):
+        chosen = rng.integers(0, len(sizes), len(sizes))
+        if len(np.unique(sizes[chosen])) < 2:
+            continue
+        times = np.array([rng.choice(samples[index]) for index in chosen])
+        estimates.append(scaling_exponent(sizes[chosen], times))
+    tail = (1 - confidence) / 2 * 100
+    low, high = np.percentile(estimates, [tail, 100 - tail])
+    return scaling_exponent(sizes, medians), low, high
+
+
+def analyze(report, resamples=1000, seed=0):
+    """
+    Анализ отчёта: для каждой пары (алгоритм, семейство) — лучшая теоретическая модель
+    с константой, показатель степени по V с доверительным интервалом и ожидаемая модель.
+    """
+    results = {}
+    for (algorithm, family), series in measurement_series(report).items():
+        if len(series["V"]) < 3:
+            continue  # По двум точкам ни модель, ни интервал не определить
+        ranking = rank_models(series["V"], series["E"], series["t"])
+        exponent, low, high = bootstrap_exponent(series["V"], series["samples"], resamples, seed=seed)
+        expected = EXPECTED_COMPLEXITY.get(("dijkstra" if algorithm in DIJKSTRA_ALGORITHMS else "bellman_ford", family))
+        results[(algorithm, family)] = {
+            "best_model": ranking[0][0],
+            "constant": ranking[0][1],
+            "error": ranking[0][2],
+            "ranking": ranking,
+            "exponent": exponent,
+            "exponent_ci": (low, high),
+            "expected_model": expected,
+        }
+    return results
+
+
+def scaling_changes(current, baseline, tolerance=EXPONENT_TOLERANCE):
+    """
+    Пары (алгоритм, семейство), у которых изменился класс масштабирования: доверительные
+    интервалы показателя не пересекаются и показатель сдвинулся больше чем на tolerance.
+    Изменение одной лишь константы (тот же показатель) сюда не попадает.
+    """
+    changes = []
+    for key, result in current.items():
+        base = baseline.get(key)
+        if base is None:
+            continue
+        (low, high), (base_low, base_high) = result["exponent_ci"], base["exponent_ci"]
+        disjoint = low > base_high or high < base_low
+        if disjoint and abs(result["exponent"] - base["exponent"]) > tolerance:
+            changes.append((key, base, result))
+    return changes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Эмпирическая сложность по результатам benchmark_runner")
+    parser.add_argument("report", help="JSON с результатами замеров")
+    parser.add_argument("--baseline", help="JSON предыдущего прогона для поиска смены класса сложности")
+    parser.add_argument("--resamples", type=int, default=1000)
+    parser.add_argument("--tolerance", type=float, default=EXPONENT_TOLERANCE)
+    args = parser.parse_args(argv)
+
+    current = analyze(read_json(args.report), args.resamples)
+    for (algorithm, family), result in current.items():
+        low, high = result["exponent_ci"]
+        print(f"{algorithm} / {family}: лучшая модель O({result['best_model']}), c = {result['constant']:.3e}, "
+              f"ошибка {result['error'] * 100:.1f}%; показатель по V {result['exponent']:.2f} [{low:.2f}; {high:.2f}]"
+              + (f"; ожидается O({result['expected_model']})" if result["expected_model"] else ""))
+
+    if args.baseline:
+        changes = scaling_changes(current, analyze(read_json(args.baseline), args.resamples), args.tolerance)
+        for (algorithm, family), base, result in changes:
+            print(f"Смена класса сложности: {algorithm} / {family}: показатель {base['exponent']:.2f} -> "
+                  f"{result['exponent']:.2f}, модель O({base['best_model']}) -> O({result['best_model']})")
+        if changes:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
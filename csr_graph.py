@@ -0,0 +1,146 @@
+import hashlib
+
+import numpy as np
+
+
+class CSRGraph:
+    """
+    Компактное представление графа для алгоритмов Дейкстры и Форда-Беллмана.
+
+    Рёбра хранятся тремя параллельными массивами NumPy (src, dst, weight) в порядке файла:
+    по ним итерируются алгоритмы Форда-Беллмана. Списки смежности в формате CSR
+    (offsets, targets, weights) строятся один раз при первом обращении и кэшируются,
+    поэтому повторные запуски алгоритмов на одном графе не пересобирают смежность.
+
+    По умолчанию граф неориентированный (как в dijkstra.py): каждое ребро попадает
+    в списки смежности обеих вершин. Форд-Беллман всегда трактует рёбра как направленные u -> v.
+    """
+
+    def __init__(self, src, dst, weight, num_vertices=None, directed=False):
+        self.src = np.ascontiguousarray(src, dtype=np.int32)
+        self.dst = np.ascontiguousarray(dst, dtype=np.int32)
+        weight = np.asarray(weight)
+        # Пустой список весов NumPy считает float64; по умолчанию веса целые
+        weight_dtype = np.float64 if weight.dtype.kind == "f" and weight.size else np.int64
+        self.weight = np.ascontiguousarray(weight, dtype=weight_dtype)
+
+        if num_vertices is None:
+            num_vertices = int(max(self.src.max(), self.dst.max())) + 1 if len(self.src) else 0
+        self.num_vertices = num_vertices
+        self.directed = directed
+
+        self._adjacency = {}
+        self._edge_views = None
+        self._reversed = None
+        self._matrix = None
+        self._fingerprint = None
+
+    @classmethod
+    def from_edges(cls, edges, num_vertices=None, directed=False):
+        """
+        Строит граф из списка рёбер [u, v, w] (формат read_graph_from_file).
+        """
+        array = np.asarray(edges, dtype=np.int64).reshape(-1, 3)
+        return cls(array[:, 0], array[:, 1], array[:, 2], num_vertices, directed)
+
+    @property
+    def num_edges(self):
+        return len(self.src)
+
+    def __len__(self):
+        return len(self.src)
+
+    def __iter__(self):
+        """
+        Итерация по рёбрам (u, v, w) без создания списков Python — замена списку рёбер.
+        """
+        if self._edge_views is None:
+            self._edge_views = (memoryview(self.src), memoryview(self.dst), memoryview(self.weight))
+        return zip(*self._edge_views)
+
+    def adjacency(self, undirected=None):
+        """
+        Возвращает массивы CSR (offsets, targets, weights): соседи вершины u лежат
+        в targets[offsets[u]:offsets[u + 1]]. По умолчанию направленность берётся из графа.
+        """
+        if undirected is None:
+            undirected = not self.directed
+
+        if undirected not in self._adjacency:
+            if undirected:
+                # Чередуем прямое и обратное ребро, чтобы сохранить порядок соседей,
+                # который давал словарь списков в dijkstra.py
+                src = np.stack((self.src, self.dst), axis=1).ravel()
+                dst = np.stack((self.dst, self.src), axis=1).ravel()
+                weight = np.repeat(self.weight, 2)
+            else:
+                src, dst, weight = self.src, self.dst, self.weight
+
+            order = np.argsort(src, kind="stable")
+            offsets = np.zeros(self.num_vertices + 1, dtype=np.int64)
+            np.cumsum(np.bincount(src, minlength=self.num_vertices), out=offsets[1:])
+            self._adjacency[undirected] = (offsets, dst[order], weight[order])
+
+        return self._adjacency[undirected]
+
+    def adjacency_views(self, undirected=None):
+        """
+        То же, что adjacency(), но в виде memoryview: индексация и срезы отдают
+        обычные int Python, что быстрее скаляров NumPy во внутренних циклах.
+        """
+        return tuple(memoryview(array) for array in self.adjacency(undirected))
+
+    def adjacency_matrix(self):
+        """
+        Матрица смежности V×V (float64): вес кратчайшего из рёбер u -> v или inf.
+        Строится один раз; занимает 8·V² байт, поэтому подходит только для плотных графов.
+        """
+        if self._matrix is None:
+            matrix = np.full((self.num_vertices, self.num_vertices), np.inf)
+            np.minimum.at(matrix, (self.src, self.dst), self.weight)
+            if not self.directed:
+                np.minimum.at(matrix, (self.dst, self.src), self.weight)
+            self._matrix = matrix
+        return self._matrix
+
+    def reversed(self):
+        """
+        Граф с обращёнными рёбрами (для обратного поиска). Неориентированный граф совпадает с собой.
+        """
+        if not self.directed:
+            return self
+        if self._reversed is None:
+            self._reversed = CSRGraph(self.dst, self.src, self.weight, self.num_vertices, directed=True)
+        return self._reversed
+
+    def fingerprint(self):
+        """
+        Хэш содержимого графа (BLAKE2b по массивам рёбер, числу вершин и направленности).
+        Считается один раз: массивы хэшируются напрямую, без преобразования в объекты Python.
+        """
+        if self._fingerprint is None:
+            digest = hashlib.blake2b(digest_size=16)
+            digest.update(f"{self.num_vertices}:{self.num_edges}:{self.directed}:{self.weight.dtype.str}".encode())
+            for array in (self.src, self.dst, self.weight):
+                digest.update(memoryview(np.ascontiguousarray(array)).cast("B"))
+            self._fingerprint = digest.hexdigest()
+        return self._fingerprint
+
+    def nbytes(self):
+        """
+        Объём памяти, занятый массивами рёбер и построенными списками смежности.
+        """
+        total = self.src.nbytes + self.dst.nbytes + self.weight.nbytes
+        for arrays in self._adjacency.values():
+            total += sum(array.nbytes for array in arrays)
+        if self._matrix is not None:
+            total += self._matrix.nbytes
+        return total
+
+
+def read_csr_graph(filename, directed=False):
+    """
+    Считывает граф из текстового файла "u v w" сразу в массивы NumPy.
+    """
+    data = np.fromfile(filename, dtype=np.int64, sep=" ").reshape(-1, 3)
+    return CSRGraph(data[:, 0], data[:, 1], data[:, 2], directed=directed)
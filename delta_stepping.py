@@ -0,0 +1,261 @@
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from csr_graph import CSRGraph
+from dijkstra import dijkstra_with_min_heap
+from graph_io import load_graph
+from paths import distances_to_list, reset_predecessors
+from shared_graph import SharedGraph, attach_graph
+
+# Состояние рабочего процесса: лёгкие и тяжёлые рёбра из общей памяти и общий массив расстояний
+_worker_adjacency = None
+_worker_shms = None
+_worker_distances = None
+
+
+def default_delta(graph, undirected=True):
+    """
+    Ширина корзины по эвристике Мейера–Сандерса: максимальный вес, делённый на среднюю степень.
+    """
+    if graph.num_edges == 0:
+        return 1.0
+    degree = graph.num_edges * (2 if undirected else 1) / max(graph.num_vertices, 1)
+    return max(float(graph.weight.max()) / max(degree, 1.0), 1.0)
+
+
+def split_edges(graph, delta, undirected=True):
+    """
+    Делит рёбра на лёгкие (w <= delta) и тяжёлые (w > delta); возвращает два ориентированных
+    CSRGraph с уже построенными списками смежности.
+    """
+    offsets, targets, weights = graph.adjacency(undirected)
+    sources = np.repeat(np.arange(graph.num_vertices, dtype=np.int32), np.diff(offsets))
+    light = weights <= delta
+    parts = []
+    for mask in (light, ~light):
+        part = CSRGraph(sources[mask], targets[mask], weights[mask], graph.num_vertices, directed=True)
+        part.adjacency(False)
+        parts.append(part)
+    return parts
+
+
+def _relax(adjacency, distances, frontier):
+    """
+    Кандидаты релаксации всех рёбер вершин frontier одной векторной операцией:
+    возвращает (источники, концы, новые расстояния).
+    """
+    offsets, targets, weights = adjacency
+    starts = offsets[frontier]
+    counts = offsets[frontier + 1] - starts
+    total = int(counts.sum())
+    # Номера рёбер всех вершин фронта подряд: начало диапазона вершины плюс смещение внутри него
+    edge_index = np.repeat(starts - (np.cumsum(counts) - counts), counts) + np.arange(total)
+    sources = np.repeat(frontier, counts)
+    return sources, targets[edge_index], distances[sources] + weights[edge_index]
+
+
+def _best_candidates(sources, targets, candidates):
+    """
+    Оставляет для каждой вершины-конца только лучший кандидат (меньше данных между процессами).
+    """
+    order = np.lexsort((candidates, targets))
+    targets = targets[order]
+    first = np.ones(len(targets), dtype=bool)
+    first[1:] = targets[1:] != targets[:-1]
+    return sources[order][first], targets[first], candidates[order][first]
+
+
+def _init_worker(specs, distances_name, num_vertices):
+    global _worker_adjacency, _worker_shms, _worker_distances
+    graphs = [attach_graph(spec) for spec in specs]
+    _worker_adjacency = [graph.adjacency(False) for graph, _ in graphs]
+    distances_shm = shared_memory.SharedMemory(name=distances_name)
+    _worker_shms = [shm for _, shm in graphs] + [distances_shm]
+    _worker_distances = np.ndarray((num_vertices,), dtype=np.float64, buffer=distances_shm.buf)
+
+
+def _worker_relax(kind, frontier):
+    return _best_candidates(*_relax(_worker_adjacency[kind], _worker_distances, frontier))
+
+
+class DeltaStepping:
+    """
+    Поиск кратчайших расстояний методом delta-stepping (Мейер и Сандерс) на неотрицательных весах.
+
+    Вершины раскладываются по корзинам ширины delta по текущему расстоянию. Корзина
+    обрабатывается фазами: лёгкие рёбра (w <= delta) всех её вершин релаксируются разом,
+    пока корзина не перестанет пополняться, затем один раз — тяжёлые рёбра. Релаксация
+    фазы векторизована в NumPy; при workers > 1 фронт делится между процессами поровну
+    по числу рёбер, а граф и массив расстояний лежат в общей памяти.
+    Смежность и пул процессов создаются один раз, run можно вызывать для разных источников.
+    """
+
+    def __init__(self, graph, delta=None, workers=1, undirected=None):
+        if not isinstance(graph, CSRGraph):
+            graph = CSRGraph.from_edges(graph)
+        if undirected is None:
+            undirected = not graph.directed
+        if graph.num_edges and graph.weight.min() < 0:
+            raise ValueError("Delta-stepping требует неотрицательных весов")
+        self.num_vertices = graph.num_vertices
+        self.delta = float(delta) if delta is not None else default_delta(graph, undirected)
+        self.workers = workers
+        self.graphs = split_edges(graph, self.delta, undirected)
+        self.adjacency = [part.adjacency(False) for part in self.graphs]
+        self.distances = np.full(self.num_vertices, np.inf)
+        self.executor = None
+
+        if workers > 1:
+            self._shared = [SharedGraph(part) for part in self.graphs]
+            self._distances_shm = shared_memory.SharedMemory(create=True, size=max(self.distances.nbytes, 1))
+            self.distances = np.ndarray((self.num_vertices,), dtype=np.float64, buffer=self._distances_shm.buf)
+            self.executor = ProcessPoolExecutor(
+                workers, initializer=_init_worker,
+                initargs=([shared.spec for shared in self._shared], self._distances_shm.name, self.num_vertices))
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+            self.distances = self.distances.copy()
+            for shared in self._shared:
+                shared.close()
+            self._distances_shm.close()
+            self._distances_shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _relax_parallel(self, kind, frontier):
+        offsets = self.adjacency[kind][0]
+        # Границы частей фронта с примерно равным числом рёбер
+        work = np.cumsum(offsets[frontier + 1] - offsets[frontier])
+        bounds = np.searchsorted(work, np.linspace(0, work[-1], self.workers + 1)[1:-1])
+        parts = [part for part in np.split(frontier, bounds) if len(part)]
+        results = list(self.executor.map(_worker_relax, [kind] * len(parts), parts))
+        return tuple(np.concatenate(columns) for columns in zip(*results))
+
+    def _relax_bulk(self, kind, frontier, predecessors):
+        """
+        Релаксирует рёбра вида kind (0 — лёгкие, 1 — тяжёлые) из frontier; возвращает улучшенные вершины.
+        """
+        if self.executor is not None and len(frontier) >= self.workers:
+            sources, targets, candidates = self._relax_parallel(kind, frontier)
+        else:
+            sources, targets, candidates = _relax(self.adjacency[kind], self.distances, frontier)
+        # @probe edges_relaxed len(targets)
+        distances = self.distances
+        better = candidates < distances[targets]
+        sources, targets, candidates = sources[better], targets[better], candidates[better]
+        np.minimum.at(distances, targets, candidates)
+        if predecessors is not None:
+            best = candidates == distances[targets]
+            for target, source in zip(targets[best].tolist(), sources[best].tolist()):
+                predecessors[target] = source
+        improved = np.unique(targets)
+        # @probe relaxations len(improved)
+        return improved
+
+    @staticmethod
+    def _enqueue(queued, vertices):
+        """
+        Отмечает в queued вершины, которых ещё нет в очереди, и возвращает их.
+        """
+        vertices = vertices[~queued[vertices]]
+        queued[vertices] = True
+        return vertices
+
+    def run(self, src, predecessors=None):
+        """
+        Расстояния от src массивом float64 (inf — недостижимые вершины).
+        """
+        distances, delta = self.distances, self.delta
+        distances[:] = np.inf
+        distances[src] = 0
+        if predecessors is not None:
+            reset_predecessors(predecessors, self.num_vertices)
+        # Вершины с конечным расстоянием, ещё не обработанные ни в одной корзине
+        pending = np.zeros(self.num_vertices, dtype=bool)
+        pending[src] = True
+        # Корзины выбираются только среди вершин очереди queue (без повторов, queued — флаги
+        # членства), а не просмотром всех V вершин: очередь содержит все вершины из pending
+        queued = np.zeros(self.num_vertices, dtype=bool)
+        queued[src] = True
+        queue = np.array([src])
+
+        while True:
+            done = queue[~pending[queue]]
+            queued[done] = False
+            queue = queue[pending[queue]]
+            if not len(queue):
+                break
+            # Номер корзины сравнивается через floor, а не с границей (bucket + 1) * delta:
+            # иначе из-за округления вершина может не попасть ни в одну корзину
+            buckets = np.floor(distances[queue] / delta)
+            bucket = buckets.min()
+            frontier = queue[buckets <= bucket]
+            removed, added = [], [queue]
+            while len(frontier):
+                pending[frontier] = False
+                removed.append(frontier)
+                improved = self._relax_bulk(0, frontier, predecessors)
+                pending[improved] = True
+                added.append(self._enqueue(queued, improved))
+                frontier = improved[np.floor(distances[improved] / delta) <= bucket]
+            removed = np.unique(np.concatenate(removed))
+            improved = self._relax_bulk(1, removed, predecessors)
+            pending[improved] = True
+            added.append(self._enqueue(queued, improved))
+            queue = np.concatenate(added)
+        return distances.copy()
+
+
+def delta_stepping(graph, V, src, predecessors=None, delta=None, workers=1):
+    """
+    Delta-stepping с той же сигнатурой и результатом, что и реализации Дейкстры:
+    граф неориентирован, если CSRGraph не помечен как directed.
+    """
+    if not isinstance(graph, CSRGraph):
+        graph = CSRGraph.from_edges(graph, V)
+    with DeltaStepping(graph, delta, workers) as engine:
+        distances = engine.run(src, predecessors)
+    return distances_to_list(distances, graph.weight.dtype)
+
+
+def scaling_benchmark(filename, max_workers=None, delta=None, repeats=3, source_vertex=0):
+    """
+    Время одного запроса delta-stepping для 1..max_workers процессов в сравнении
+    с dijkstra_with_min_heap; пул и общая память создаются вне замера.
+    """
+    graph = load_graph(filename)
+    max_workers = max_workers or os.cpu_count()
+    expected = dijkstra_with_min_heap(graph, graph.num_vertices, source_vertex)
+
+    start_time = time.perf_counter()
+    for _ in range(repeats):
+        dijkstra_with_min_heap(graph, graph.num_vertices, source_vertex)
+    baseline = (time.perf_counter() - start_time) / repeats
+    print(f"{filename}: dijkstra_with_min_heap {baseline:.6f} с")
+
+    for workers in sorted({1, max_workers} | {2 ** power for power in range(max_workers.bit_length())}):
+        with DeltaStepping(graph, delta, workers) as engine:
+            assert distances_to_list(engine.run(source_vertex), graph.weight.dtype) == expected
+            start_time = time.perf_counter()
+            for _ in range(repeats):
+                engine.run(source_vertex)
+            elapsed = (time.perf_counter() - start_time) / repeats
+        print(f"  delta = {engine.delta:g}, процессов {workers}: {elapsed:.6f} с (x{baseline / elapsed:.2f})")
+
+
+if __name__ == "__main__":
+    # Пример: python delta_stepping.py граф.txt [макс. число процессов] [delta]
+    scaling_benchmark(sys.argv[1], int(sys.argv[2]) if len(sys.argv) > 2 else None,
+                      float(sys.argv[3]) if len(sys.argv) > 3 else None)
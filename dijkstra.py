@@ -1,171 +1,389 @@
 import heapq
-import time
+import sys
 
+import numpy as np
 
-def dijkstra_with_min_heap(graph, V, src):
+from csr_graph import CSRGraph
+from indexed_heap import DaryHeap, PairingHeap
+from paths import distances_to_list, reset_predecessors
+
+
+def _csr_graph(graph, V):
+    """
+    Приводит список рёбер к CSRGraph; CSRGraph возвращается как есть.
+    """
+    if not isinstance(graph, CSRGraph):
+        graph = CSRGraph.from_edges(graph, V)
+    return graph
+
+
+def _adjacency(graph, V):
+    """
+    Возвращает списки смежности в формате CSR. Для CSRGraph они строятся один раз
+    и переиспользуются между запусками, список рёбер преобразуется на лету.
+    """
+    return _csr_graph(graph, V).adjacency_views()
+
+
+def _reconstruct_path(predecessors, src, target):
+    """
+    Восстанавливает путь src -> target по массиву предшественников.
+    """
+    path = [target]
+    while path[-1] != src:
+        path.append(predecessors[path[-1]])
+    path.reverse()
+    return path
+
+
+def dijkstra_with_min_heap(graph, V, src, predecessors=None):
     """
     Алгоритм Дейкстры для лучшего случая с использованием минимальной кучи (min-heap).
     """
-    adj = {i: [] for i in range(V)}
-    for u, v, w in graph:
-        adj[u].append((v, w))
-        adj[v].append((u, w))
+    offsets, targets, weights = _adjacency(graph, V)
 
     distances = [float('inf')] * V
     distances[src] = 0
+    if predecessors is not None:
+        reset_predecessors(predecessors, V)
     min_heap = [(0, src)]  # (расстояние, вершина)
 
     while min_heap:
         current_distance, current_vertex = heapq.heappop(min_heap)
+        # @probe heap_pops
 
         if current_distance > distances[current_vertex]:
+            # @probe stale_pops
             continue
 
-        for neighbor, weight in adj[current_vertex]:
+        start, end = offsets[current_vertex], offsets[current_vertex + 1]
+        # @probe edges_relaxed end - start
+        for neighbor, weight in zip(targets[start:end], weights[start:end]):
             distance = current_distance + weight
             if distance < distances[neighbor]:
+                # @probe relaxations
                 distances[neighbor] = distance
+                if predecessors is not None:
+                    predecessors[neighbor] = current_vertex
                 heapq.heappush(min_heap, (distance, neighbor))
+                # @probe heap_pushes
 
     return distances
 
 
-def dijkstra_with_binary_heap(graph, V, src):
+def _dijkstra_with_indexed_heap(graph, V, src, predecessors, make_heap):
     """
-    Алгоритм Дейкстры для среднего случая с использованием бинарной кучи.
+    Алгоритм Дейкстры на индексированной куче с уменьшением ключа: каждая вершина лежит
+    в куче не более одного раза, устаревших записей и кортежей (расстояние, вершина) нет.
     """
-    adj = {i: [] for i in range(V)}
-    for u, v, w in graph:
-        adj[u].append((v, w))
-        adj[v].append((u, w))
+    offsets, targets, weights = _adjacency(graph, V)
 
     distances = [float('inf')] * V
     distances[src] = 0
-    binary_heap = [(0, src)]  # (расстояние, вершина)
-
-    while binary_heap:
-        current_distance, current_vertex = heapq.heappop(binary_heap)
-
-        if current_distance > distances[current_vertex]:
-            continue
-
-        for neighbor, weight in adj[current_vertex]:
+    if predecessors is not None:
+        reset_predecessors(predecessors, V)
+    heap = make_heap(distances)
+    heap.push_or_decrease(src)
+    # @probe heap_pushes
+
+    while heap:
+        current_vertex = heap.pop()
+        # @probe heap_pops
+        current_distance = distances[current_vertex]
+
+        start, end = offsets[current_vertex], offsets[current_vertex + 1]
+        # @probe edges_relaxed end - start
+        for neighbor, weight in zip(targets[start:end], weights[start:end]):
             distance = current_distance + weight
             if distance < distances[neighbor]:
+                # @probe relaxations
                 distances[neighbor] = distance
-                heapq.heappush(binary_heap, (distance, neighbor))
+                if predecessors is not None:
+                    predecessors[neighbor] = current_vertex
+                heap.push_or_decrease(neighbor)
+                # @probe heap_pushes
 
     return distances
 
 
-def dijkstra_with_array(graph, V, src):
+def dijkstra_with_binary_heap(graph, V, src, predecessors=None):
     """
-    Алгоритм Дейкстры для худшего случая с использованием обычного массива.
+    Алгоритм Дейкстры для среднего случая с использованием бинарной кучи.
+    """
+    return _dijkstra_with_indexed_heap(graph, V, src, predecessors, lambda keys: DaryHeap(keys, arity=2))
+
+
+def dijkstra_with_dary_heap(graph, V, src, predecessors=None, arity=4):
+    """
+    Алгоритм Дейкстры с d-арной кучей: более мелкое дерево, меньше перестановок при подъёме.
+    """
+    return _dijkstra_with_indexed_heap(graph, V, src, predecessors, lambda keys: DaryHeap(keys, arity))
+
+
+def dijkstra_with_pairing_heap(graph, V, src, predecessors=None):
+    """
+    Алгоритм Дейкстры с парной кучей (уменьшение ключа за O(1)).
     """
-    adj = {i: [] for i in range(V)}
-    for u, v, w in graph:
-        adj[u].append((v, w))
-        adj[v].append((u, w))
+    return _dijkstra_with_indexed_heap(graph, V, src, predecessors, PairingHeap)
+
+
+def dijkstra_with_buckets(graph, V, src, predecessors=None, max_weight_limit=1 << 16):
+    """
+    Алгоритм Дейкстры с очередью из корзин (алгоритм Дайала) для целых весов из [0, C]:
+    вершина с расстоянием d лежит в корзине d mod (C + 1), корзины просматриваются по порядку.
+    Время O(E + V·C) без сравнений ключей и без кортежей. Если веса не целые, отрицательные
+    или C больше max_weight_limit, выполняется обычный dijkstra_with_min_heap.
+    """
+    graph = _csr_graph(graph, V)
+    edge_weights = graph.weight
+    if (edge_weights.dtype.kind != "i" or len(edge_weights) == 0
+            or edge_weights.min() < 0 or edge_weights.max() > max_weight_limit):
+        return dijkstra_with_min_heap(graph, V, src, predecessors)
+    offsets, targets, weights = graph.adjacency_views()
 
     distances = [float('inf')] * V
     distances[src] = 0
-    visited = [False] * V
+    if predecessors is not None:
+        reset_predecessors(predecessors, V)
+    num_buckets = int(edge_weights.max()) + 1
+    buckets = [[] for _ in range(num_buckets)]
+    buckets[0].append(src)
+    pending = 1  # Число записей во всех корзинах (включая устаревшие)
+    current_distance = 0
+
+    while pending:
+        bucket = buckets[current_distance % num_buckets]
+        while bucket:
+            current_vertex = bucket.pop()
+            pending -= 1
+            # @probe heap_pops
+
+            if distances[current_vertex] != current_distance:
+                # @probe stale_pops
+                continue
+
+            start, end = offsets[current_vertex], offsets[current_vertex + 1]
+            # @probe edges_relaxed end - start
+            for neighbor, weight in zip(targets[start:end], weights[start:end]):
+                distance = current_distance + weight
+                if distance < distances[neighbor]:
+                    # @probe relaxations
+                    distances[neighbor] = distance
+                    if predecessors is not None:
+                        predecessors[neighbor] = current_vertex
+                    buckets[distance % num_buckets].append(neighbor)
+                    pending += 1
+                    # @probe heap_pushes
+        current_distance += 1
+
+    return distances
+
+
+def dijkstra_with_array(graph, V, src, predecessors=None):
+    """
+    Алгоритм Дейкстры для худшего случая с использованием обычного массива.
+    Массивы расстояний и посещённых вершин хранятся в NumPy: следующая вершина выбирается
+    маскированным argmin, а её рёбра релаксируются одной векторной операцией.
+    """
+    graph = _csr_graph(graph, V)
+    offsets, targets, weights = graph.adjacency()
+
+    distances = np.full(V, np.inf)
+    distances[src] = 0
+    if predecessors is not None:
+        reset_predecessors(predecessors, V)
+    visited = np.zeros(V, dtype=bool)
+    # Расстояния непосещённых вершин; посещённые помечаются inf, чтобы argmin их пропускал
+    frontier = distances.copy()
 
     for _ in range(V):
-        min_distance = float('inf')
-        min_vertex = -1
+        min_vertex = int(np.argmin(frontier))
+        if frontier[min_vertex] == np.inf:
+            break
 
-        for v in range(V):
-            if not visited[v] and distances[v] < min_distance:
-                min_distance = distances[v]
-                min_vertex = v
+        visited[min_vertex] = True
+        # @probe heap_pops
+        frontier[min_vertex] = np.inf
+
+        start, end = offsets[min_vertex], offsets[min_vertex + 1]
+        neighbors = targets[start:end]
+        # @probe edges_relaxed end - start
+        candidates = distances[min_vertex] + weights[start:end]
+        improved = ~visited[neighbors] & (candidates < distances[neighbors])
+        neighbors, candidates = neighbors[improved], candidates[improved]
+        # @probe relaxations len(neighbors)
+        np.minimum.at(distances, neighbors, candidates)
+        frontier[neighbors] = distances[neighbors]
+        if predecessors is not None:
+            for neighbor in neighbors[candidates == distances[neighbors]].tolist():
+                predecessors[neighbor] = min_vertex
+
+    return distances_to_list(distances, graph.weight.dtype)
+
+
+def dijkstra_with_matrix(graph, V, src, predecessors=None):
+    """
+    Алгоритм Дейкстры для плотных графов на матрице смежности V×V: на каждом шаге
+    маскированный argmin выбирает вершину, и вся её строка матрицы релаксируется разом.
+    Матрица строится один раз и хранится в CSRGraph (V² чисел float64).
+    """
+    graph = _csr_graph(graph, V)
+    matrix = graph.adjacency_matrix()
 
-        if min_vertex == -1:
+    distances = np.full(V, np.inf)
+    distances[src] = 0
+    if predecessors is not None:
+        reset_predecessors(predecessors, V)
+    visited = np.zeros(V, dtype=bool)
+    frontier = distances.copy()
+
+    for _ in range(V):
+        min_vertex = int(np.argmin(frontier))
+        if frontier[min_vertex] == np.inf:
             break
 
         visited[min_vertex] = True
+        # @probe heap_pops
+        frontier[min_vertex] = np.inf
 
-        for neighbor, weight in adj[min_vertex]:
-            if not visited[neighbor]:
-                distance = distances[min_vertex] + weight
-                if distance < distances[neighbor]:
-                    distances[neighbor] = distance
+        candidates = distances[min_vertex] + matrix[min_vertex]
+        improved = candidates < distances
+        improved &= ~visited
+        # @probe edges_relaxed V
+        # @probe relaxations int(np.count_nonzero(improved))
+        distances[improved] = candidates[improved]
+        frontier[improved] = candidates[improved]
+        if predecessors is not None:
+            for neighbor in np.flatnonzero(improved).tolist():
+                predecessors[neighbor] = min_vertex
 
-    return distances
+    return distances_to_list(distances, graph.weight.dtype)
 
 
-def read_graph_from_file(filename):
+def dijkstra_point_to_point(graph, V, src, target):
     """
-    Считывает граф из файла.
+    Алгоритм Дейкстры для одной пары вершин: поиск останавливается, как только target
+    извлечена из кучи. Возвращает (расстояние, путь); для недостижимой вершины — (inf, []).
     """
-    edges = []
-    max_vertex = -1
+    offsets, targets, weights = _adjacency(graph, V)
 
-    with open(filename, "r") as file:
-        for line in file:
-            u, v, w = map(int, line.split())
-            edges.append([u, v, w])
-            max_vertex = max(max_vertex, u, v)
+    distances = [float('inf')] * V
+    distances[src] = 0
+    predecessors = [-1] * V
+    min_heap = [(0, src)]  # (расстояние, вершина)
+
+    while min_heap:
+        current_distance, current_vertex = heapq.heappop(min_heap)
+        # @probe heap_pops
+
+        if current_vertex == target:
+            return current_distance, _reconstruct_path(predecessors, src, target)
+
+        if current_distance > distances[current_vertex]:
+            # @probe stale_pops
+            continue
 
-    return edges, max_vertex + 1
+        start, end = offsets[current_vertex], offsets[current_vertex + 1]
+        # @probe edges_relaxed end - start
+        for neighbor, weight in zip(targets[start:end], weights[start:end]):
+            distance = current_distance + weight
+            if distance < distances[neighbor]:
+                # @probe relaxations
+                distances[neighbor] = distance
+                predecessors[neighbor] = current_vertex
+                heapq.heappush(min_heap, (distance, neighbor))
+                # @probe heap_pushes
+
+    return float('inf'), []
 
 
-def write_times_to_file(times, filename):
+def bidirectional_dijkstra(graph, V, src, target):
     """
-    Записывает массив времени обработки графов в файл.
+    Двунаправленный алгоритм Дейкстры: прямой поиск из src и обратный из target ведутся
+    поочерёдно и останавливаются, когда сумма минимумов двух куч не меньше лучшего найденного
+    пути через встретившиеся фронты. Возвращает (расстояние, путь); для недостижимой вершины — (inf, []).
     """
-    with open(filename, "w", encoding="UTF-8") as file:
-        for vertices, time_taken in times:
-            file.write(f"{vertices} : {time_taken:.6f} секунд\n")
+    graph = _csr_graph(graph, V)
+    if src == target:
+        return 0, [src]
+
+    # Для каждого направления: смежность, расстояния, предшественники, куча, обработанные вершины
+    searches = []
+    for csr, start_vertex in ((graph, src), (graph.reversed(), target)):
+        distances = [float('inf')] * V
+        distances[start_vertex] = 0
+        searches.append((csr.adjacency_views(), distances, [-1] * V, [(0, start_vertex)], [False] * V))
+
+    best_distance = float('inf')
+    meeting_edge = None  # Ребро (x, y), через которое прямой путь до x переходит в обратный от y
+    side = 0
+
+    while searches[0][3] and searches[1][3]:
+        if searches[0][3][0][0] + searches[1][3][0][0] >= best_distance:
+            break
+
+        (offsets, targets, weights), distances, predecessors, heap, settled = searches[side]
+        other_distances = searches[1 - side][1]
+        current_distance, current_vertex = heapq.heappop(heap)
+        # @probe heap_pops
+
+        if current_distance <= distances[current_vertex] and not settled[current_vertex]:
+            settled[current_vertex] = True
+            start, end = offsets[current_vertex], offsets[current_vertex + 1]
+            # @probe edges_relaxed end - start
+            for neighbor, weight in zip(targets[start:end], weights[start:end]):
+                distance = current_distance + weight
+                if distance < distances[neighbor]:
+                    # @probe relaxations
+                    distances[neighbor] = distance
+                    predecessors[neighbor] = current_vertex
+                    heapq.heappush(heap, (distance, neighbor))
+                    # @probe heap_pushes
+                if distance + other_distances[neighbor] < best_distance:
+                    best_distance = distance + other_distances[neighbor]
+                    meeting_edge = (current_vertex, neighbor) if side == 0 else (neighbor, current_vertex)
+
+        # Расширяется фронт с меньшей кучей
+        side = 0 if len(searches[0][3]) <= len(searches[1][3]) else 1
+
+    if meeting_edge is None:
+        return float('inf'), []
+
+    path = _reconstruct_path(searches[0][2], src, meeting_edge[0])
+    path.append(meeting_edge[1])
+    while path[-1] != target:
+        path.append(searches[1][2][path[-1]])
+    return best_distance, path
+
+
+# Реализации алгоритма по именам: все принимают (graph, V, src, predecessors=None) и возвращают
+# список расстояний; переданный array('i') predecessors заполняется предшественниками вершин
+DIJKSTRA_VARIANTS = {
+    "min_heap": dijkstra_with_min_heap,
+    "binary_heap": dijkstra_with_binary_heap,
+    "dary_heap": dijkstra_with_dary_heap,
+    "pairing_heap": dijkstra_with_pairing_heap,
+    "buckets": dijkstra_with_buckets,
+    "matrix": dijkstra_with_matrix,
+    "array": dijkstra_with_array,
+}
 
 
 if __name__ == "__main__":
-    # Файлы графов
-    graph_files_best = [f"best_case_graph_{i * 1000}_vertices.txt" for i in range(1, 11)]
-    graph_files_avg = [f"average_case_graph_{i * 1000}_vertices.txt" for i in range(1, 11)]
-    graph_files_worst = [f"worst_case_graph_{i * 1000}_vertices.txt" for i in range(1, 11)]
-
-    source_vertex = 0
-    best_case_times = []
-    avg_case_times = []
-    worst_case_times = []
-
-    # Лучший случай
-    print("Обработка графов для лучшего случая...")
-    for filename in graph_files_best:
-        graph, num_vertices = read_graph_from_file(filename)
-        print(f"Обработка графа {filename} с {num_vertices} вершинами...")
-        start_time = time.time()
-        dijkstra_with_min_heap(graph, num_vertices, source_vertex)
-        elapsed_time = time.time() - start_time
-        best_case_times.append((num_vertices, elapsed_time))
-        print(f"Граф {filename} обработан за {elapsed_time:.6f} секунд.")
-
-    # Средний случай
-    print("Обработка графов для среднего случая...")
-    for filename in graph_files_avg:
-        graph, num_vertices = read_graph_from_file(filename)
-        print(f"Обработка графа {filename} с {num_vertices} вершинами...")
-        start_time = time.time()
-        dijkstra_with_binary_heap(graph, num_vertices, source_vertex)
-        elapsed_time = time.time() - start_time
-        avg_case_times.append((num_vertices, elapsed_time))
-        print(f"Граф {filename} обработан за {elapsed_time:.6f} секунд.")
-
-    # Худший случай
-    print("Обработка графов для худшего случая...")
-    for filename in graph_files_worst:
-        graph, num_vertices = read_graph_from_file(filename)
-        print(f"Обработка графа {filename} с {num_vertices} вершинами...")
-        start_time = time.time()
-        dijkstra_with_array(graph, num_vertices, source_vertex)
-        elapsed_time = time.time() - start_time
-        worst_case_times.append((num_vertices, elapsed_time))
-        print(f"Граф {filename} обработан за {elapsed_time:.6f} секунд.")
-
-    # Сохранение времени обработки
-    write_times_to_file(best_case_times, "best_case_times.txt")
-    write_times_to_file(avg_case_times, "average_case_times.txt")
-    write_times_to_file(worst_case_times, "worst_case_times.txt")
-
-    print("Обработка завершена. Результаты записаны в файлы.")
+    # Лучший, средний и худший случаи замеряются общим стендом benchmark_runner;
+    # медианы дополнительно пишутся в текстовые файлы "N : t секунд" для drawGraphic.py
+    import benchmark_runner
+
+    sys.exit(benchmark_runner.main(
+        default_cases=[
+            ("dijkstra_with_min_heap", "best"),  # Лучший случай
+            ("dijkstra_with_binary_heap", "average"),  # Средний случай
+            ("dijkstra_with_array", "worst"),  # Худший случай
+        ],
+        legacy_times={
+            ("dijkstra_with_min_heap", "best"): "best_case_times.txt",
+            ("dijkstra_with_binary_heap", "average"): "average_case_times.txt",
+            ("dijkstra_with_array", "worst"): "worst_case_times.txt",
+        },
+        default_output="dijkstra_results.json",
+    ))
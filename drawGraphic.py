@@ -1,148 +1,255 @@
-import numpy as np
-from matplotlib import pyplot as plt
-from scipy import stats
+import hashlib
+import json
+import os
+import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 
-def multiPlotCreate(allData, regression, labels, title, printPolynoms, filenameAdd=""):
+import matplotlib
 
-    if not isinstance(allData, list):
-        allData = [allData]
+matplotlib.use("Agg")  # Графики только сохраняются в файлы, окно не нужно
 
-    if not isinstance(labels, list):
-        labels = [labels]
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
 
-    colors = ['blue', 'green', 'red', 'gray', 'olive', 'cyan']
-    i = 0
+COLORS = ['blue', 'green', 'red', 'gray', 'olive', 'cyan']
+OUTPUT_DIR = "Графики"
+HASHES_FILE = ".plot_hashes.json"
+RENDER_VERSION = 2  # Увеличивается при изменении оформления, чтобы перерисовать все графики
 
-    if regression:
-        for data in allData:
-            points = np.array(data)
-            x = points[:, 0]
-            y = points[:, 1]
-
-            # Линейная регрессия
-            slope_linear, intercept_linear, r_value_linear, _, _ = stats.linregress(x, y)
-            y_pred_linear = intercept_linear + slope_linear * x
-            r_squared_linear = r_value_linear ** 2
-
-            # Логарифмическая регрессия
-            x_log2 = np.log2(x)
-            slope_log, intercept_log, r_value_log, _, _ = stats.linregress(x_log2, y)
-            y_pred_log = intercept_log + slope_log * np.log2(x)
-            r_squared_log = r_value_log ** 2
-
-            # Квадратичная регрессия
-            coeffs_quad = np.polyfit(x, y, 2)
-            y_pred_quad = coeffs_quad[0] * x**2 + coeffs_quad[1] * x + coeffs_quad[2]
-            ss_total = np.sum((y - np.mean(y))**2)
-            ss_residual_quad = np.sum((y - y_pred_quad)**2)
-            r_squared_quad = 1 - (ss_residual_quad / ss_total)
-
-            # Линейно-логарифмическая регрессия
-            log_y = np.log(y)
-            slope_loglin, intercept_loglin, r_value_loglin, _, _ = stats.linregress(x, log_y)
-            y_pred_loglin = np.exp(intercept_loglin + slope_loglin * x)
-            ss_residual_loglin = np.sum((y - y_pred_loglin) ** 2)
-            r_squared_loglin = 1 - (ss_residual_loglin / ss_total)
-
-            # Выбор лучшей модели
-            models = [
-                ("Линейная регрессия", r_squared_linear, y_pred_linear, f"y = {intercept_linear:.3f} + {slope_linear:.3f}x"),
-                ("Логарифмическая регрессия", r_squared_log, y_pred_log, f"y = {intercept_log:.3f} + {slope_log:.3f}*log2(x)"),
-                ("Квадратичная регрессия", r_squared_quad, y_pred_quad,
-                 f"y = {coeffs_quad[0]:.3f}x^2 + {coeffs_quad[1]:.3f}x + {coeffs_quad[2]:.3f}"),
-                ("Линейно-логарифмическая регрессия", r_squared_loglin, y_pred_loglin,
-                 f"y = exp({intercept_loglin:.3f} + {slope_loglin:.3f}x)")
-            ]
-            best_model, best_r_squared, best_y_pred, best_model_eq = max(models, key=lambda x: x[1])
-
-            # Построение графика лучшей регрессии
-            if best_model == "Линейная регрессия" or best_model == "Логарифмическая регрессия":
-                plt.plot(x, best_y_pred, color=colors[i], label=f"{labels[i]} ", zorder=10)
-            elif best_model == "Квадратичная регрессия":
-                x_dense = np.linspace(min(x), max(x), 1000)
-                y_dense = coeffs_quad[0] * x_dense**2 + coeffs_quad[1] * x_dense + coeffs_quad[2]
-                plt.plot(x_dense, y_dense, color=colors[i], label=f"{labels[i]} ", zorder=10)
-            elif best_model == "Линейно-логарифмическая регрессия":
-                x_dense = np.linspace(min(x), max(x), 1000)
-                y_dense = np.exp(intercept_loglin + slope_loglin * x_dense)
-                plt.plot(x_dense, y_dense, color=colors[i], label=f"{labels[i]} ", zorder=10)
-
-            # Печать уравнения регрессии
-            if printPolynoms:
-                print(f"{title} {labels[i]}: {best_model_eq}")
+CASE_LABELS = {"best": "Лучший случай", "average": "Средний случай", "worst": "Худший случай"}
+CASE_FILENAMES = {"best": "best_case", "average": "average_case", "worst": "wosrt_case"}
 
-            i += 1
+# Результаты замеров: структурированный JSON benchmark_runner и старые текстовые файлы на случай его отсутствия
+REPORTS = {
+    "Алгоритм Дейкстры": ("dijkstra_results.json", {
+        "best": "best_case_times.txt", "average": "average_case_times.txt", "worst": "worst_case_times.txt"}),
+    "Алгоритм Форда-Беллмана": ("bellman_ford_results.json", {
+        "best": "best_case_times_bellman_ford.txt", "average": "average_case_times_bellman_ford.txt",
+        "worst": "worst_case_times_bellman_ford.txt"}),
+}
 
-    else:
-        for data in allData:
-            points = np.array(data)
-            x = points[:, 0]
-            y = points[:, 1]
-            plt.scatter(x, y, color=colors[i], label=labels[i], zorder=5)
-            i += 1
-
-    plt.xlabel('Количество вершин, E')
-    plt.ylabel('Время нахождения кратчайшего пути, n')
-    plt.title(title)
-    plt.legend()
-    plt.grid(True)
-    plt.savefig("Графики/" + filenameAdd + " " + title.replace(".", "_") + ("Регрессия" if regression else "") + ".png")
-    plt.close()
+_fits = {}
 
 
 def readDatas(files):
-    # Преобразуем в список, если передан одиночный файл
+    """
+    Чтение старых текстовых файлов "N : t секунд"; возвращает список массивов (N, t).
+    """
     if not isinstance(files, list):
         files = [files]
     data_prac = []
-
     for file in files:
         with open(file, encoding="UTF-8") as f:
-            lines = f.read().strip().split("\n")
-            array_2d = []
-            for line in lines:
-                parts = line.replace("", "").replace("секунд", "").split(":")
-                graph_number = int(parts[0].strip())
-                time_in_seconds = float(parts[1].strip())
-                array_2d.append([graph_number, time_in_seconds])
-            data_prac.append(array_2d)
+            text = f.read().replace("секунд", "").replace(":", " ")
+        data_prac.append(np.fromstring(text, sep=" ").reshape(-1, 2))
     return data_prac
 
-#
-dots = readDatas(["best_case_times.txt", "average_case_times.txt", "worst_case_times.txt"])
-multiPlotCreate(dots, False, ["Лучший случай", "Средний случай", "Худший случай"], "Алгоритм Дейкстры", True,  "combined_practic")
-dots = readDatas(["best_case_times_bellman_ford.txt", "average_case_times_bellman_ford.txt", "worst_case_times_bellman_ford.txt"])
-multiPlotCreate(dots, False, ["Лучший случай", "Средний случай", "Худший случай"], "Алгоритм Форда-Беллмана", True,  "combined_practic")
-dots = readDatas(["best_case_times.txt", "average_case_times.txt", "worst_case_times.txt"])
-multiPlotCreate(dots, True, ["Лучший случай", "Средний случай", "Худший случай"], "Алгоритм Дейкстры. Регрессия", True,  "combined_practic_regression")
-dots = readDatas(["best_case_times_bellman_ford.txt", "average_case_times_bellman_ford.txt", "worst_case_times_bellman_ford.txt"])
-multiPlotCreate(dots, True, ["Лучший случай", "Средний случай", "Худший случай"], "Алгоритм Форда-Беллмана. Регрессия", True,  "combined_practic_regression")
-dots = readDatas(["best_case_times.txt", "average_case_times.txt", "worst_case_times.txt", "best_case_times_bellman_ford.txt", "average_case_times_bellman_ford.txt", "worst_case_times_bellman_ford.txt"])
-multiPlotCreate(dots, True, ["Лучший случай Алгоритм Дейкстры", "Средний случай Алгоритм Дейкстры", "Худший случай Алгоритм Дейкстры","Лучший случай Алгоритм Форда-Беллмана", "Средний случай Алгоритм Форда-Беллмана", "Худший случай Алгоритм Форда-Беллмана" ], "Сводный график", True,  "combined")
-#
-
-
-dots = readDatas("best_case_times.txt")
-multiPlotCreate(dots, False, ["Лучший случай"], "Алгоритм Дейкстры", True,  "best_case")
-dots = readDatas("average_case_times.txt")
-multiPlotCreate(dots, False, ["Средний случай"], "Алгоритм Дейкстры", True,  "average_case")
-dots = readDatas("worst_case_times.txt")
-multiPlotCreate(dots, False, ["Худший случай"], "Алгоритм Дейкстры", True,  "wosrt_case")
-dots = readDatas("best_case_times.txt")
-multiPlotCreate(dots, True, ["Лучший случай"], "Алгоритм Дейкстры", True,  "best_case")
-dots = readDatas("average_case_times.txt")
-multiPlotCreate(dots, True, ["Средний случай"], "Алгоритм Дейкстры", True,  "average_case")
-dots = readDatas("worst_case_times.txt")
-multiPlotCreate(dots, True, ["Худший случай"], "Алгоритм Дейкстры", True,  "wosrt_case")
-dots = readDatas("best_case_times_bellman_ford.txt")
-multiPlotCreate(dots, False, ["Лучший случай"], "Алгоритм Форда-Беллмана", True,  "best_case")
-dots = readDatas("average_case_times_bellman_ford.txt")
-multiPlotCreate(dots, False, ["Средний случай"], "Алгоритм Форда-Беллмана", True,  "average_case")
-dots = readDatas("worst_case_times_bellman_ford.txt")
-multiPlotCreate(dots, False, ["Худший случай"], "Алгоритм Форда-Беллмана", True,  "wosrt_case")
-dots = readDatas("best_case_times_bellman_ford.txt")
-multiPlotCreate(dots, True, ["Лучший случай"], "Алгоритм Форда-Беллмана", True,  "best_case")
-dots = readDatas("average_case_times_bellman_ford.txt")
-multiPlotCreate(dots, True, ["Средний случай"], "Алгоритм Форда-Беллмана", True,  "average_case")
-dots = readDatas("worst_case_times_bellman_ford.txt")
-multiPlotCreate(dots, True, ["Худший случай"], "Алгоритм Форда-Беллмана", True,  "wosrt_case")
+
+def read_report_series(filename):
+    """
+    Серии из JSON benchmark_runner: {(семейство графов, реализация): массив (V, медиана в секундах)},
+    отсортированные по числу вершин. Файл читается один раз.
+    """
+    with open(filename, encoding="UTF-8") as file:
+        report = json.load(file)
+    series = {}
+    for record in report["results"]:
+        series.setdefault((record["family"], record["algorithm"]), []).append(
+            (record["vertices"], record["median_ns"] / 1e9))
+    return {key: np.array(sorted(points)) for key, points in series.items()}
+
+
+def load_algorithm_series(report_file, legacy_files):
+    """
+    Серии одного алгоритма по (случай, реализация): из JSON, если он есть, иначе из текстовых
+    файлов (реализация в них не записана — None).
+    """
+    if os.path.exists(report_file):
+        return read_report_series(report_file)
+    return {(case, None): readDatas(filename)[0] for case, filename in legacy_files.items() if os.path.exists(filename)}
+
+
+def _series_key(points):
+    return hashlib.blake2b(np.ascontiguousarray(points, dtype=np.float64).tobytes(), digest_size=16).hexdigest()
+
+
+def best_fit(points):
+    """
+    Подбирает линейную, логарифмическую, квадратичную, экспоненциальную (линейно-логарифмическую),
+    n log n и степенную регрессии и возвращает лучшую по R²: (название, кривая x, кривая y, уравнение).
+    Результат запоминается по содержимому серии, так что каждая серия подбирается один раз.
+    """
+    key = _series_key(points)
+    if key in _fits:
+        return _fits[key]
+    x, y = points[:, 0], points[:, 1]
+    ss_total = np.sum((y - np.mean(y)) ** 2)
+    x_dense = np.linspace(min(x), max(x), 1000)
+
+    def r_squared(y_pred):
+        return 1 - np.sum((y - y_pred) ** 2) / ss_total
+
+    slope_linear, intercept_linear = np.polyfit(x, y, 1)
+    slope_log, intercept_log = np.polyfit(np.log2(x), y, 1)
+    coeffs_quad = np.polyfit(x, y, 2)
+    slope_loglin, intercept_loglin = np.polyfit(x, np.log(y), 1)
+    slope_nlogn, intercept_nlogn = np.polyfit(x * np.log2(x), y, 1)
+    power, log_scale = np.polyfit(np.log(x), np.log(y), 1)
+
+    models = [
+        ("Линейная регрессия", r_squared(intercept_linear + slope_linear * x),
+         x, intercept_linear + slope_linear * x, f"y = {intercept_linear:.3f} + {slope_linear:.3f}x"),
+        ("Логарифмическая регрессия", r_squared(intercept_log + slope_log * np.log2(x)),
+         x, intercept_log + slope_log * np.log2(x), f"y = {intercept_log:.3f} + {slope_log:.3f}*log2(x)"),
+        ("Квадратичная регрессия", r_squared(np.polyval(coeffs_quad, x)),
+         x_dense, np.polyval(coeffs_quad, x_dense),
+         f"y = {coeffs_quad[0]:.3f}x^2 + {coeffs_quad[1]:.3f}x + {coeffs_quad[2]:.3f}"),
+        ("Линейно-логарифмическая регрессия", r_squared(np.exp(intercept_loglin + slope_loglin * x)),
+         x_dense, np.exp(intercept_loglin + slope_loglin * x_dense),
+         f"y = exp({intercept_loglin:.3f} + {slope_loglin:.3f}x)"),
+        ("Регрессия n log n", r_squared(intercept_nlogn + slope_nlogn * x * np.log2(x)),
+         x_dense, intercept_nlogn + slope_nlogn * x_dense * np.log2(x_dense),
+         f"y = {intercept_nlogn:.3f} + {slope_nlogn:.3e}*x*log2(x)"),
+        ("Степенная регрессия", r_squared(np.exp(log_scale) * x ** power),
+         x_dense, np.exp(log_scale) * x_dense ** power, f"y = {np.exp(log_scale):.3e}*x^{power:.3f}"),
+    ]
+    name, _, curve_x, curve_y, equation = max(models, key=lambda model: model[1])
+    _fits[key] = (name, curve_x, curve_y, equation)
+    return _fits[key]
+
+
+def plot_spec(series, labels, title, regression, filenameAdd):
+    """
+    Описание одного графика: всё, что нужно рабочему процессу для отрисовки, включая
+    уже подобранные регрессии.
+    """
+    spec = {
+        "title": title,
+        "regression": regression,
+        "labels": labels,
+        "filename": os.path.join(OUTPUT_DIR, filenameAdd + " " + title.replace(".", "_")
+                                 + ("Регрессия" if regression else "") + ".png"),
+    }
+    if regression:
+        spec["curves"] = [best_fit(points)[1:3] for points in series]
+    else:
+        spec["curves"] = [(points[:, 0], points[:, 1]) for points in series]
+    return spec
+
+
+def spec_hash(spec):
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(json.dumps([spec["title"], spec["regression"], spec["labels"], RENDER_VERSION]).encode())
+    for x, y in spec["curves"]:
+        digest.update(np.ascontiguousarray(x, dtype=np.float64).tobytes())
+        digest.update(np.ascontiguousarray(y, dtype=np.float64).tobytes())
+    return digest.hexdigest()
+
+
+def render_plot(spec):
+    """
+    Рисует график на собственной Figure (без глобального состояния pyplot) и сохраняет PNG.
+    """
+    figure = Figure()
+    FigureCanvasAgg(figure)
+    axes = figure.add_subplot()
+    for i, ((x, y), label) in enumerate(zip(spec["curves"], spec["labels"])):
+        if spec["regression"]:
+            axes.plot(x, y, color=COLORS[i % len(COLORS)], label=f"{label} ", zorder=10)
+        else:
+            axes.scatter(x, y, color=COLORS[i % len(COLORS)], label=label, zorder=5)
+    axes.set_xlabel('Количество вершин, E')
+    axes.set_ylabel('Время нахождения кратчайшего пути, n')
+    axes.set_title(spec["title"])
+    axes.legend()
+    axes.grid(True)
+    figure.savefig(spec["filename"])
+    return spec["filename"]
+
+
+def multiPlotCreate(allData, regression, labels, title, printPolynoms, filenameAdd=""):
+    """
+    Один график в текущем процессе (прежний интерфейс).
+    """
+    if not isinstance(allData, list):
+        allData = [allData]
+    if not isinstance(labels, list):
+        labels = [labels]
+    series = [np.asarray(data, dtype=np.float64) for data in allData]
+    if regression and printPolynoms:
+        for points, label in zip(series, labels):
+            print(f"{title} {label}: {best_fit(points)[3]}")
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    render_plot(plot_spec(series, labels, title, regression, filenameAdd))
+
+
+def report_specs(algorithms, printPolynoms=True):
+    """
+    Все графики отчёта: сводные по случаям для каждого алгоритма, общий сводный
+    и по отдельному графику на каждый случай — точки и регрессия. Если на одном случае
+    замерено несколько реализаций, каждая рисуется своей серией с именем реализации
+    в подписи и в имени файла.
+    """
+    specs = []
+    combined_series, combined_labels = [], []
+    for title, series in algorithms.items():
+        keys = sorted((key for key in series if key[0] in CASE_LABELS),
+                      key=lambda key: (list(CASE_LABELS).index(key[0]), key[1] or ""))
+        implementations = Counter(case for case, _ in keys)
+
+        def describe(case, algorithm, names):
+            return names[case] + (f" {algorithm}" if implementations[case] > 1 else "")
+
+        case_series = [series[key] for key in keys]
+        labels = [describe(*key, CASE_LABELS) for key in keys]
+        specs.append(plot_spec(case_series, labels, title, False, "combined_practic"))
+        specs.append(plot_spec(case_series, labels, f"{title}. Регрессия", True, "combined_practic_regression"))
+        combined_series += case_series
+        combined_labels += [f"{label} {title}" for label in labels]
+        for key, label, points in zip(keys, labels, case_series):
+            specs.append(plot_spec([points], [label], title, False, describe(*key, CASE_FILENAMES)))
+            specs.append(plot_spec([points], [label], title, True, describe(*key, CASE_FILENAMES)))
+            if printPolynoms:
+                print(f"{title} {label}: {best_fit(points)[3]}")
+    if combined_series:
+        specs.append(plot_spec(combined_series, combined_labels, "Сводный график", True, "combined"))
+    return specs
+
+
+def build_report(reports=REPORTS, workers=None, force=False):
+    """
+    Строит отчёт: каждый файл результатов читается один раз, регрессии подбираются по разу
+    на серию, графики рисуются в пуле процессов. Графики, входные данные которых не изменились
+    с прошлого запуска (по хэшу содержимого) и PNG которых на месте, пропускаются.
+    Возвращает список перерисованных файлов.
+    """
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    algorithms = {title: load_algorithm_series(report_file, legacy_files)
+                  for title, (report_file, legacy_files) in reports.items()}
+    specs = report_specs({title: series for title, series in algorithms.items() if series})
+
+    hashes_path = os.path.join(OUTPUT_DIR, HASHES_FILE)
+    hashes = {}
+    if os.path.exists(hashes_path) and not force:
+        with open(hashes_path, encoding="UTF-8") as file:
+            hashes = json.load(file)
+    pending = [spec for spec in specs
+               if hashes.get(spec["filename"]) != spec_hash(spec) or not os.path.exists(spec["filename"])]
+
+    if pending:
+        with ProcessPoolExecutor(workers) as executor:
+            rendered = list(executor.map(render_plot, pending))
+    else:
+        rendered = []
+    hashes.update({spec["filename"]: spec_hash(spec) for spec in specs})
+    with open(hashes_path, "w", encoding="UTF-8") as file:
+        json.dump(hashes, file, ensure_ascii=False, indent=2)
+    return rendered
+
+
+if __name__ == "__main__":
+    # python drawGraphic.py [--force] — перерисовать все графики, даже неизменившиеся
+    rendered = build_report(force="--force" in sys.argv[1:])
+    print(f"Перерисовано графиков: {len(rendered)}")
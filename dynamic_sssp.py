@@ -0,0 +1,173 @@
+import heapq
+from array import array
+from collections import deque
+from sys import maxsize
+
+from algorithms import DIJKSTRA_ALGORITHMS, shortest_path_tree
+from csr_graph import CSRGraph
+
+INF = float('inf')
+
+
+class DynamicSSSP:
+    """
+    Кратчайшие расстояния от одной вершины, поддерживаемые при изменениях графа
+    без полного пересчёта (в духе Рамалингама–Репса).
+
+    Хранятся расстояния, дерево кратчайших путей (предшественники) и изменяемые списки
+    смежности: out_edges[u] и in_edges[v] — словари {сосед: вес}. Кратные рёбра схлопываются
+    в одно с минимальным весом, поэтому ребро задаётся парой (u, v). При undirected=True
+    каждое изменение применяется в обе стороны, как в Дейкстре на неориентированном графе.
+
+    Пакет изменений обрабатывается в два шага. Удаление или увеличение веса ребра дерева
+    делает затронутым поддерево его конца: расстояния этих вершин сбрасываются и заново
+    оцениваются по входящим рёбрам от незатронутых вершин. Затем уменьшения (включая
+    вставки и новые оценки затронутых вершин) распространяются очередью с приоритетом
+    только по той части графа, где расстояния действительно уменьшаются. Отрицательные
+    веса допустимы, если изменения не создают цикл с отрицательным весом.
+    """
+
+    def __init__(self, graph, src, distances, predecessors=None, undirected=False):
+        if not isinstance(graph, CSRGraph):
+            graph = CSRGraph.from_edges(graph)
+        self.src = src
+        self.num_vertices = graph.num_vertices
+        self.undirected = undirected
+        # Форд-Беллман помечает недостижимые вершины sys.maxsize, Дейкстра — float('inf')
+        self.distances = [distance if distance < maxsize else INF for distance in distances]
+
+        self.out_edges = [{} for _ in range(self.num_vertices)]
+        self.in_edges = [{} for _ in range(self.num_vertices)]
+        for u, v, w in graph:
+            self._set_weight(u, v, min(w, self.out_edges[u].get(v, w)))
+            if undirected:
+                self._set_weight(v, u, min(w, self.out_edges[v].get(u, w)))
+
+        if predecessors is None:
+            predecessors = self._tight_tree()
+        self.predecessors = array('i', predecessors)
+
+    @classmethod
+    def from_algorithm(cls, algorithm, graph, src):
+        """
+        Начальные расстояния и предшественники считаются алгоритмом из algorithms.ALGORITHMS;
+        граф неориентирован, если так его понимает этот алгоритм.
+        """
+        if not isinstance(graph, CSRGraph):
+            graph = CSRGraph.from_edges(graph)
+        tree = shortest_path_tree(algorithm, graph, src)
+        undirected = algorithm in DIJKSTRA_ALGORITHMS and not graph.directed
+        return cls(graph, src, tree.distances, tree.predecessors, undirected)
+
+    def _set_weight(self, u, v, weight):
+        if weight is None:
+            self.out_edges[u].pop(v, None)
+            self.in_edges[v].pop(u, None)
+        else:
+            self.out_edges[u][v] = weight
+            self.in_edges[v][u] = weight
+
+    def _tight_tree(self):
+        """
+        Дерево предшественников по "плотным" рёбрам (dis[u] + w == dis[v]), построенное обходом
+        в ширину от источника, — если начальные расстояния пришли без предшественников.
+        """
+        distances, predecessors = self.distances, array('i', [-1]) * self.num_vertices
+        queue = deque([self.src])
+        while queue:
+            u = queue.popleft()
+            for v, w in self.out_edges[u].items():
+                if predecessors[v] == -1 and v != self.src and distances[u] + w == distances[v]:
+                    predecessors[v] = u
+                    queue.append(v)
+        return predecessors
+
+    def _subtree(self, root):
+        """
+        Вершины поддерева root в дереве предшественников; дети ищутся среди исходящих соседей.
+        """
+        predecessors, subtree, stack = self.predecessors, [root], [root]
+        while stack:
+            u = stack.pop()
+            for v in self.out_edges[u]:
+                if predecessors[v] == u:
+                    subtree.append(v)
+                    stack.append(v)
+        return subtree
+
+    def apply(self, changes):
+        """
+        Применяет пакет изменений (u, v, w): вставка ребра или новый вес, w=None — удаление.
+        Возвращает число вершин, расстояния которых пересчитывались.
+        """
+        distances, predecessors = self.distances, self.predecessors
+        roots, decreased = [], []
+        for u, v, weight in changes:
+            for a, b in ((u, v), (v, u)) if self.undirected else ((u, v),):
+                old = self.out_edges[a].get(b)
+                self._set_weight(a, b, weight)
+                if predecessors[b] == a and old is not None and (weight is None or weight > old):
+                    roots.append(b)
+                elif weight is not None and distances[a] + weight < distances[b]:
+                    decreased.append(b)
+
+        # Шаг 1: поддеревья под удлинившимися рёбрами дерева теряют свои расстояния
+        affected = set()
+        for root in roots:
+            if root not in affected and predecessors[root] != -1:
+                affected.update(self._subtree(root))
+        for v in affected:
+            distances[v] = INF
+            predecessors[v] = -1
+
+        heap = []
+        for v in affected:
+            for u, w in self.in_edges[v].items():
+                if u not in affected and distances[u] + w < distances[v]:
+                    distances[v] = distances[u] + w
+                    predecessors[v] = u
+            if distances[v] < INF:
+                heap.append((distances[v], v))
+        for v in decreased:
+            for u, w in self.in_edges[v].items():
+                if distances[u] + w < distances[v]:
+                    distances[v] = distances[u] + w
+                    predecessors[v] = u
+                    heap.append((distances[v], v))
+        heapq.heapify(heap)
+
+        # Шаг 2: распространение уменьшений; при отрицательных весах вершина может
+        # извлекаться повторно, V извлечений одной вершины означают отрицательный цикл
+        touched = set(affected)
+        updates = array('i', [0]) * self.num_vertices
+        while heap:
+            d, u = heapq.heappop(heap)
+            if d > distances[u]:
+                continue
+            touched.add(u)
+            updates[u] += 1
+            if updates[u] >= self.num_vertices:
+                raise ValueError("Граф содержит цикл с отрицательным весом")
+            for v, w in self.out_edges[u].items():
+                if d + w < distances[v]:
+                    distances[v] = d + w
+                    predecessors[v] = u
+                    heapq.heappush(heap, (distances[v], v))
+        return len(touched)
+
+    def insert_edge(self, u, v, weight):
+        return self.apply([(u, v, weight)])
+
+    def delete_edge(self, u, v):
+        return self.apply([(u, v, None)])
+
+    def set_weight(self, u, v, weight):
+        return self.apply([(u, v, weight)])
+
+    def graph(self):
+        """
+        Текущий граф в виде CSRGraph (для сверки с полным пересчётом).
+        """
+        edges = [(u, v, w) for u in range(self.num_vertices) for v, w in self.out_edges[u].items()
+                 if not self.undirected or u <= v]
+        return CSRGraph.from_edges(edges, self.num_vertices, directed=not self.undirected)
@@ -1,9 +1,22 @@
-import networkx as nx
+import argparse
+import os
+
 import matplotlib.pyplot as plt
-import scipy as sp
+import numpy as np
+from matplotlib.collections import LineCollection
+
+from algorithms import shortest_path_tree
+from csr_graph import CSRGraph
+from graph_io import load_graph
+
+# Начиная с этого числа вершин подписи вершин и весов рёбер не рисуются
+LABEL_THRESHOLD = 100
+
 
 # Функция для чтения графа из файла
 def read_graph_from_file(filename):
+    import networkx as nx
+
     G = nx.Graph()
     with open(filename, 'r') as file:
         for line in file:
@@ -13,6 +26,8 @@ def read_graph_from_file(filename):
 
 # Визуализация графа
 def draw_graph(G):
+    import networkx as nx
+
     pos = nx.spring_layout(G)  # Расположение узлов
     weights = nx.get_edge_attributes(G, 'weight')
 
@@ -22,8 +37,174 @@ def draw_graph(G):
     plt.title("Граф из файла")
     plt.show()
 
+
+def _neighbors(adjacency, frontier):
+    """
+    Все рёбра вершин frontier из CSR одной векторной операцией: (начала, концы).
+    """
+    offsets, targets, _ = adjacency
+    starts = offsets[frontier]
+    counts = offsets[frontier + 1] - starts
+    edge_index = np.repeat(starts - (np.cumsum(counts) - counts), counts) + np.arange(int(counts.sum()))
+    return np.repeat(frontier, counts), targets[edge_index]
+
+
+def _induced_edges(graph, vertices):
+    """
+    Рёбра графа, оба конца которых входят в vertices: (src, dst, weight).
+    """
+    selected = np.zeros(graph.num_vertices, dtype=bool)
+    selected[vertices] = True
+    mask = selected[graph.src] & selected[graph.dst]
+    return graph.src[mask], graph.dst[mask], graph.weight[mask]
+
+
+def k_hop_subgraph(graph, src, hops):
+    """
+    Окрестность src радиуса hops (по числу рёбер, без учёта направления) и рёбра между
+    её вершинами. Обход в ширину векторизован по слоям, граф NetworkX не строится.
+    """
+    adjacency = graph.adjacency(undirected=True)
+    visited = np.zeros(graph.num_vertices, dtype=bool)
+    visited[src] = True
+    frontier = np.array([src])
+    for _ in range(hops):
+        _, reached = _neighbors(adjacency, frontier)
+        frontier = np.unique(reached[~visited[reached]])
+        if len(frontier) == 0:
+            break
+        visited[frontier] = True
+    vertices = np.flatnonzero(visited)
+    return vertices, _induced_edges(graph, vertices)
+
+
+def shortest_path_tree_subgraph(graph, src, max_vertices=None, algorithm="dijkstra_with_min_heap"):
+    """
+    Дерево кратчайших путей из src по предшественникам Дейкстры; при max_vertices —
+    только ближайшие по расстоянию вершины. Возвращает (вершины, (src, dst, weight) рёбер дерева).
+    """
+    tree = shortest_path_tree(algorithm, graph, src)
+    predecessors = np.frombuffer(tree.predecessors, dtype=np.int32)
+    distances = np.asarray(tree.distances, dtype=np.float64)
+    vertices = np.flatnonzero((predecessors != -1) | (np.arange(graph.num_vertices) == src))
+    if max_vertices is not None and len(vertices) > max_vertices:
+        vertices = vertices[np.argsort(distances[vertices], kind="stable")[:max_vertices]]
+    selected = np.zeros(graph.num_vertices, dtype=bool)
+    selected[vertices] = True
+    children = vertices[vertices != src]
+    children = children[selected[predecessors[children]]]
+    parents = predecessors[children]
+    weights = distances[children] - distances[parents]
+    return np.sort(vertices), (parents, children, weights)
+
+
+def radial_layout(vertices, edges, src):
+    """
+    Радиальная раскладка за O(V + E): вершина на окружности радиуса, равного числу рёбер
+    до src, углы в слое упорядочены по углу родителя, так что поддеревья не перемешиваются.
+    Недостижимые вершины кладутся на внешнее кольцо. Возвращает массив координат (n, 2)
+    в порядке vertices.
+    """
+    index = np.full(int(vertices.max()) + 1, -1)
+    index[vertices] = np.arange(len(vertices))
+    local = CSRGraph(index[edges[0]], index[edges[1]], edges[2], len(vertices))
+    adjacency = local.adjacency(undirected=True)
+
+    depth = np.full(len(vertices), -1)
+    angle = np.zeros(len(vertices))
+    frontier = np.array([index[src]])
+    depth[frontier] = 0
+    layer = 0
+    while len(frontier):
+        layer += 1
+        parents, reached = _neighbors(adjacency, frontier)
+        new = depth[reached] == -1
+        # Родитель новой вершины — первая вершина прошлого слоя, из которой она достигнута
+        reached, first = np.unique(reached[new], return_index=True)
+        parents = parents[new][first]
+        order = np.argsort(angle[parents], kind="stable")
+        reached = reached[order]
+        depth[reached] = layer
+        angle[reached] = (np.arange(len(reached)) + 0.5) / max(len(reached), 1) * 2 * np.pi
+        frontier = reached
+
+    unreached = np.flatnonzero(depth == -1)
+    depth[unreached] = layer + 1
+    angle[unreached] = (np.arange(len(unreached)) + 0.5) / max(len(unreached), 1) * 2 * np.pi
+    return np.column_stack((depth * np.cos(angle), depth * np.sin(angle)))
+
+
+def cached_layout(filename, graph, vertices, edges, src, mode):
+    """
+    Координаты из файла позиций рядом с графом, если он построен для того же содержимого
+    графа и того же набора вершин; иначе раскладка считается заново и сохраняется.
+    """
+    positions_file = f"{os.path.splitext(filename)[0]}_{mode}_{src}_positions.npz"
+    if os.path.exists(positions_file):
+        with np.load(positions_file) as data:
+            if str(data["fingerprint"]) == graph.fingerprint() and np.array_equal(data["vertices"], vertices):
+                return data["positions"]
+    positions = radial_layout(vertices, edges, src)
+    np.savez(positions_file, vertices=vertices, positions=positions, fingerprint=np.array(graph.fingerprint()))
+    return positions
+
+
+def draw_large_graph(filename, src=0, mode="tree", hops=2, max_vertices=None, output=None):
+    """
+    Отрисовка большого графа без NetworkX: дерево кратчайших путей (mode="tree"),
+    окрестность радиуса hops (mode="khop") или весь граф (mode="full"). Рёбра рисуются
+    одной LineCollection, подписи — только для графов меньше LABEL_THRESHOLD вершин.
+    При output рисунок сохраняется в файл, иначе показывается на экране.
+    """
+    graph = load_graph(filename)
+    if mode == "tree":
+        vertices, edges = shortest_path_tree_subgraph(graph, src, max_vertices)
+    elif mode == "khop":
+        vertices, edges = k_hop_subgraph(graph, src, hops)
+    else:
+        vertices = np.arange(graph.num_vertices)
+        edges = (graph.src, graph.dst, graph.weight)
+
+    positions = cached_layout(filename, graph, vertices, edges, src, mode)
+    index = np.full(graph.num_vertices, -1)
+    index[vertices] = np.arange(len(vertices))
+    segments = np.stack((positions[index[edges[0]]], positions[index[edges[1]]]), axis=1)
+
+    figure, axes = plt.subplots(figsize=(12, 12))
+    axes.add_collection(LineCollection(segments, colors="gray", linewidths=0.3, alpha=0.6, rasterized=True))
+    node_size = 500 if len(vertices) < LABEL_THRESHOLD else max(20000 / len(vertices), 0.5)
+    axes.scatter(positions[:, 0], positions[:, 1], s=node_size, color="skyblue", zorder=2, rasterized=True)
+    axes.scatter(*positions[index[src]], s=node_size * 2, color="red", zorder=3)
+    if len(vertices) < LABEL_THRESHOLD:
+        for vertex, (x, y) in zip(vertices.tolist(), positions):
+            axes.annotate(str(vertex), (x, y), ha="center", va="center", fontsize=10, zorder=4)
+        for (start, end), weight in zip(segments, edges[2].tolist()):
+            axes.annotate(str(weight), (start + end) / 2, ha="center", fontsize=8, zorder=4)
+    axes.autoscale()
+    axes.set_aspect("equal")
+    axes.set_axis_off()
+    axes.set_title(f"{filename}: {len(vertices)} вершин, {len(edges[0])} рёбер")
+    if output:
+        figure.savefig(output, dpi=150)
+        plt.close(figure)
+    else:
+        plt.show()
+
+
 # Основная часть программы
 if __name__ == "__main__":
-    filename = "graph_121_vertices.txt"  # Имя файла с графом
-    graph = read_graph_from_file(filename)  # Считываем граф
-    draw_graph(graph)  # Отрисовываем граф
+    parser = argparse.ArgumentParser(description="Отрисовка графа")
+    parser.add_argument("filename", nargs="?", default="graph_121_vertices.txt")
+    parser.add_argument("--mode", choices=["networkx", "tree", "khop", "full"], default="networkx",
+                        help="networkx — прежняя отрисовка небольших графов")
+    parser.add_argument("--source", type=int, default=0)
+    parser.add_argument("--hops", type=int, default=2)
+    parser.add_argument("--max-vertices", type=int)
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    if args.mode == "networkx":
+        graph = read_graph_from_file(args.filename)  # Считываем граф
+        draw_graph(graph)  # Отрисовываем граф
+    else:
+        draw_large_graph(args.filename, args.source, args.mode, args.hops, args.max_vertices, args.output)
@@ -0,0 +1,278 @@
+import glob
+import json
+import os
+import sys
+
+import numpy as np
+
+from csr_graph import CSRGraph, read_csr_graph
+
+# Бинарный формат графа (.bin), все числа little-endian:
+#   заголовок HEADER_SIZE байт: magic, версия, флаги, число вершин, число рёбер, тип весов;
+#   далее секции, каждая выровнена по ALIGNMENT байт:
+#   src int32[E], dst int32[E], weight[E]
+#   [FLAG_OUT_CSR] offsets int64[V + 1], targets int32[E], weights[E]      — направленная смежность
+#   [FLAG_SYM_CSR] offsets int64[V + 1], targets int32[2E], weights[2E]    — неориентированная смежность
+MAGIC = b"SPGRAPH\0"
+FORMAT_VERSION = 1
+HEADER_SIZE = 64
+ALIGNMENT = 64
+BINARY_SUFFIX = ".bin"
+
+FLAG_DIRECTED = 1
+FLAG_OUT_CSR = 2
+FLAG_SYM_CSR = 4
+
+WEIGHT_DTYPES = {0: np.dtype("<i8"), 1: np.dtype("<f8")}
+VERTEX_DTYPE = np.dtype("<i4")
+OFFSET_DTYPE = np.dtype("<i8")
+
+HEADER_DTYPE = np.dtype([
+    ("magic", "S8"),
+    ("version", "<u4"),
+    ("flags", "<u4"),
+    ("num_vertices", "<u8"),
+    ("num_edges", "<u8"),
+    ("weight_type", "<u4"),
+])
+
+
+def _aligned(offset):
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def _weight_type(dtype):
+    for code, weight_dtype in WEIGHT_DTYPES.items():
+        if weight_dtype == dtype:
+            return code
+    raise ValueError(f"Неподдерживаемый тип весов: {dtype}")
+
+
+def _sections(flags, num_vertices, num_edges, weight_dtype):
+    """
+    Раскладка секций файла: список (имя, тип, число элементов).
+    """
+    sections = [("src", VERTEX_DTYPE, num_edges), ("dst", VERTEX_DTYPE, num_edges),
+                ("weight", weight_dtype, num_edges)]
+    if flags & FLAG_OUT_CSR:
+        sections += [("out_offsets", OFFSET_DTYPE, num_vertices + 1), ("out_targets", VERTEX_DTYPE, num_edges),
+                     ("out_weights", weight_dtype, num_edges)]
+    if flags & FLAG_SYM_CSR:
+        sections += [("sym_offsets", OFFSET_DTYPE, num_vertices + 1), ("sym_targets", VERTEX_DTYPE, 2 * num_edges),
+                     ("sym_weights", weight_dtype, 2 * num_edges)]
+    return sections
+
+
+def write_binary_graph(graph, filename, with_csr=True):
+    """
+    Записывает CSRGraph в бинарный формат. При with_csr в файл попадают и списки
+    смежности, чтобы при загрузке их не приходилось строить заново.
+    """
+    flags = FLAG_DIRECTED if graph.directed else 0
+    if with_csr:
+        flags |= FLAG_OUT_CSR | FLAG_SYM_CSR
+
+    header = np.zeros(1, dtype=HEADER_DTYPE)
+    header["magic"] = MAGIC
+    header["version"] = FORMAT_VERSION
+    header["flags"] = flags
+    header["num_vertices"] = graph.num_vertices
+    header["num_edges"] = graph.num_edges
+    header["weight_type"] = _weight_type(graph.weight.dtype)
+
+    arrays = {"src": graph.src, "dst": graph.dst, "weight": graph.weight}
+    if with_csr:
+        for prefix, undirected in (("out", False), ("sym", True)):
+            offsets, targets, weights = graph.adjacency(undirected)
+            arrays.update({f"{prefix}_offsets": offsets, f"{prefix}_targets": targets, f"{prefix}_weights": weights})
+
+    with open(filename, "wb") as file:
+        file.write(header.tobytes().ljust(HEADER_SIZE, b"\0"))
+        for name, dtype, _ in _sections(flags, graph.num_vertices, graph.num_edges, graph.weight.dtype):
+            file.write(b"\0" * (_aligned(file.tell()) - file.tell()))
+            file.write(np.ascontiguousarray(arrays[name], dtype=dtype).tobytes())
+
+
+def write_binary_edges(filename, num_vertices, num_edges, chunks, weight_dtype=np.dtype("<i8"), directed=False):
+    """
+    Потоковая запись бинарного графа без списков смежности: chunks() возвращает итератор
+    кусков (src, dst, weight) и вызывается по разу на каждую секцию, так что в памяти
+    одновременно находится только один кусок.
+    """
+    header = np.zeros(1, dtype=HEADER_DTYPE)
+    header["magic"] = MAGIC
+    header["version"] = FORMAT_VERSION
+    header["flags"] = FLAG_DIRECTED if directed else 0
+    header["num_vertices"] = num_vertices
+    header["num_edges"] = num_edges
+    header["weight_type"] = _weight_type(weight_dtype)
+
+    with open(filename, "wb") as file:
+        file.write(header.tobytes().ljust(HEADER_SIZE, b"\0"))
+        for column, (_, dtype, _) in enumerate(_sections(0, num_vertices, num_edges, weight_dtype)):
+            file.write(b"\0" * (_aligned(file.tell()) - file.tell()))
+            written = 0
+            for chunk in chunks():
+                file.write(np.ascontiguousarray(chunk[column], dtype=dtype).tobytes())
+                written += len(chunk[column])
+            if written != num_edges:
+                raise ValueError(f"Ожидалось {num_edges} рёбер, получено {written}")
+
+
+def read_binary_graph(filename):
+    """
+    Открывает бинарный граф через np.memmap: массивы не копируются в память,
+    страницы подгружаются ОС по мере обращения.
+    """
+    header = np.fromfile(filename, dtype=HEADER_DTYPE, count=1)
+    # Поле "S8" в NumPy отбрасывает завершающие нулевые байты
+    if len(header) == 0 or header["magic"][0] != MAGIC.rstrip(b"\0"):
+        raise ValueError(f"{filename} не является бинарным файлом графа")
+    if header["version"][0] != FORMAT_VERSION:
+        raise ValueError(f"Неподдерживаемая версия формата {header['version'][0]} в {filename}")
+
+    flags = int(header["flags"][0])
+    num_vertices = int(header["num_vertices"][0])
+    num_edges = int(header["num_edges"][0])
+    weight_dtype = WEIGHT_DTYPES[int(header["weight_type"][0])]
+
+    arrays = {}
+    offset = HEADER_SIZE
+    for name, dtype, count in _sections(flags, num_vertices, num_edges, weight_dtype):
+        offset = _aligned(offset)
+        if count:
+            arrays[name] = np.memmap(filename, dtype=dtype, mode="r", offset=offset, shape=(count,))
+        else:
+            arrays[name] = np.empty(0, dtype=dtype)
+        offset += count * dtype.itemsize
+
+    graph = CSRGraph(arrays["src"], arrays["dst"], arrays["weight"], num_vertices, bool(flags & FLAG_DIRECTED))
+    if flags & FLAG_OUT_CSR:
+        graph._adjacency[False] = (arrays["out_offsets"], arrays["out_targets"], arrays["out_weights"])
+    if flags & FLAG_SYM_CSR:
+        graph._adjacency[True] = (arrays["sym_offsets"], arrays["sym_targets"], arrays["sym_weights"])
+    return graph
+
+
+def is_binary_graph(filename):
+    with open(filename, "rb") as file:
+        return file.read(len(MAGIC)) == MAGIC
+
+
+def binary_filename(filename):
+    """
+    Имя бинарного файла, соответствующего текстовому: graph.txt -> graph.bin.
+    """
+    return os.path.splitext(filename)[0] + BINARY_SUFFIX
+
+
+def load_graph(filename, prefer_binary=True):
+    """
+    Загружает граф как CSRGraph. Если рядом с текстовым файлом лежит сконвертированный
+    бинарный (и prefer_binary), он открывается через memmap вместо разбора текста —
+    но только если он не старше текстового: перегенерированный текст читается заново.
+    """
+    binary = binary_filename(filename)
+    if (prefer_binary and not filename.endswith(BINARY_SUFFIX) and os.path.exists(binary)
+            and (not os.path.exists(filename) or os.path.getmtime(binary) >= os.path.getmtime(filename))):
+        filename = binary
+    if is_binary_graph(filename):
+        return read_binary_graph(filename)
+    return read_csr_graph(filename, directed=is_directed_graph(filename))
+
+
+def iter_edge_chunks(filename, chunk_edges=1 << 22):
+    """
+    Потоковое чтение рёбер кусками (src, dst, weight) массивов NumPy не длиннее chunk_edges.
+    Бинарный файл читается срезами memmap, текстовый — буферизованными блоками строк,
+    так что в памяти одновременно находится только один кусок.
+    """
+    if is_binary_graph(filename):
+        graph = read_binary_graph(filename)
+        for start in range(0, graph.num_edges, chunk_edges):
+            stop = start + chunk_edges
+            yield np.asarray(graph.src[start:stop]), np.asarray(graph.dst[start:stop]), np.asarray(graph.weight[start:stop])
+        return
+    with open(filename, encoding="UTF-8") as file:
+        while True:
+            # Подсказка размера блока в байтах: строка "u v w" занимает около 16 символов
+            lines = file.readlines(chunk_edges * 16)
+            if not lines:
+                break
+            data = np.fromstring("".join(lines), dtype=np.int64, sep=" ").reshape(-1, 3)
+            yield data[:, 0], data[:, 1], data[:, 2]
+
+
+def edge_file_info(filename, chunk_edges=1 << 22):
+    """
+    (число вершин, число рёбер, тип весов) файла графа. Для бинарного берётся из заголовка,
+    текстовый просматривается потоком один раз.
+    """
+    if is_binary_graph(filename):
+        graph = read_binary_graph(filename)
+        return graph.num_vertices, graph.num_edges, graph.weight.dtype
+    num_vertices, num_edges = 0, 0
+    for src, dst, _ in iter_edge_chunks(filename, chunk_edges):
+        if len(src):
+            num_vertices = max(num_vertices, int(src.max()) + 1, int(dst.max()) + 1)
+        num_edges += len(src)
+    return num_vertices, num_edges, np.dtype(np.int64)
+
+
+def metadata_filename(filename):
+    """
+    Имя файла метаданных графа: graph.txt -> graph.meta.json.
+    """
+    return os.path.splitext(filename)[0] + ".meta.json"
+
+
+def write_graph_metadata(filename, metadata):
+    """
+    Сохраняет рядом с графом его параметры (семейство, V, E, seed, диапазон весов и т. п.).
+    """
+    with open(metadata_filename(filename), "w", encoding="UTF-8") as file:
+        json.dump(metadata, file, ensure_ascii=False, indent=2)
+
+
+def read_graph_metadata(filename):
+    """
+    Метаданные графа или None, если генератор их не сохранил.
+    """
+    if not os.path.exists(metadata_filename(filename)):
+        return None
+    with open(metadata_filename(filename), encoding="UTF-8") as file:
+        return json.load(file)
+
+
+def is_directed_graph(filename):
+    """
+    Ориентирован ли текстовый граф: по флагу directed в метаданных генератора,
+    без метаданных граф считается неориентированным.
+    """
+    metadata = read_graph_metadata(filename)
+    return bool(metadata and metadata.get("directed"))
+
+
+def read_graph_from_file(filename):
+    """
+    Считывает граф из файла.
+    """
+    edges = np.fromfile(filename, dtype=np.int64, sep=" ").reshape(-1, 3)
+    num_vertices = int(edges[:, :2].max()) + 1 if len(edges) else 0
+    return edges.tolist(), num_vertices
+
+
+def convert_text_graph(filename, output=None, with_csr=True):
+    """
+    Конвертирует текстовый файл "u v w" в бинарный формат и возвращает имя нового файла.
+    """
+    output = output or binary_filename(filename)
+    write_binary_graph(read_csr_graph(filename, directed=is_directed_graph(filename)), output, with_csr)
+    return output
+
+
+if __name__ == "__main__":
+    # Конвертация графов, созданных Graph-generation.py
+    files = sys.argv[1:] or sorted(glob.glob("*_case_graph_*_vertices.txt"))
+    for filename in files:
+        print(f"Граф {filename} сконвертирован в {convert_text_graph(filename)}.")
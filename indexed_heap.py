@@ -0,0 +1,175 @@
+from array import array
+
+
+class DaryHeap:
+    """
+    Индексированная d-арная куча вершин 0..n-1 с настоящим уменьшением ключа.
+
+    Ключи не копируются в кучу: она читает их из переданного списка keys (в Дейкстре —
+    из списка расстояний), поэтому элементы кучи — просто номера вершин, без кортежей.
+    position[v] — индекс вершины v в массиве кучи или -1, если её там нет.
+    Каждая вершина встречается в куче не более одного раза, размер кучи не превышает n.
+    """
+
+    def __init__(self, keys, arity=2):
+        self.keys = keys
+        self.arity = arity
+        self.heap = []
+        self.position = array('i', [-1]) * len(keys)
+
+    def __len__(self):
+        return len(self.heap)
+
+    def __contains__(self, vertex):
+        return self.position[vertex] != -1
+
+    def push_or_decrease(self, vertex):
+        """
+        Добавляет вершину или поднимает её после уменьшения ключа keys[vertex].
+        """
+        index = self.position[vertex]
+        if index == -1:
+            index = len(self.heap)
+            self.heap.append(vertex)
+        self._sift_up(index, vertex)
+
+    def pop(self):
+        """
+        Извлекает вершину с минимальным ключом.
+        """
+        heap = self.heap
+        top = heap[0]
+        last = heap.pop()
+        self.position[top] = -1
+        if heap:
+            self._sift_down(0, last)
+        return top
+
+    def _sift_up(self, index, vertex):
+        heap, keys, position, arity = self.heap, self.keys, self.position, self.arity
+        key = keys[vertex]
+        while index > 0:
+            parent_index = (index - 1) // arity
+            parent = heap[parent_index]
+            if keys[parent] <= key:
+                break
+            heap[index] = parent
+            position[parent] = index
+            index = parent_index
+        heap[index] = vertex
+        position[vertex] = index
+
+    def _sift_down(self, index, vertex):
+        heap, keys, position, arity = self.heap, self.keys, self.position, self.arity
+        key = keys[vertex]
+        size = len(heap)
+        while True:
+            first_child = index * arity + 1
+            if first_child >= size:
+                break
+            best_child, best_key = first_child, keys[heap[first_child]]
+            for child in range(first_child + 1, min(first_child + arity, size)):
+                child_key = keys[heap[child]]
+                if child_key < best_key:
+                    best_child, best_key = child, child_key
+            if key <= best_key:
+                break
+            heap[index] = heap[best_child]
+            position[heap[index]] = index
+            index = best_child
+        heap[index] = vertex
+        position[vertex] = index
+
+
+class PairingHeap:
+    """
+    Индексированная парная куча (pairing heap) вершин 0..n-1 с уменьшением ключа за O(1).
+
+    Дерево хранится в трёх массивах по номеру вершины: первый ребёнок, следующий брат
+    и предыдущий узел (родитель для первого ребёнка, иначе левый брат). Ключи, как и
+    в DaryHeap, читаются из внешнего списка keys.
+    """
+
+    def __init__(self, keys):
+        self.keys = keys
+        size = len(keys)
+        self.child = array('i', [-1]) * size
+        self.sibling = array('i', [-1]) * size
+        self.previous = array('i', [-1]) * size
+        self.in_heap = bytearray(size)
+        self.root = -1
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def __contains__(self, vertex):
+        return self.in_heap[vertex] == 1
+
+    def _link(self, first, second):
+        """
+        Объединяет два дерева, корни которых не имеют братьев; возвращает новый корень.
+        """
+        if self.keys[second] < self.keys[first]:
+            first, second = second, first
+        child = self.child[first]
+        self.sibling[second] = child
+        if child != -1:
+            self.previous[child] = second
+        self.previous[second] = first
+        self.child[first] = second
+        return first
+
+    def push_or_decrease(self, vertex):
+        """
+        Добавляет вершину или вырезает её поддерево и сливает с корнем после уменьшения ключа.
+        """
+        if not self.in_heap[vertex]:
+            self.in_heap[vertex] = 1
+            self.size += 1
+            self.child[vertex] = self.sibling[vertex] = self.previous[vertex] = -1
+        elif vertex == self.root:
+            return
+        else:
+            previous, sibling = self.previous[vertex], self.sibling[vertex]
+            if self.child[previous] == vertex:
+                self.child[previous] = sibling
+            else:
+                self.sibling[previous] = sibling
+            if sibling != -1:
+                self.previous[sibling] = previous
+            self.sibling[vertex] = self.previous[vertex] = -1
+
+        self.root = vertex if self.root == -1 else self._link(self.root, vertex)
+
+    def pop(self):
+        """
+        Извлекает вершину с минимальным ключом, сливая её детей в два прохода.
+        """
+        top = self.root
+        self.in_heap[top] = 0
+        self.size -= 1
+
+        # Первый проход: попарное слияние детей слева направо
+        pairs = []
+        child = self.child[top]
+        while child != -1:
+            second = self.sibling[child]
+            if second == -1:
+                self.previous[child] = -1
+                pairs.append(child)
+                break
+            following = self.sibling[second]
+            self.sibling[child] = self.sibling[second] = -1
+            pairs.append(self._link(child, second))
+            child = following
+
+        # Второй проход: слияние пар справа налево
+        root = pairs.pop() if pairs else -1
+        while pairs:
+            root = self._link(pairs.pop(), root)
+        if root != -1:
+            self.previous[root] = -1
+            self.sibling[root] = -1
+        self.root = root
+        return top
@@ -0,0 +1,74 @@
+import inspect
+import re
+import sys
+
+from algorithms import ALGORITHMS, DIJKSTRA_ALGORITHMS
+from csr_graph import CSRGraph
+
+# Метка счётчика в коде алгоритма — отдельная строка-комментарий "# @probe имя [выражение]".
+# В рабочих функциях это обычный комментарий и ничего не стоит; instrumented_module
+# перекомпилирует модуль, заменяя каждую метку на _probe_counters["имя"] += выражение
+# (по умолчанию 1) с тем же отступом, так что номера строк не меняются.
+PROBE_PATTERN = re.compile(r"^(?P<indent>[ \t]*)# @probe (?P<name>\w+)(?: (?P<amount>.+?))?\s*$", re.MULTILINE)
+
+# edges_relaxed — просмотренные рёбра, relaxations — успешные релаксации,
+# heap_pushes / heap_pops — операции с очередью вершин (куча, корзины, очередь SPFA,
+# выбор минимума в массиве), stale_pops — пропущенные устаревшие записи,
+# passes — проходы Форда-Беллмана до сходимости
+COUNTERS = ("edges_relaxed", "relaxations", "heap_pushes", "heap_pops", "stale_pops", "passes")
+
+_instrumented_modules = {}
+
+
+def _probe_statement(match):
+    if match["name"] not in COUNTERS:
+        raise ValueError(f"Неизвестный счётчик {match['name']!r}")
+    return f"{match['indent']}_probe_counters[{match['name']!r}] += {match['amount'] or 1}"
+
+
+def instrumented_module(module):
+    """
+    Копия модуля с включёнными счётчиками: исходный текст перекомпилируется с заменой меток
+    и выполняется в отдельном пространстве имён, так что вспомогательные функции модуля
+    тоже вызываются в инструментированном виде. Результат кэшируется; возвращает
+    (пространство имён, словарь счётчиков).
+    """
+    if module.__name__ not in _instrumented_modules:
+        source = PROBE_PATTERN.sub(_probe_statement, inspect.getsource(module))
+        counters = dict.fromkeys(COUNTERS, 0)
+        namespace = {"__name__": f"{module.__name__}[instrumented]", "__file__": module.__file__,
+                     "_probe_counters": counters}
+        exec(compile(source, module.__file__, "exec"), namespace)
+        _instrumented_modules[module.__name__] = namespace, counters
+    return _instrumented_modules[module.__name__]
+
+
+def instrumented(function):
+    """
+    Инструментированная версия функции и словарь её счётчиков.
+    """
+    namespace, counters = instrumented_module(sys.modules[function.__module__])
+    return namespace[function.__name__], counters
+
+
+def count_call_operations(function, *args):
+    """
+    Вызывает function(*args) в инструментированном виде и возвращает (результат, счётчики).
+    Годится и для функций вне ALGORITHMS — запросов для пары вершин dijkstra_point_to_point,
+    bidirectional_dijkstra и alt.alt_query. Счётчики обнуляются перед каждым запуском.
+    """
+    function, counters = instrumented(function)
+    counters.update(dict.fromkeys(COUNTERS, 0))
+    result = function(*args)
+    return result, {name: int(value) for name, value in counters.items()}
+
+
+def count_operations(algorithm, graph, src):
+    """
+    Запускает алгоритм по имени с включёнными счётчиками и возвращает (расстояния, счётчики).
+    """
+    if not isinstance(graph, CSRGraph):
+        graph = CSRGraph.from_edges(graph)
+    if algorithm in DIJKSTRA_ALGORITHMS:
+        return count_call_operations(ALGORITHMS[algorithm], graph, graph.num_vertices, src)
+    return count_call_operations(ALGORITHMS[algorithm], graph, graph.num_vertices, graph.num_edges, src)
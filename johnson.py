@@ -0,0 +1,66 @@
+import importlib
+import os
+import sys
+
+import numpy as np
+
+from csr_graph import CSRGraph
+from graph_io import load_graph
+from multi_source import distance_matrix
+
+bellman_ford = importlib.import_module("Ford-Bellman")
+
+
+def johnson_potentials(graph):
+    """
+    Потенциалы h(v) алгоритма Джонсона: расстояния от виртуальной вершины V, соединённой
+    рёбрами веса 0 со всеми вершинами, считаются одним запуском Форда-Беллмана.
+    Цикл с отрицательным весом приводит к ValueError из Форда-Беллмана.
+    """
+    num_vertices = graph.num_vertices
+    vertices = np.arange(num_vertices, dtype=np.int32)
+    augmented = CSRGraph(
+        np.concatenate((graph.src, np.full(num_vertices, num_vertices, dtype=np.int32))),
+        np.concatenate((graph.dst, vertices)),
+        np.concatenate((graph.weight, np.zeros(num_vertices, dtype=graph.weight.dtype))),
+        num_vertices + 1,
+        directed=True,
+    )
+    distances = bellman_ford.bellman_ford_vectorized(augmented, num_vertices + 1, augmented.num_edges, num_vertices)
+    return np.array(distances[:num_vertices], dtype=graph.weight.dtype)
+
+
+def johnson(graph, output=None, workers=None, algorithm="dijkstra_with_min_heap", block_columns=256):
+    """
+    Алгоритм Джонсона для всех пар вершин ориентированного графа с отрицательными рёбрами.
+
+    Рёбра перевзвешиваются w'(u, v) = w(u, v) + h(u) - h(v) >= 0, после чего Дейкстра
+    (algorithm) запускается из каждой вершины в пуле процессов через multi_source.distance_matrix.
+    Возвращает np.memmap формы V×V: элемент [v, s] — расстояние от s до v (inf, если v
+    недостижима); транспонированный вид .T индексируется как [s, v].
+    """
+    if not isinstance(graph, CSRGraph):
+        graph = CSRGraph.from_edges(graph, directed=True)
+    potentials = johnson_potentials(graph)
+
+    reweighted = CSRGraph(graph.src, graph.dst,
+                          graph.weight + potentials[graph.src] - potentials[graph.dst],
+                          graph.num_vertices, directed=True)
+    matrix = distance_matrix(reweighted, range(graph.num_vertices), algorithm, output, workers)
+
+    # Обратное преобразование: d(s, v) = d'(s, v) - h(s) + h(v), по блокам столбцов
+    potentials = potentials.astype(np.float64)
+    for start in range(0, graph.num_vertices, block_columns):
+        stop = min(start + block_columns, graph.num_vertices)
+        matrix[:, start:stop] += potentials[:, None] - potentials[None, start:stop]
+    matrix.flush()
+    return matrix
+
+
+if __name__ == "__main__":
+    # Пример: python johnson.py negative_graph_1000_vertices.txt
+    filename = sys.argv[1]
+    graph = load_graph(filename)
+    graph = CSRGraph(graph.src, graph.dst, graph.weight, graph.num_vertices, directed=True)
+    result = johnson(graph, output=f"{os.path.splitext(filename)[0]}_all_pairs.npy")
+    print(f"Матрица расстояний всех пар {result.shape} сохранена в {result.filename}.")
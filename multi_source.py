@@ -0,0 +1,111 @@
+import os
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from algorithms import ALGORITHMS, as_distance_array, shortest_paths
+from csr_graph import CSRGraph
+from graph_io import load_graph
+from shared_graph import SharedGraph, attach_graph
+
+# Состояние рабочего процесса: граф из общей памяти и открытая на запись матрица расстояний
+_worker_graph = None
+_worker_shm = None
+_worker_matrix = None
+
+
+def _init_worker(spec, output):
+    global _worker_graph, _worker_shm, _worker_matrix
+    _worker_graph, _worker_shm = attach_graph(spec)
+    _worker_matrix = np.lib.format.open_memmap(output, mode="r+")
+
+
+def _fill_columns(matrix, graph, algorithm, columns, sources):
+    for column, source in zip(columns, sources):
+        matrix[:, column] = as_distance_array(shortest_paths(algorithm, graph, source))
+    matrix.flush()
+
+
+def _worker_task(algorithm, columns, sources):
+    _fill_columns(_worker_matrix, _worker_graph, algorithm, columns, sources)
+    return len(columns)
+
+
+def distance_matrix(graph, sources, algorithm="dijkstra_with_min_heap", output=None, workers=None,
+                    chunk_size=16, progress=None):
+    """
+    Считает расстояния от каждой вершины из sources алгоритмом algorithm (имя из algorithms.ALGORITHMS).
+
+    Смежность строится один раз, граф публикуется рабочим процессам через общую память,
+    а каждый процесс пишет свои столбцы прямо в файл .npy. Результат — np.memmap формы V×S
+    (столбец j — расстояния от sources[j], недостижимые вершины — inf), хранящийся по столбцам;
+    без output файл создаётся во временном каталоге и удаляется сразу после открытия результата
+    (отображение в память остаётся действительным, место освобождается вместе с массивом).
+    При workers=1 вычисления идут в текущем процессе. progress(готово, всего) вызывается
+    по мере завершения пакетов источников.
+    """
+    if algorithm not in ALGORITHMS:
+        raise KeyError(f"Неизвестный алгоритм: {algorithm}")
+    if not isinstance(graph, CSRGraph):
+        graph = CSRGraph.from_edges(graph)
+    sources = list(sources)
+    temporary = output is None
+    if temporary:
+        descriptor, output = tempfile.mkstemp(suffix=".npy")
+        os.close(descriptor)
+    try:
+        matrix = _compute_matrix(graph, sources, algorithm, output, workers, chunk_size, progress)
+    except BaseException:
+        if temporary:
+            os.remove(output)
+        raise
+    if temporary:
+        try:
+            os.remove(output)
+        except PermissionError:
+            pass  # Windows не удаляет отображённый в память файл — он остаётся во временном каталоге
+    return matrix
+
+
+def _compute_matrix(graph, sources, algorithm, output, workers, chunk_size, progress):
+    matrix = np.lib.format.open_memmap(output, mode="w+", dtype=np.float64,
+                                       shape=(graph.num_vertices, len(sources)), fortran_order=True)
+    chunks = [(list(range(start, min(start + chunk_size, len(sources)))), sources[start:start + chunk_size])
+              for start in range(0, len(sources), chunk_size)]
+    done = 0
+
+    if workers == 1:
+        for columns, chunk_sources in chunks:
+            _fill_columns(matrix, graph, algorithm, columns, chunk_sources)
+            done += len(columns)
+            if progress:
+                progress(done, len(sources))
+        return matrix
+
+    # Списки смежности строятся до публикации, чтобы процессы не строили их каждый сам
+    graph.adjacency(undirected=True)
+    graph.adjacency(undirected=False)
+    with SharedGraph(graph) as shared, \
+            ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(shared.spec, output)) as executor:
+        futures = [executor.submit(_worker_task, algorithm, columns, chunk_sources)
+                   for columns, chunk_sources in chunks]
+        for future in as_completed(futures):
+            done += future.result()
+            if progress:
+                progress(done, len(sources))
+
+    del matrix
+    return np.lib.format.open_memmap(output, mode="r+")
+
+
+if __name__ == "__main__":
+    # Пример: python multi_source.py граф.txt алгоритм число_источников
+    filename = sys.argv[1]
+    algorithm = sys.argv[2] if len(sys.argv) > 2 else "dijkstra_with_min_heap"
+    graph = load_graph(filename)
+    count = int(sys.argv[3]) if len(sys.argv) > 3 else graph.num_vertices
+    result = distance_matrix(graph, range(count), algorithm, output=f"{os.path.splitext(filename)[0]}_distances.npy",
+                             progress=lambda done, total: print(f"Обработано источников: {done} из {total}"))
+    print(f"Матрица расстояний {result.shape} сохранена в {result.filename}.")
@@ -0,0 +1,60 @@
+from array import array
+
+
+def reset_predecessors(predecessors, V):
+    """
+    Заполняет массив предшественников значением -1 (предшественника нет) на V вершин.
+    Подходит и пустой array('i'): срез-присваивание меняет его длину.
+    """
+    predecessors[:] = array('i', [-1]) * V
+
+
+def distances_to_list(distances, weight_dtype):
+    """
+    Переводит массив расстояний NumPy в список, как у остальных реализаций:
+    при целых весах конечные расстояния — int, недостижимые вершины — float('inf').
+    """
+    result = distances.tolist()
+    if weight_dtype.kind == "i":
+        result = [int(distance) if distance != float('inf') else distance for distance in result]
+    return result
+
+
+class ShortestPaths:
+    """
+    Результат поиска из одной вершины: расстояния и компактный массив предшественников.
+    Маршруты не хранятся, а восстанавливаются по предшественникам при обращении.
+    """
+
+    def __init__(self, src, distances, predecessors):
+        self.src = src
+        self.distances = distances
+        self.predecessors = predecessors
+
+    def distance(self, target):
+        return self.distances[target]
+
+    def is_reachable(self, target):
+        return target == self.src or self.predecessors[target] != -1
+
+    def path(self, target):
+        """
+        Маршрут src -> target списком вершин; пустой список, если target недостижима.
+        """
+        if not self.is_reachable(target):
+            return []
+        path = [target]
+        while path[-1] != self.src:
+            path.append(self.predecessors[path[-1]])
+        path.reverse()
+        return path
+
+    def edges(self, target):
+        """
+        Маршрут src -> target списком рёбер (u, v).
+        """
+        path = self.path(target)
+        return list(zip(path, path[1:]))
+
+    def __getitem__(self, target):
+        return self.path(target)
@@ -0,0 +1,23 @@
+from csr_graph import CSRGraph
+
+
+def random_edges(rng, V, count, min_weight=0, max_weight=20, forward=False):
+    """
+    Случайные рёбра (u, v, w), в том числе петли и кратные; при forward=True только u < v,
+    т.е. граф без циклов (нужно V >= 2).
+    """
+    edges = []
+    while len(edges) < count:
+        u, v = rng.randrange(V), rng.randrange(V)
+        if not forward or u < v:
+            edges.append((u, v, rng.randint(min_weight, max_weight)))
+    return edges
+
+
+def random_graph(rng, directed, max_vertices=12, max_edges=30, min_weight=0, max_weight=20):
+    """
+    Небольшой случайный граф: (CSRGraph, список рёбер, V).
+    """
+    V = rng.randint(1, max_vertices)
+    edges = random_edges(rng, V, rng.randint(0, max_edges), min_weight, max_weight)
+    return CSRGraph.from_edges(edges, V, directed), edges, V
@@ -0,0 +1,64 @@
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from csr_graph import CSRGraph
+
+
+class SharedGraph:
+    """
+    Копия CSRGraph в одном блоке multiprocessing.shared_memory. Рабочие процессы получают
+    только небольшое описание spec и открывают массивы по нему без копирования и без pickle.
+    Используется как контекстный менеджер: при выходе блок памяти освобождается.
+    """
+
+    def __init__(self, graph):
+        arrays = {"src": graph.src, "dst": graph.dst, "weight": graph.weight}
+        for undirected, (offsets, targets, weights) in graph._adjacency.items():
+            prefix = "sym" if undirected else "out"
+            arrays.update({f"{prefix}_offsets": offsets, f"{prefix}_targets": targets, f"{prefix}_weights": weights})
+
+        layout = []
+        size = 0
+        for name, array in arrays.items():
+            layout.append((name, array.dtype.str, size, len(array)))
+            size += (array.nbytes + 63) // 64 * 64
+
+        self.shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        for name, dtype, offset, count in layout:
+            np.ndarray((count,), dtype=dtype, buffer=self.shm.buf, offset=offset)[:] = arrays[name]
+
+        self.spec = {
+            "name": self.shm.name,
+            "num_vertices": graph.num_vertices,
+            "directed": graph.directed,
+            "layout": layout,
+        }
+
+    def close(self):
+        self.shm.close()
+        self.shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def attach_graph(spec):
+    """
+    Открывает граф, опубликованный SharedGraph, в текущем процессе. Возвращает CSRGraph и
+    объект SharedMemory, который нужно держать живым, пока используются массивы графа.
+    """
+    shm = shared_memory.SharedMemory(name=spec["name"])
+
+    arrays = {
+        name: np.ndarray((count,), dtype=dtype, buffer=shm.buf, offset=offset)
+        for name, dtype, offset, count in spec["layout"]
+    }
+    graph = CSRGraph(arrays["src"], arrays["dst"], arrays["weight"], spec["num_vertices"], spec["directed"])
+    for prefix, undirected in (("out", False), ("sym", True)):
+        if f"{prefix}_offsets" in arrays:
+            graph._adjacency[undirected] = tuple(arrays[f"{prefix}_{name}"] for name in ("offsets", "targets", "weights"))
+    return graph, shm
@@ -0,0 +1,128 @@
+import os
+from collections import OrderedDict
+
+import numpy as np
+
+from algorithms import DIJKSTRA_ALGORITHMS, as_distance_array, shortest_paths
+from csr_graph import CSRGraph
+
+
+def algorithm_family(algorithm):
+    """
+    Все реализации одного алгоритма дают одинаковые расстояния, поэтому кэш общий для семейства.
+    """
+    return "dijkstra" if algorithm in DIJKSTRA_ALGORITHMS else "bellman_ford"
+
+
+class ShortestPathCache:
+    """
+    Кэш расстояний от источника по ключу (отпечаток графа, семейство алгоритма, источник).
+
+    Первый уровень — LRU в памяти с ограничением суммарного размера max_bytes, второй
+    (если задан directory) — файлы .npy на диске, по каталогу на отпечаток графа. Отпечаток
+    считается по содержимому рёбер, поэтому изменённый граф получает новые ключи, а старые
+    записи можно удалить через invalidate. Расстояния хранятся как массивы float64 (inf — недостижимые).
+    """
+
+    def __init__(self, max_bytes=256 * 2**20, directory=None):
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self._entries = OrderedDict()
+        self.bytes = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(graph, algorithm, src):
+        return graph.fingerprint(), algorithm_family(algorithm), src
+
+    def _path(self, key):
+        fingerprint, family, src = key
+        return os.path.join(self.directory, fingerprint, f"{family}_{src}.npy")
+
+    def record_path(self, graph, algorithm, src):
+        """
+        Файл рядом с расстояниями для произвольных данных о запуске конкретной реализации
+        (например, записи замера benchmark_runner); None без дискового уровня.
+        """
+        if not self.directory:
+            return None
+        return os.path.join(self.directory, graph.fingerprint(), f"{algorithm}_{src}.json")
+
+    def _remember(self, key, distances):
+        if distances.nbytes > self.max_bytes:
+            return
+        if key in self._entries:
+            self.bytes -= self._entries.pop(key).nbytes
+        self._entries[key] = distances
+        self.bytes += distances.nbytes
+        while self.bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.bytes -= evicted.nbytes
+
+    def get(self, graph, algorithm, src):
+        """
+        Расстояния из кэша или None.
+        """
+        key = self._key(graph, algorithm, src)
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self.memory_hits += 1
+            return self._entries[key]
+        if self.directory and os.path.exists(self._path(key)):
+            distances = np.load(self._path(key))
+            distances.flags.writeable = False
+            self._remember(key, distances)
+            self.disk_hits += 1
+            return distances
+        self.misses += 1
+        return None
+
+    def put(self, graph, algorithm, src, distances):
+        key = self._key(graph, algorithm, src)
+        distances = as_distance_array(distances).copy()
+        distances.flags.writeable = False
+        self._remember(key, distances)
+        if self.directory:
+            path = self._path(key)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Запись через временный файл, чтобы параллельный читатель не увидел его недописанным
+            with open(path + ".tmp", "wb") as file:
+                np.save(file, distances)
+            os.replace(path + ".tmp", path)
+        return distances
+
+    def distances(self, algorithm, graph, src):
+        """
+        Расстояния от src: из кэша, а при промахе — расчётом алгоритмом algorithm с сохранением.
+        """
+        if not isinstance(graph, CSRGraph):
+            graph = CSRGraph.from_edges(graph)
+        cached = self.get(graph, algorithm, src)
+        if cached is not None:
+            return cached
+        return self.put(graph, algorithm, src, shortest_paths(algorithm, graph, src))
+
+    def contains(self, graph, algorithm, src):
+        """
+        Есть ли запись в кэше (без учёта в счётчиках попаданий).
+        """
+        key = self._key(graph, algorithm, src)
+        return key in self._entries or bool(self.directory) and os.path.exists(self._path(key))
+
+    def invalidate(self, graph):
+        """
+        Удаляет все записи графа (CSRGraph или его отпечаток) из памяти и с диска.
+        """
+        fingerprint = graph if isinstance(graph, str) else graph.fingerprint()
+        for key in [key for key in self._entries if key[0] == fingerprint]:
+            self.bytes -= self._entries.pop(key).nbytes
+        if self.directory and os.path.isdir(os.path.join(self.directory, fingerprint)):
+            for name in os.listdir(os.path.join(self.directory, fingerprint)):
+                os.remove(os.path.join(self.directory, fingerprint, name))
+            os.rmdir(os.path.join(self.directory, fingerprint))
+
+    def stats(self):
+        return {"memory_hits": self.memory_hits, "disk_hits": self.disk_hits, "misses": self.misses,
+                "entries": len(self._entries), "bytes": self.bytes}
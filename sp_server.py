@@ -0,0 +1,469 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import signal
+import sys
+import time
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from algorithms import ALGORITHMS, as_distance_array, shortest_path_tree
+from graph_io import load_graph
+from paths import ShortestPaths
+from shared_graph import SharedGraph, attach_graph
+
+# Ответ с расстояниями от источника до 10 000 вершин — сотни килобайт в одной строке
+STREAM_LIMIT = 1 << 26
+
+# Состояние рабочего процесса: открытые графы из общей памяти по имени блока
+_worker_graphs = {}
+
+
+def _solve_batch(spec, algorithm, sources):
+    """
+    Рабочий процесс: деревья кратчайших путей из sources на графе из общей памяти.
+    Граф открывается при первом обращении и дальше переиспользуется.
+    Возвращает [(расстояния float64, предшественники int32)] в порядке sources; для источника,
+    на котором алгоритм упал (например, цикл с отрицательным весом), вместо пары — текст
+    ошибки, чтобы она не затронула остальные источники пакета.
+    """
+    if spec["name"] not in _worker_graphs:
+        _worker_graphs[spec["name"]] = attach_graph(spec)
+    graph, _ = _worker_graphs[spec["name"]]
+    results = []
+    for source in sources:
+        try:
+            tree = shortest_path_tree(algorithm, graph, source)
+        except Exception as error:
+            results.append(f"{type(error).__name__}: {error}")
+            continue
+        results.append((as_distance_array(tree.distances), np.frombuffer(tree.predecessors, dtype=np.int32)))
+    return results
+
+
+def _prepare_graph(filename):
+    """
+    Загрузка графа и построение обоих списков смежности до публикации в общей памяти,
+    чтобы рабочие процессы не строили их каждый сам.
+    """
+    graph = load_graph(filename)
+    graph.adjacency(undirected=True)
+    graph.adjacency(undirected=False)
+    return graph, SharedGraph(graph)
+
+
+class QueryError(Exception):
+    """
+    Ошибка поиска из источника запроса, полученная от рабочего процесса (уже с именем типа).
+    """
+
+
+def _distances_json(distances, targets=None):
+    if targets is not None:
+        distances = distances[targets]
+    return [None if distance == np.inf else distance for distance in distances.tolist()]
+
+
+class ServerMetrics:
+    """
+    Счётчики сервера: задержки последних window запросов (от получения строки до ответа),
+    пропускная способность за всё время и за последние recent секунд, размеры пакетов.
+    """
+
+    def __init__(self, window=10000, recent=10.0):
+        self.started = time.monotonic()
+        self.recent = recent
+        self.latencies = deque(maxlen=window)
+        self.completed = deque(maxlen=window)
+        self.requests = Counter()
+        self.errors = 0
+        self.batches = 0
+        self.batched_queries = 0
+        self.batched_sources = 0
+
+    def record(self, op, latency, ok=True):
+        self.requests[op] += 1
+        if not ok:
+            self.errors += 1
+        self.latencies.append(latency)
+        self.completed.append(time.monotonic())
+
+    def record_batch(self, queries, sources):
+        self.batches += 1
+        self.batched_queries += queries
+        self.batched_sources += sources
+
+    def snapshot(self):
+        now = time.monotonic()
+        uptime = now - self.started
+        latencies = np.array(self.latencies) * 1000
+        p50, p90, p99 = np.percentile(latencies, [50, 90, 99]) if len(latencies) else (0.0, 0.0, 0.0)
+        recent = sum(1 for finished in self.completed if finished >= now - self.recent)
+        total = sum(self.requests.values())
+        return {
+            "uptime_s": uptime,
+            "requests": total,
+            "requests_by_op": dict(self.requests),
+            "errors": self.errors,
+            "throughput_rps": total / uptime if uptime else 0.0,
+            "recent_throughput_rps": recent / min(self.recent, uptime) if uptime else 0.0,
+            "latency_ms": {"p50": p50, "p90": p90, "p99": p99},
+            "batches": self.batches,
+            "queries_per_batch": self.batched_queries / self.batches if self.batches else 0.0,
+            "sources_per_batch": self.batched_sources / self.batches if self.batches else 0.0,
+        }
+
+
+class QueryBatcher:
+    """
+    Собирает запросы к одному графу и одному алгоритму, пришедшие за batch_window секунд,
+    в общий пакет: повторяющиеся источники считаются один раз. Пакет отправляется сразу,
+    как только в нём набирается max_batch разных источников.
+    """
+
+    def __init__(self, server, name, algorithm):
+        self.server = server
+        self.name = name
+        self.algorithm = algorithm
+        self.pending = []
+        self.pending_sources = set()
+        self.timer = None
+
+    def submit(self, sources):
+        """
+        Future, который получит [(расстояния, предшественники)] для sources в том же порядке.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.pending.append((sources, future))
+        self.pending_sources.update(sources)
+        if len(self.pending_sources) >= self.server.max_batch:
+            self.flush()
+        elif self.timer is None:
+            self.timer = loop.call_later(self.server.batch_window, self.flush)
+        return future
+
+    def flush(self):
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        pending, sources = self.pending, sorted(self.pending_sources)
+        self.pending, self.pending_sources = [], set()
+        if pending:
+            self.server.spawn(self._run(pending, sources))
+
+    async def _run(self, pending, sources):
+        self.server.metrics.record_batch(len(pending), len(sources))
+        try:
+            solved = await self.server.solve(self.name, self.algorithm, sources)
+        except Exception as error:
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(error)
+            return
+        for query_sources, future in pending:
+            if future.done():
+                continue
+            # Ошибка источника проваливает только запросы, в которые он входит
+            results = [solved[source] for source in query_sources]
+            errors = [result for result in results if isinstance(result, str)]
+            if errors:
+                future.set_exception(QueryError(errors[0]))
+            else:
+                future.set_result(results)
+
+
+class ShortestPathServer:
+    """
+    Долгоживущий сервер кратчайших путей: протокол — строки JSON поверх Unix-сокета или
+    локального TCP, по одному запросу и одному ответу на строку (ответ несёт id запроса).
+
+    Графы загружаются один раз по имени и публикуются рабочим процессам через SharedGraph;
+    поиск идёт в пуле процессов, так что цикл событий не блокируется. Одновременные
+    запросы к одному графу объединяются QueryBatcher в пакеты.
+
+    Запросы:
+        {"op": "load", "graph": имя, "path": файл}
+        {"op": "graphs"} и {"op": "metrics"}
+        {"op": "query", "graph": имя, "source": s}            — расстояния от s до всех вершин
+        {"op": "query", "graph": имя, "source": s, "target": t} — расстояние и маршрут s -> t
+        {"op": "query", "graph": имя, "sources": [s1, s2, ...]} — расстояния от каждого источника
+    К запросам query можно добавить "algorithm" (имя из algorithms.ALGORITHMS) и "targets" —
+    список вершин, до которых нужны расстояния. Недостижимые вершины в ответе — null.
+    """
+
+    def __init__(self, algorithm="dijkstra_with_min_heap", workers=None, batch_window=0.002, max_batch=64):
+        if algorithm not in ALGORITHMS:
+            raise KeyError(f"Неизвестный алгоритм: {algorithm}")
+        self.algorithm = algorithm
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.graphs = {}
+        self.batchers = {}
+        self.metrics = ServerMetrics()
+        self.executor = ProcessPoolExecutor(self.workers)
+        self._tasks = set()
+
+    def spawn(self, coroutine):
+        # Ссылка на задачу держится до её завершения, иначе сборщик мусора может её удалить
+        task = asyncio.ensure_future(coroutine)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def load(self, name, filename):
+        if name in self.graphs:
+            raise ValueError(f"Граф {name!r} уже загружен")
+        graph, shared = await asyncio.get_running_loop().run_in_executor(None, _prepare_graph, filename)
+        self.graphs[name] = (graph, shared)
+        return graph
+
+    async def solve(self, name, algorithm, sources):
+        """
+        Деревья кратчайших путей из sources, поделённых поровну между рабочими процессами:
+        {источник: (расстояния, предшественники)}.
+        """
+        _, shared = self.graphs[name]
+        loop = asyncio.get_running_loop()
+        chunk_size = -(-len(sources) // self.workers)
+        chunks = [sources[start:start + chunk_size] for start in range(0, len(sources), chunk_size)]
+        results = await asyncio.gather(*(
+            loop.run_in_executor(self.executor, _solve_batch, shared.spec, algorithm, chunk) for chunk in chunks))
+        return {source: result for chunk, chunk_results in zip(chunks, results)
+                for source, result in zip(chunk, chunk_results)}
+
+    def _batcher(self, name, algorithm):
+        key = (name, algorithm)
+        if key not in self.batchers:
+            self.batchers[key] = QueryBatcher(self, name, algorithm)
+        return self.batchers[key]
+
+    async def query(self, request):
+        name = request["graph"]
+        if name not in self.graphs:
+            raise KeyError(f"Граф {name!r} не загружен")
+        graph, _ = self.graphs[name]
+        algorithm = request.get("algorithm", self.algorithm)
+        if algorithm not in ALGORITHMS:
+            raise KeyError(f"Неизвестный алгоритм: {algorithm}")
+        sources = [int(source) for source in request["sources"]] if "sources" in request else [int(request["source"])]
+        targets = request.get("targets")
+        for vertex in sources + [request.get("target", 0)] + (targets or []):
+            if not 0 <= vertex < graph.num_vertices:
+                raise ValueError(f"Вершина {vertex} вне графа из {graph.num_vertices} вершин")
+
+        results = await self._batcher(name, algorithm).submit(sources)
+        if "target" in request:
+            distances, predecessors = results[0]
+            target = request["target"]
+            return {"distance": _distances_json(distances, [target])[0],
+                    "path": [int(vertex) for vertex in ShortestPaths(sources[0], distances, predecessors).path(target)]}
+        rows = [_distances_json(distances, targets) for distances, _ in results]
+        return {"distances": rows} if "sources" in request else {"distances": rows[0]}
+
+    async def handle_request(self, request):
+        op = request.get("op", "query")
+        if op == "query":
+            return await self.query(request)
+        if op == "load":
+            graph = await self.load(request["graph"], request["path"])
+            return {"graph": request["graph"], "vertices": graph.num_vertices, "edges": graph.num_edges}
+        if op == "graphs":
+            return {"graphs": {name: {"vertices": graph.num_vertices, "edges": graph.num_edges}
+                               for name, (graph, _) in self.graphs.items()}}
+        if op == "metrics":
+            return self.metrics.snapshot()
+        raise ValueError(f"Неизвестная операция: {op}")
+
+    async def _respond(self, line, writer):
+        start_time = time.perf_counter()
+        request, op = {}, "invalid"
+        try:
+            request = json.loads(line)
+            op = request.get("op", "query")
+            response = await self.handle_request(request)
+            ok = True
+        except Exception as error:
+            # Ошибка одного запроса возвращается клиенту и не останавливает сервер
+            response = {"error": str(error) if isinstance(error, QueryError) else f"{type(error).__name__}: {error}"}
+            ok = False
+        response["id"] = request.get("id") if isinstance(request, dict) else None
+        writer.write(json.dumps(response).encode() + b"\n")
+        self.metrics.record(op, time.perf_counter() - start_time, ok)
+        await writer.drain()
+
+    async def handle_connection(self, reader, writer):
+        # Запросы одного соединения обрабатываются параллельно: ответы могут прийти не по порядку
+        tasks = set()
+        try:
+            while line := await reader.readline():
+                if line.strip():
+                    task = self.spawn(self._respond(line, writer))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.wait(tasks)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, socket_path=None, host="127.0.0.1", port=8765):
+        if socket_path:
+            server = await asyncio.start_unix_server(self.handle_connection, socket_path, limit=STREAM_LIMIT)
+        else:
+            server = await asyncio.start_server(self.handle_connection, host, port, limit=STREAM_LIMIT)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            if socket_path and os.path.exists(socket_path):
+                os.remove(socket_path)
+
+    def close(self):
+        self.executor.shutdown()
+        for _, shared in self.graphs.values():
+            shared.close()
+        self.graphs.clear()
+
+
+async def open_connection(address):
+    """
+    Соединение с сервером: address — путь к Unix-сокету или пара (хост, порт).
+    """
+    if isinstance(address, str):
+        return await asyncio.open_unix_connection(address, limit=STREAM_LIMIT)
+    return await asyncio.open_connection(*address, limit=STREAM_LIMIT)
+
+
+async def call(reader, writer, request):
+    writer.write(json.dumps(request).encode() + b"\n")
+    await writer.drain()
+    response = json.loads(await reader.readline())
+    if "error" in response:
+        raise RuntimeError(response["error"])
+    return response
+
+
+def make_queries(kind, num_vertices, count, sources=4, seed=0):
+    """
+    Случайные запросы для нагрузки: "single" — расстояния от источника до десяти вершин,
+    "pair" — расстояние и маршрут, "multi" — sources источников.
+    """
+    rng = random.Random(seed)
+    queries = []
+    for _ in range(count):
+        if kind == "pair":
+            queries.append({"source": rng.randrange(num_vertices), "target": rng.randrange(num_vertices)})
+        elif kind == "multi":
+            queries.append({"sources": [rng.randrange(num_vertices) for _ in range(sources)],
+                            "targets": [rng.randrange(num_vertices) for _ in range(10)]})
+        else:
+            queries.append({"source": rng.randrange(num_vertices),
+                            "targets": [rng.randrange(num_vertices) for _ in range(10)]})
+    return queries
+
+
+async def load_test(address, graph, requests=1000, concurrency=32, kind="pair", sources=4, seed=0):
+    """
+    Нагрузочный клиент: concurrency соединений, каждое отправляет свою долю запросов
+    последовательно. Возвращает задержки p50/p99 на стороне клиента, пропускную способность
+    и метрики сервера после прогона.
+    """
+    reader, writer = await open_connection(address)
+    num_vertices = (await call(reader, writer, {"op": "graphs"}))["graphs"][graph]["vertices"]
+    queries = [dict(query, op="query", graph=graph, id=index)
+               for index, query in enumerate(make_queries(kind, num_vertices, requests, sources, seed))]
+    latencies = []
+
+    async def client(share):
+        client_reader, client_writer = await open_connection(address)
+        for query in share:
+            start_time = time.perf_counter()
+            await call(client_reader, client_writer, query)
+            latencies.append(time.perf_counter() - start_time)
+        client_writer.close()
+        await client_writer.wait_closed()
+
+    start_time = time.perf_counter()
+    await asyncio.gather(*(client(queries[index::concurrency]) for index in range(concurrency)))
+    elapsed = time.perf_counter() - start_time
+    server_metrics = await call(reader, writer, {"op": "metrics"})
+    writer.close()
+    await writer.wait_closed()
+
+    p50, p99 = np.percentile(np.array(latencies) * 1000, [50, 99])
+    return {"requests": requests, "concurrency": concurrency, "kind": kind, "elapsed_s": elapsed,
+            "throughput_rps": requests / elapsed, "p50_ms": p50, "p99_ms": p99, "server": server_metrics}
+
+
+async def run_server(args):
+    # SIGTERM и SIGINT отменяют задачу сервера, чтобы закрыть общую память и удалить сокет
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(signum, asyncio.current_task().cancel)
+        except NotImplementedError:
+            pass  # Windows: остаётся KeyboardInterrupt
+    server = ShortestPathServer(args.algorithm, args.workers, args.batch_window / 1000, args.max_batch)
+    try:
+        for item in args.graph:
+            name, _, filename = item.partition("=")
+            graph = await server.load(name, filename or name)
+            print(f"Граф {name}: {graph.num_vertices} вершин, {graph.num_edges} рёбер")
+        print(f"Сервер слушает {args.socket or f'{args.host}:{args.port}'}")
+        await server.serve(args.socket, args.host, args.port)
+    finally:
+        server.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Сервер запросов кратчайших путей и нагрузочный клиент")
+    parser.add_argument("--socket", help="путь к Unix-сокету (иначе TCP --host/--port)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve = commands.add_parser("serve", help="запустить сервер")
+    serve.add_argument("--graph", action="append", default=[], metavar="ИМЯ=ФАЙЛ", help="граф, загружаемый при старте")
+    serve.add_argument("--algorithm", default="dijkstra_with_min_heap", choices=sorted(ALGORITHMS))
+    serve.add_argument("--workers", type=int, help="число рабочих процессов (по умолчанию — число ядер)")
+    serve.add_argument("--batch-window", type=float, default=2.0, help="окно сбора пакета, мс")
+    serve.add_argument("--max-batch", type=int, default=64, help="разных источников в пакете")
+
+    bench = commands.add_parser("bench", help="нагрузочный прогон против запущенного сервера")
+    bench.add_argument("--graph", required=True, help="имя загруженного графа")
+    bench.add_argument("--requests", type=int, default=1000)
+    bench.add_argument("--concurrency", type=int, default=32)
+    bench.add_argument("--kind", choices=["single", "pair", "multi"], default="pair")
+    bench.add_argument("--sources", type=int, default=4, help="источников в запросе multi")
+    bench.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        try:
+            asyncio.run(run_server(args))
+        except (KeyboardInterrupt, asyncio.CancelledError):
+            pass
+        return 0
+
+    address = args.socket or (args.host, args.port)
+    result = asyncio.run(load_test(address, args.graph, args.requests, args.concurrency, args.kind, args.sources,
+                                   args.seed))
+    server = result["server"]
+    print(f"{result['requests']} запросов {result['kind']}, {result['concurrency']} соединений: "
+          f"{result['elapsed_s']:.3f} с, {result['throughput_rps']:.1f} запросов/с")
+    print(f"  задержка клиента: p50 {result['p50_ms']:.2f} мс, p99 {result['p99_ms']:.2f} мс")
+    print(f"  сервер: p50 {server['latency_ms']['p50']:.2f} мс, p99 {server['latency_ms']['p99']:.2f} мс, "
+          f"{server['batches']} пакетов, {server['queries_per_batch']:.1f} запросов и "
+          f"{server['sources_per_batch']:.1f} источников на пакет")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
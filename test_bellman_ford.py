@@ -0,0 +1,105 @@
+import importlib
+import os
+import random
+import tempfile
+import unittest
+from array import array
+
+from csr_graph import CSRGraph
+from random_graphs import random_graph
+
+bellman_ford = importlib.import_module("Ford-Bellman")
+
+
+def run(algorithm, *args):
+    """
+    Результат алгоритма или пойманная NegativeCycleError.
+    """
+    try:
+        return algorithm(*args)
+    except bellman_ford.NegativeCycleError as error:
+        return error
+
+
+class BellmanFordTest(unittest.TestCase):
+    def assert_cycle(self, error, edges):
+        # Цикл состоит из рёбер графа, замкнут и имеет отрицательный вес
+        self.assertTrue(error.edges)
+        self.assertTrue(set(error.edges) <= set(edges))
+        self.assertEqual([u for u, _, _ in error.edges], error.vertices)
+        self.assertEqual([v for _, v, _ in error.edges], error.vertices[1:] + error.vertices[:1])
+        self.assertLess(error.weight, 0)
+
+    def test_variants_match_standard(self):
+        rng = random.Random(1)
+        cycles = 0
+        for _ in range(500):
+            graph, edges, V = random_graph(rng, True, min_weight=-3, max_weight=10)
+            src = rng.randrange(V)
+            expected = run(bellman_ford.bellman_ford_standard, graph, V, len(edges), src)
+            for name, algorithm in bellman_ford.BELLMAN_FORD_VARIANTS.items():
+                result = run(algorithm, graph, V, len(edges), src)
+                if isinstance(expected, bellman_ford.NegativeCycleError):
+                    self.assertIsInstance(result, bellman_ford.NegativeCycleError, name)
+                    self.assert_cycle(result, edges)
+                else:
+                    self.assertEqual(list(result), list(expected), name)
+            cycles += isinstance(expected, bellman_ford.NegativeCycleError)
+        # Случайные графы должны покрывать оба исхода
+        self.assertTrue(50 < cycles < 450)
+
+    def test_tarjan_predecessors_form_shortest_path_tree(self):
+        rng = random.Random(2)
+        for _ in range(300):
+            graph, edges, V = random_graph(rng, True, max_weight=10)
+            src = rng.randrange(V)
+            predecessors = array('i')
+            distances = bellman_ford.bellman_ford_tarjan(graph, V, len(edges), src, predecessors)
+            for v in range(V):
+                if predecessors[v] != -1:
+                    self.assertTrue(any(u == predecessors[v] and x == v and distances[u] + w == distances[v]
+                                        for u, x, w in edges))
+
+    def test_tarjan_reports_cycle_near_source_early(self):
+        # Длинный путь 0 -> 1 -> ... -> 199 и цикл 0 <-> 1 веса -1 в самом начале
+        V = 200
+        edges = [(v, v + 1, 1) for v in range(V - 1)] + [(1, 0, -2)]
+        graph = CSRGraph(*zip(*edges), V, directed=True)
+        error = run(bellman_ford.bellman_ford_tarjan, graph, V, len(edges), 0)
+        self.assertEqual(sorted(error.vertices), [0, 1])
+        self.assert_cycle(error, edges)
+
+    def test_self_loop_cycle(self):
+        edges = [(0, 1, 2), (1, 1, -1)]
+        error = run(bellman_ford.bellman_ford_tarjan, CSRGraph(*zip(*edges), 2, directed=True), 2, 2, 0)
+        self.assertEqual(error.vertices, [1])
+        self.assertEqual(error.edges, [(1, 1, -1)])
+
+    def test_find_negative_cycle(self):
+        edges = [(0, 1, 1), (2, 3, 1), (3, 2, -5)]
+        graph = CSRGraph(*zip(*edges), 4, directed=True)
+        self.assertIsNone(bellman_ford.find_negative_cycle(graph, 4, 0))
+        vertices, cycle_edges = bellman_ford.find_negative_cycle(graph, 4, 2)
+        self.assertEqual(sorted(vertices), [2, 3])
+        self.assertEqual(sum(w for _, _, w in cycle_edges), -4)
+
+    def test_streaming_matches_standard(self):
+        rng = random.Random(3)
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "graph.txt")
+            for _ in range(100):
+                graph, edges, V = random_graph(rng, True, min_weight=-3, max_weight=10)
+                src = rng.randrange(V)
+                with open(filename, "w") as file:
+                    file.writelines(f"{u} {v} {w}\n" for u, v, w in edges)
+                expected = run(bellman_ford.bellman_ford_standard, graph, V, len(edges), src)
+                result = run(bellman_ford.bellman_ford_streaming, filename, src, V, None, 4)
+                if isinstance(expected, bellman_ford.NegativeCycleError):
+                    self.assertIsInstance(result, bellman_ford.NegativeCycleError)
+                    self.assert_cycle(result, edges)
+                else:
+                    self.assertEqual(list(result), list(expected))
+
+
+if __name__ == "__main__":
+    unittest.main()
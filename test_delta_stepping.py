@@ -0,0 +1,33 @@
+import random
+import unittest
+from array import array
+
+from delta_stepping import delta_stepping
+from dijkstra import dijkstra_with_min_heap
+from random_graphs import random_graph
+
+
+class DeltaSteppingTest(unittest.TestCase):
+    def check(self, rng, workers, count):
+        for _ in range(count):
+            graph, _, V = random_graph(rng, rng.random() < 0.5, max_vertices=40, max_edges=160, max_weight=50)
+            src = rng.randrange(V)
+            delta = rng.choice((None, 1, 7, 100))
+            predecessors = array('i')
+            distances = delta_stepping(graph, V, src, predecessors, delta, workers)
+            self.assertEqual(distances, dijkstra_with_min_heap(graph, V, src))
+            # Предшественники задают пути ровно той длины, что найдена
+            for v, u in enumerate(predecessors):
+                if u != -1:
+                    self.assertTrue(any(distances[u] + w == distances[v] for x, y, w in graph
+                                        if (x, y) == (u, v) or not graph.directed and (y, x) == (u, v)))
+
+    def test_matches_dijkstra(self):
+        self.check(random.Random(1), workers=1, count=200)
+
+    def test_matches_dijkstra_in_parallel(self):
+        self.check(random.Random(2), workers=2, count=5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+import importlib
+import random
+import unittest
+from sys import maxsize
+
+from csr_graph import CSRGraph
+from dijkstra import dijkstra_with_min_heap
+from dynamic_sssp import DynamicSSSP, INF
+from random_graphs import random_edges
+
+bellman_ford = importlib.import_module("Ford-Bellman")
+
+
+def random_changes(rng, dynamic, count, min_weight=0, max_weight=20, forward=False):
+    """
+    Пакет изменений: удаления и новые веса существующих рёбер вперемешку со вставками.
+    """
+    existing = [(u, v) for u in range(dynamic.num_vertices) for v in dynamic.out_edges[u]]
+    changes = []
+    for u, v, w in random_edges(rng, dynamic.num_vertices, count, min_weight, max_weight, forward):
+        kind = rng.random()
+        if existing and kind < 0.3:
+            changes.append((*rng.choice(existing), None))
+        elif existing and kind < 0.6:
+            changes.append((*rng.choice(existing), w))
+        else:
+            changes.append((u, v, w))
+    return changes
+
+
+class DynamicSSSPTest(unittest.TestCase):
+    def assert_matches_recomputation(self, dynamic, recompute):
+        graph = dynamic.graph()
+        expected = [INF if distance >= maxsize else distance
+                    for distance in recompute(graph, dynamic.num_vertices, dynamic.src)]
+        self.assertEqual(dynamic.distances, expected)
+        # Предшественники образуют дерево по "плотным" рёбрам текущего графа
+        for v, u in enumerate(dynamic.predecessors):
+            if u != -1:
+                self.assertEqual(dynamic.distances[u] + dynamic.out_edges[u][v], dynamic.distances[v])
+            else:
+                self.assertTrue(v == dynamic.src or dynamic.distances[v] == INF)
+
+    def check_updates(self, rng, undirected, batch_size):
+        V = rng.randint(2, 30)
+        graph = CSRGraph.from_edges(random_edges(rng, V, rng.randint(0, 3 * V)), V, directed=not undirected)
+        dynamic = DynamicSSSP.from_algorithm("dijkstra_with_min_heap", graph, rng.randrange(V))
+        self.assertEqual(dynamic.undirected, undirected)
+        for _ in range(10):
+            dynamic.apply(random_changes(rng, dynamic, batch_size))
+            self.assert_matches_recomputation(dynamic, dijkstra_with_min_heap)
+
+    def test_single_updates(self):
+        rng = random.Random(1)
+        for _ in range(100):
+            self.check_updates(rng, undirected=rng.random() < 0.5, batch_size=1)
+
+    def test_batched_updates(self):
+        rng = random.Random(2)
+        for _ in range(100):
+            self.check_updates(rng, undirected=rng.random() < 0.5, batch_size=rng.randint(2, 10))
+
+    def test_negative_weights(self):
+        rng = random.Random(3)
+        recompute = lambda graph, V, src: bellman_ford.bellman_ford_standard(graph, V, graph.num_edges, src)
+        for _ in range(100):
+            V = rng.randint(2, 30)
+            edges = random_edges(rng, V, rng.randint(0, 3 * V), min_weight=-10, forward=True)
+            graph = CSRGraph.from_edges(edges, V, directed=True)
+            dynamic = DynamicSSSP.from_algorithm("bellman_ford_standard", graph, 0)
+            for _ in range(10):
+                dynamic.apply(random_changes(rng, dynamic, rng.randint(1, 5), min_weight=-10, forward=True))
+                self.assert_matches_recomputation(dynamic, recompute)
+
+    def test_edge_operations(self):
+        # 0 -> 1 -> 2 и обходной путь 0 -> 2
+        dynamic = DynamicSSSP(CSRGraph.from_edges([(0, 1, 1), (1, 2, 1), (0, 2, 5)], 3, directed=True),
+                              0, [0, 1, 2])
+        self.assertEqual(list(dynamic.predecessors), [-1, 0, 1])
+        dynamic.delete_edge(1, 2)
+        self.assertEqual(dynamic.distances, [0, 1, 5])
+        self.assertEqual(dynamic.predecessors[2], 0)
+        dynamic.set_weight(0, 2, 7)
+        self.assertEqual(dynamic.distances, [0, 1, 7])
+        dynamic.insert_edge(1, 2, 3)
+        self.assertEqual(dynamic.distances, [0, 1, 4])
+        dynamic.delete_edge(0, 1)
+        self.assertEqual(dynamic.distances, [0, INF, 7])
+
+    def test_negative_cycle(self):
+        dynamic = DynamicSSSP(CSRGraph.from_edges([(0, 1, 1), (1, 2, 1)], 3, directed=True), 0, [0, 1, 2])
+        with self.assertRaises(ValueError):
+            dynamic.insert_edge(2, 1, -2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+
+from dijkstra import dijkstra_with_min_heap
+from graph_io import load_graph, write_graph_metadata
+from sp_server import STREAM_LIMIT, ShortestPathServer, call, open_connection
+
+# Неориентированный граф из двух компонент: 0-1-2-3 и 4-5
+GRAPH = "0 1 4\n1 2 1\n0 2 7\n2 3 2\n4 5 3\n"
+# Ориентированный граф: из 0 достижим цикл 1 -> 2 -> 1 веса -2, из 3 — нет
+NEGATIVE_GRAPH = "0 1 1\n1 2 -3\n2 1 1\n3 4 2\n"
+
+
+class ShortestPathServerTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.graph_file = os.path.join(self.directory.name, "graph.txt")
+        self.negative_file = os.path.join(self.directory.name, "negative.txt")
+        with open(self.graph_file, "w") as file:
+            file.write(GRAPH)
+        with open(self.negative_file, "w") as file:
+            file.write(NEGATIVE_GRAPH)
+        write_graph_metadata(self.negative_file, {"directed": True})
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def run_session(self, session, batch_window=0.002):
+        """
+        Поднимает сервер в этом процессе на свободном порту TCP и выполняет session(reader, writer, server).
+        """
+        async def main():
+            server = ShortestPathServer(workers=1, batch_window=batch_window)
+            try:
+                await server.load("graph", self.graph_file)
+                await server.load("negative", self.negative_file)
+                listener = await asyncio.start_server(server.handle_connection, "127.0.0.1", 0, limit=STREAM_LIMIT)
+                async with listener:
+                    reader, writer = await open_connection(listener.sockets[0].getsockname()[:2])
+                    try:
+                        return await session(reader, writer, server)
+                    finally:
+                        writer.close()
+                        await writer.wait_closed()
+            finally:
+                server.close()
+
+        return asyncio.run(main())
+
+    def test_queries(self):
+        async def session(reader, writer, server):
+            return (await call(reader, writer, {"op": "query", "graph": "graph", "source": 0}),
+                    await call(reader, writer, {"op": "query", "graph": "graph", "source": 0, "target": 3}),
+                    await call(reader, writer, {"op": "query", "graph": "graph", "sources": [3, 4], "targets": [0, 5]}))
+
+        single, pair, multi = self.run_session(session)
+        expected = dijkstra_with_min_heap(load_graph(self.graph_file), 6, 0)
+        self.assertEqual(single["distances"], [None if distance == float("inf") else distance for distance in expected])
+        self.assertEqual(pair["distance"], 7)
+        self.assertEqual(pair["path"], [0, 1, 2, 3])
+        self.assertEqual(multi["distances"], [[7, None], [None, 3]])
+
+    def test_concurrent_queries_share_a_batch(self):
+        async def session(reader, writer, server):
+            requests = [{"op": "query", "graph": "graph", "source": source % 3, "targets": [3], "id": source}
+                        for source in range(6)]
+            for request in requests:
+                writer.write((json.dumps(request) + "\n").encode())
+            await writer.drain()
+            responses = [json.loads(await reader.readline()) for _ in requests]
+            return responses, server.metrics.snapshot()
+
+        responses, metrics = self.run_session(session, batch_window=0.2)
+        self.assertEqual({response["id"]: response["distances"] for response in responses},
+                         {0: [7], 1: [3], 2: [2], 3: [7], 4: [3], 5: [2]})
+        self.assertEqual(metrics["batches"], 1)
+        self.assertEqual(metrics["sources_per_batch"], 3)
+
+    def test_failing_source_does_not_fail_the_batch(self):
+        async def session(reader, writer, server):
+            requests = [{"op": "query", "graph": "negative", "source": source, "algorithm": "bellman_ford_queue",
+                         "id": source} for source in (0, 3)]
+            for request in requests:
+                writer.write((json.dumps(request) + "\n").encode())
+            await writer.drain()
+            responses = {}
+            for _ in requests:
+                response = json.loads(await reader.readline())
+                responses[response["id"]] = response
+            return responses, server.metrics.snapshot()
+
+        responses, metrics = self.run_session(session, batch_window=0.2)
+        self.assertEqual(metrics["batches"], 1)
+        self.assertTrue(responses[0]["error"].startswith("NegativeCycleError"))
+        self.assertEqual(responses[3]["distances"], [None, None, None, 0, 2])
+
+    def test_invalid_requests_return_errors(self):
+        async def session(reader, writer, server):
+            responses = []
+            for request in ({"op": "query", "graph": "missing", "source": 0},
+                            {"op": "query", "graph": "graph", "source": 100},
+                            {"op": "unknown"}):
+                writer.write((json.dumps(request) + "\n").encode())
+                await writer.drain()
+                responses.append(json.loads(await reader.readline()))
+            writer.write(b"not json\n")
+            await writer.drain()
+            responses.append(json.loads(await reader.readline()))
+            # После ошибок сервер продолжает отвечать
+            responses.append(await call(reader, writer, {"op": "graphs"}))
+            return responses
+
+        *errors, graphs = self.run_session(session)
+        self.assertTrue(all("error" in response for response in errors))
+        self.assertEqual(graphs["graphs"]["graph"], {"vertices": 6, "edges": 5})
+
+
+if __name__ == "__main__":
+    unittest.main()